@@ -0,0 +1,221 @@
+"""휴식 도구 호출 허용 제어 (토큰 버킷 속도 제한 + 동시 실행 수 제한)
+
+도구 호출은 실행 전에 세션별 토큰 버킷과 전체 토큰 버킷에서 토큰을 하나씩
+받아야 합니다. 토큰이 모자라면 max_defer초 안에 채워지는 경우에만 그만큼
+기다렸다가(지연 슬롯) 실행하고, 그보다 오래 걸리면 즉시 거절합니다.
+토큰을 받은 뒤에는 동시에 실행 중인 호출(Level 5 지연으로 잠든 호출 포함)이
+max_in_flight개를 넘지 않도록 빈자리를 기다립니다.
+
+batch_breaks는 전체 버킷에서 휴식 건수만큼, 에이전트별 버킷에서 그 에이전트의
+건수만큼 토큰을 받습니다. 버킷 크기보다 많은 토큰이 필요한 배치는 기다려도
+받을 수 없으므로 바로 거절합니다.
+
+토큰이나 빈자리를 기다리는 호출은 합쳐서 max_queue개까지만 허용하므로,
+과부하에서도 잠든 호출이 끝없이 쌓이지 않고 넘치는 호출은 바로 거절됩니다
+(max_queue가 0이면 max_defer와 상관없이 기다리지 않음). 토큰을 기다리다 취소된
+호출은 예약한 토큰을 버킷에 돌려줍니다.
+
+하나의 이벤트 루프 안에서 사용하는 것을 전제로 합니다 (락 없음).
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+from fastmcp.exceptions import ToolError
+
+from clock import SystemClock
+
+# 거절 사유별 안내 문구
+REJECTION_REASONS = {
+    "session_rate": "에이전트별 호출 한도 초과",
+    "global_rate": "서버 전체 호출 한도 초과",
+    "queue_full": "대기열이 가득 참",
+    "batch_too_large": "배치가 호출 한도보다 큼",
+}
+
+class AdmissionRejected(ToolError):
+    """허용 제어로 거절된 호출 (MCP 오류 결과로 클라이언트에 전달)"""
+
+    def __init__(self, reason: str, retry_after: float | None = None):
+        self.reason = reason
+        self.retry_after = retry_after
+        message = f"🚦 요청이 너무 많습니다 ({REJECTION_REASONS[reason]})."
+        if retry_after is not None:
+            message += f" {retry_after:.2f}초 후 다시 시도하세요."
+        message += f"\n\nRejected: {reason}"
+        if retry_after is not None:
+            message += f"\nRetry After: {retry_after:.2f}"
+        # 과부하에서 거절마다 ERROR 로그가 쌓이지 않도록 DEBUG로 기록 (건수는 metrics의 admission)
+        super().__init__(message, log_level=logging.DEBUG)
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷
+
+    토큰은 음수까지 미리 꺼낼 수 있으며(예약), 그만큼 다음 호출이 기다립니다.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def wait_time(self, now: float, cost: float = 1) -> float:
+        """토큰 cost개를 꺼내려면 기다려야 하는 시간 (0이면 바로 가능)"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def take(self, cost: float = 1):
+        self.tokens -= cost
+
+    def refund(self, cost: float = 1):
+        """take()로 예약했다가 쓰지 않은 토큰을 돌려줌 (burst를 넘지 않음)"""
+        self.tokens = min(self.burst, self.tokens + cost)
+
+class AdmissionController:
+    """세션별/전체 토큰 버킷과 동시 실행 수 제한
+
+    rate, session_rate, max_in_flight가 0이면 해당 제한을 쓰지 않습니다.
+    burst를 주지 않으면 rate와 같게(최소 1) 둡니다.
+    """
+
+    def __init__(self, rate: float = 0, burst: float | None = None,
+                 session_rate: float = 0, session_burst: float | None = None,
+                 max_in_flight: int = 0, max_queue: int = 0, max_defer: float = 0,
+                 max_sessions: int = 100_000, clock=None, metrics=None):
+        self.clock = clock or SystemClock()
+        self.metrics = metrics
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.session_rate = session_rate
+        self.session_burst = session_burst if session_burst is not None else max(session_rate, 1)
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_defer = max_defer
+        self.max_sessions = max_sessions
+        self.enabled = bool(rate or session_rate or max_in_flight)
+        self._global = TokenBucket(rate, self.burst, self.clock.monotonic()) if rate else None
+        # session_id -> TokenBucket, 앞쪽일수록 오래 쓰지 않은 세션 (넘치면 버림 = 가득 찬 버킷)
+        self._sessions = OrderedDict()
+        self.in_flight = 0
+        self.waiting = 0
+        self._slot_waiters = deque()
+
+    def _session_bucket(self, session_id: str, now: float) -> TokenBucket:
+        bucket = self._sessions.get(session_id)
+        if bucket is None:
+            bucket = self._sessions[session_id] = TokenBucket(self.session_rate, self.session_burst, now)
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return bucket
+
+    def _record(self, outcome: str, reason: str):
+        if self.metrics:
+            self.metrics.record_admission(outcome, reason)
+
+    def _reserve(self, cost: float, session_costs):
+        """세션/전체 버킷에서 토큰을 예약하고 (기다릴 시간, 예약 목록)을 반환 (한도를 넘으면 거절)
+
+        session_costs는 {session_id: 토큰 수}이며, 모든 버킷을 확인한 뒤에만 꺼냅니다.
+        """
+        now = self.clock.monotonic()
+        charges = []
+        if self._global is not None:
+            charges.append(("global_rate", self._global, cost))
+        if self.session_rate:
+            charges.extend(("session_rate", self._session_bucket(session_id, now), session_cost)
+                           for session_id, session_cost in session_costs.items())
+
+        wait, reason = 0.0, None
+        for name, bucket, bucket_cost in charges:
+            if bucket_cost > bucket.burst:
+                self._record("rejected", "batch_too_large")
+                raise AdmissionRejected("batch_too_large")
+            bucket_wait = bucket.wait_time(now, bucket_cost)
+            if bucket_wait > wait:
+                wait, reason = bucket_wait, name
+        if wait > self.max_defer:
+            self._record("rejected", reason)
+            raise AdmissionRejected(reason, wait)
+        if wait > 0 and self.waiting >= self.max_queue:
+            self._record("rejected", "queue_full")
+            raise AdmissionRejected("queue_full", wait)
+        for _, bucket, bucket_cost in charges:
+            bucket.take(bucket_cost)
+        if wait > 0:
+            self._record("deferred", reason)
+        return wait, charges
+
+    async def _acquire_slot(self):
+        if self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            return
+        if self.waiting >= self.max_queue:
+            self._record("rejected", "queue_full")
+            raise AdmissionRejected("queue_full")
+        self._record("queued", "in_flight")
+        future = asyncio.get_running_loop().create_future()
+        self._slot_waiters.append(future)
+        self.waiting += 1
+        try:
+            # 빈자리는 _release_slot()이 in_flight를 그대로 둔 채 넘겨줌
+            await future
+        except BaseException:
+            # 빈자리를 넘겨받은 직후 취소되었으면 다음 대기자에게 넘김
+            # (취소된 future는 _release_slot()이 건너뜀)
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+        finally:
+            self.waiting -= 1
+
+    def _release_slot(self):
+        while self._slot_waiters:
+            future = self._slot_waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self, session_id: str | None = None, cost: float = 1, session_costs=None):
+        """호출 하나를 허용 (필요하면 기다리고, 한도를 넘으면 AdmissionRejected)
+
+        전체 버킷에서 cost개, session_id의 버킷에서 cost개를 받습니다.
+        batch_breaks처럼 여러 세션에 걸친 호출은 session_costs({session_id: 건수})로
+        세션마다 받을 토큰 수를 넘깁니다.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if session_costs is None:
+            session_costs = {session_id: cost} if session_id is not None else {}
+        wait, charges = self._reserve(cost, session_costs)
+        if wait > 0:
+            self.waiting += 1
+            try:
+                await self.clock.sleep(wait)
+            except asyncio.CancelledError:
+                # 실행하지 않은 호출의 토큰은 다음 호출이 쓰도록 돌려줌
+                for _, bucket, bucket_cost in charges:
+                    bucket.refund(bucket_cost)
+                raise
+            finally:
+                self.waiting -= 1
+
+        if not self.max_in_flight:
+            yield
+            return
+        await self._acquire_slot()
+        try:
+            yield
+        finally:
+            self._release_slot()
@@ -0,0 +1 @@
+"""ChillMCP 성능 측정 스크립트 모음"""
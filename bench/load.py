@@ -0,0 +1,195 @@
+"""인프로세스 fastmcp 클라이언트로 도구 호출 처리량과 꼬리 지연 시간 측정
+
+boss_alertness 값마다 하나의 워크로드를 실행하고 p50/p95/p99 지연 시간,
+초당 호출 수, ChillMCPState._lock 대기 시간, RSS를 JSON으로 저장합니다.
+--baseline을 주면 이전 결과와 비교해 허용치를 넘는 회귀가 있을 때 1로 종료합니다.
+
+사용 예시:
+    python -m bench.load --calls 5000 --concurrency 64 --boss_alertness 0 50 100 \\
+        --output bench_results.json --baseline baseline.json --max_regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import sys
+import time
+
+from fastmcp.client import Client
+
+from metrics import InstrumentedLock
+from server import create_mcp_server
+
+ALL_TOOLS = [
+    "take_a_break", "watch_netflix", "show_meme", "bathroom_break",
+    "coffee_mission", "urgent_call", "deep_thinking", "email_organizing", "check_status"
+]
+
+def instrument_locks(store):
+    """저장소가 새로 만드는 모든 상태의 락 계측기(InstrumentedLock) 목록을 반환
+
+    저장소에 metrics가 있으면 이미 붙어 있는 InstrumentedLock을 그대로 모으고
+    (서버 계측값도 계속 쌓임), 없을 때만 새로 붙입니다.
+    """
+    locks = []
+    create_state = store._create_state
+
+    def _create_state(session_id):
+        state = create_state(session_id)
+        if not isinstance(state._lock, InstrumentedLock):
+            state._lock = InstrumentedLock()
+        locks.append(state._lock)
+        return state
+
+    store._create_state = _create_state
+    return locks
+
+def rss_mb():
+    """현재 프로세스의 RSS (MB), /proc을 못 읽으면 최대 RSS"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def run_workload(boss_alertness, args):
+    """boss_alertness 하나에 대한 워크로드를 실행하고 결과 딕셔너리를 반환"""
+    state_dir = None
+    if args.state_dir:
+        state_dir = os.path.join(args.state_dir, f"boss_alertness={boss_alertness}")
+    mcp = create_mcp_server(boss_alertness, args.boss_alertness_cooldown, lazy_decay=True,
+                            boss_penalty_seconds=args.penalty_seconds, state_dir=state_dir)
+    locks = instrument_locks(mcp.state_store)
+    latencies = []
+    remaining = iter(range(args.calls))
+    rng = random.Random(args.seed)
+
+    async def worker(client):
+        for _ in remaining:
+            tool = rng.choice(ALL_TOOLS)
+            agent_id = f"agent-{rng.randrange(args.sessions)}"
+            start = time.perf_counter()
+            await client.call_tool(tool, {"agent_id": agent_id})
+            latencies.append(time.perf_counter() - start)
+
+    async with Client(mcp) as client:
+        # 워밍업 호출은 측정에서 제외
+        await client.call_tool("check_status")
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        memory = rss_mb()
+
+    latencies.sort()
+    return {
+        "boss_alertness": boss_alertness,
+        "calls": len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "calls_per_sec": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+        "lock": {
+            "acquisitions": sum(lock.acquisitions for lock in locks),
+            "wait_total_ms": round(sum(lock.wait_total for lock in locks) * 1000, 3),
+            "wait_max_ms": round(max((lock.wait_max for lock in locks), default=0.0) * 1000, 3),
+        },
+        "sessions": len(locks),
+        "rss_mb": round(memory, 1),
+    }
+
+def find_regressions(results, baseline, max_regression):
+    """기준 결과보다 max_regression% 넘게 나빠진 지표 목록을 반환"""
+    tolerance = max_regression / 100
+    regressions = []
+    for name, current in results["workloads"].items():
+        previous = baseline.get("workloads", {}).get(name)
+        if previous is None:
+            continue
+        if current["calls_per_sec"] < previous["calls_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: calls_per_sec {previous['calls_per_sec']} → {current['calls_per_sec']}")
+        for key in ("p50", "p95", "p99"):
+            before, after = previous["latency_ms"][key], current["latency_ms"][key]
+            if after > before * (1 + tolerance):
+                regressions.append(f"{name}: {key} {before}ms → {after}ms")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP tool-call load benchmark")
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="Tool calls per workload")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="In-flight calls")
+    parser.add_argument("--sessions", type=int, default=1000,
+                        help="Number of distinct agent_id values")
+    parser.add_argument("--boss_alertness", type=int, nargs="+", default=[0, 50, 100],
+                        help="One workload per boss_alertness value")
+    parser.add_argument("--boss_alertness_cooldown", type=int, default=300)
+    parser.add_argument("--penalty_seconds", type=float, default=0.0,
+                        help="Level 5 penalty used during the run (the server default is 20s)")
+    parser.add_argument("--state_dir",
+                        help="Enable state persistence under this directory during the run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log_level", default="ERROR",
+                        help="Server log level during the run")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--max_regression", type=float, default=20,
+                        help="Allowed regression in percent before failing")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+    results = {
+        "config": {key: value for key, value in vars(args).items()
+                   if key not in ("output", "baseline", "log_level")},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workloads": {},
+    }
+    for boss_alertness in args.boss_alertness:
+        workload = asyncio.run(run_workload(boss_alertness, args))
+        name = f"boss_alertness={boss_alertness}"
+        results["workloads"][name] = workload
+        latency = workload["latency_ms"]
+        print(f"{name:<20} {workload['calls_per_sec']:>9.1f} calls/s   "
+              f"p50 {latency['p50']:>7.2f}ms  p95 {latency['p95']:>7.2f}ms  p99 {latency['p99']:>7.2f}ms   "
+              f"lock wait {workload['lock']['wait_total_ms']:>7.2f}ms   rss {workload['rss_mb']}MB",
+              file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.max_regression)
+        if regressions:
+            print("❌ 성능 회귀 감지:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
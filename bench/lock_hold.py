@@ -0,0 +1,128 @@
+"""로깅 설정별 ChillMCPState._lock 보유 시간과 호출 지연 측정
+
+도구 호출과 같은 순서(update_stress_level → try_increase_boss_alert →
+get_current_status)로 여러 스레드가 상태 하나를 호출하면서, 락을 잡고 있던
+시간과 호출 한 번의 지연을 로깅 모드마다 비교합니다.
+
+- sync: 기존 logging.basicConfig와 같은 동기 핸들러 (파일에 기록)
+- async: logging_config의 큐 + 배치 writer
+- async-json: 위와 같고 JSON 포맷
+- off: 로깅 비활성화 (하한선)
+
+사용 예시:
+    python -m bench.lock_hold --threads 8 --calls 5000 --output lock_hold.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from bench.load import percentile
+from metrics import InstrumentedLock
+from state_manager import ChillMCPState
+
+MODES = ("sync", "async", "async-json", "off")
+
+def _configure(mode, log_path):
+    """모드에 맞게 루트 로거를 설정하고 정리 함수를 반환"""
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+        return lambda: logging.disable(logging.NOTSET)
+
+    stream = open(log_path, "a", encoding="utf-8")
+    if mode == "sync":
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%H:%M:%S'))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        writer = None
+    else:
+        from logging_config import configure_logging
+        writer = configure_logging(logging.INFO, log_format="json" if mode == "async-json" else "text",
+                                   async_mode=True, stream=stream)
+
+    def cleanup():
+        if writer:
+            writer.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        stream.close()
+    return cleanup
+
+def run_mode(mode, threads, calls, log_path):
+    """mode로 로깅을 설정하고 워크로드를 실행해 결과 딕셔너리를 반환"""
+    cleanup = _configure(mode, log_path)
+    state = ChillMCPState(50, 300, lazy_decay=True)
+    state._lock = InstrumentedLock(record_holds=True)
+    latencies = [[] for _ in range(threads)]
+
+    def worker(samples):
+        for _ in range(calls):
+            start = time.perf_counter()
+            state.update_stress_level(10)
+            state.try_increase_boss_alert()
+            state.get_current_status()
+            samples.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=worker, args=(samples,)) for samples in latencies]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    cleanup()
+
+    holds = sorted(state._lock.holds)
+    calls_latency = sorted(sample for samples in latencies for sample in samples)
+    return {
+        "calls": len(calls_latency),
+        "calls_per_sec": len(calls_latency) / elapsed,
+        "lock_hold_us": {
+            "mean": sum(holds) / len(holds) * 1e6,
+            "p50": percentile(holds, 0.50) * 1e6,
+            "p99": percentile(holds, 0.99) * 1e6,
+        },
+        "call_latency_us": {
+            "p50": percentile(calls_latency, 0.50) * 1e6,
+            "p99": percentile(calls_latency, 0.99) * 1e6,
+        },
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP lock hold time benchmark")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="Calls per thread")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {"threads": args.threads, "modes": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes:
+            result = run_mode(mode, args.threads, args.calls, os.path.join(directory, f"{mode}.log"))
+            results["modes"][mode] = result
+            hold, latency = result["lock_hold_us"], result["call_latency_us"]
+            print(f"{mode:12s} {result['calls_per_sec']:10.0f} calls/s   "
+                  f"lock hold mean {hold['mean']:7.1f}us p99 {hold['p99']:7.1f}us   "
+                  f"call p50 {latency['p50']:7.1f}us p99 {latency['p99']:8.1f}us", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""과부하에서 허용 제어 유무에 따른 꼬리 지연 시간 비교
+
+처리 능력보다 높은 속도로 도구 호출을 보내는 개방형(open-loop) 부하를 걸고,
+허용 제어 없이(none) 실행할 때와 --max_in_flight/--max_queue를 켠 채(admission)
+실행할 때 허용된 호출의 p50/p99 지연 시간, 초당 처리 수, 거절 비율, 거절 응답
+지연을 비교합니다. 허용 제어가 있으면 넘치는 호출은 바로 거절되므로 허용된
+호출의 지연은 부하가 늘어도 일정해야 합니다.
+
+사용 예시:
+    python -m bench.overload --rates 250 500 1000 2000 --duration 3 --output overload.json
+    python -m bench.overload --boss_alertness 100 --penalty_seconds 0.2 --rate_limit 300
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+
+from fastmcp.client import Client
+
+from bench.load import percentile
+from server import create_mcp_server
+
+MODES = ("none", "admission")
+
+async def run_workload(mode, rate, args):
+    """rate(호출/초)로 duration초 동안 호출을 보내고 결과 딕셔너리를 반환"""
+    admission = {}
+    if mode == "admission":
+        admission = {"max_in_flight": args.max_in_flight, "max_queue": args.max_queue,
+                     "rate_limit": args.rate_limit}
+    mcp = create_mcp_server(args.boss_alertness, 300, lazy_decay=True,
+                            boss_penalty_seconds=args.penalty_seconds, **admission)
+    accepted, rejected = [], []
+    pending = set()
+
+    async def call(index):
+        start = time.perf_counter()
+        result = await mcp_client.call_tool("take_a_break", {"agent_id": f"agent-{index % args.sessions}"},
+                                            raise_on_error=False)
+        (rejected if result.is_error else accepted).append(time.perf_counter() - start)
+
+    async with Client(mcp) as mcp_client:
+        start = time.perf_counter()
+        sent = 0
+        total = int(rate * args.duration)
+        while sent < total:
+            # 지금까지 보냈어야 할 만큼 한꺼번에 보냄 (느려져도 부하는 줄이지 않음)
+            due = min(total, int((time.perf_counter() - start) * rate) + 1)
+            for index in range(sent, due):
+                task = asyncio.ensure_future(call(index))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            sent = due
+            await asyncio.sleep(0.001)
+        send_elapsed = time.perf_counter() - start
+        await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - start
+
+    accepted.sort()
+    rejected.sort()
+    return {
+        "offered_per_sec": sent / send_elapsed,
+        "accepted_per_sec": len(accepted) / elapsed,
+        "rejected_ratio": len(rejected) / sent,
+        "accepted_latency_ms": {
+            "p50": percentile(accepted, 0.50) * 1000 if accepted else None,
+            "p99": percentile(accepted, 0.99) * 1000 if accepted else None,
+        },
+        "rejected_latency_ms": {
+            "p99": percentile(rejected, 0.99) * 1000 if rejected else None,
+        },
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP overload / admission control benchmark")
+    parser.add_argument("--rates", type=float, nargs="+", default=[250, 500, 1000, 2000],
+                        help="Offered load levels (calls per second)")
+    parser.add_argument("--duration", type=float, default=3)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--max_in_flight", type=int, default=32)
+    parser.add_argument("--max_queue", type=int, default=32)
+    parser.add_argument("--rate_limit", type=float, default=0,
+                        help="Global calls per second in admission mode (0 = no rate limit)")
+    parser.add_argument("--boss_alertness", type=int, default=0)
+    parser.add_argument("--penalty_seconds", type=float, default=0.0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+def _ms(value):
+    return f"{value:8.1f}" if value is not None else "       -"
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.disable(logging.CRITICAL)
+    results = {"max_in_flight": args.max_in_flight, "max_queue": args.max_queue, "rate_limit": args.rate_limit,
+               "boss_alertness": args.boss_alertness, "penalty_seconds": args.penalty_seconds, "modes": {}}
+    for mode in args.modes:
+        results["modes"][mode] = {}
+        for rate in args.rates:
+            result = asyncio.run(run_workload(mode, rate, args))
+            results["modes"][mode][str(rate)] = result
+            latency = result["accepted_latency_ms"]
+            print(f"{mode:10s} offered {result['offered_per_sec']:7.0f}/s  accepted {result['accepted_per_sec']:7.0f}/s  "
+                  f"rejected {result['rejected_ratio']:6.1%}  p50 {_ms(latency['p50'])}ms  p99 {_ms(latency['p99'])}ms  "
+                  f"reject p99 {_ms(result['rejected_latency_ms']['p99'])}ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""읽기 동시성이 높을 때 상태 읽기와 쓰기의 경합 측정
+
+상태 하나를 reader 스레드 여럿이 읽고 writer 스레드가 휴식을 계속 적용하는 동안,
+읽기 방식마다 초당 읽기 수, 읽기 지연 p50/p99, 초당 쓰기 수, 락 대기 시간 합계
+(locked에서는 읽는 쪽 대기 포함)를 비교합니다.
+
+- locked: 락을 잡고 밀린 증가/감소를 반영한 뒤 상태를 읽는 기존 방식
+- snapshot: get_current_status() (락 없이 마지막 스냅숏을 읽음)
+
+시계는 VirtualClock으로 고정하므로 자동 증가/감소는 일어나지 않습니다.
+--baseline을 주면 이전 결과보다 max_regression% 넘게 나빠졌을 때 1로 종료합니다.
+
+사용 예시:
+    python -m bench.read_contention --readers 1 4 16 64 --writers 2 --output read_contention.json
+    python -m bench.read_contention --baseline read_contention.json --max_regression 20
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+
+from bench.load import percentile
+from clock import VirtualClock
+from metrics import InstrumentedLock
+from state_manager import ChillMCPState
+
+READ_MODES = ("locked", "snapshot")
+
+def _locked_read(state):
+    """스냅숏 이전의 읽기 경로 (락 안에서 경과 시간 반영 후 상태 딕셔너리 생성)"""
+    with state._lock:
+        if state._apply_elapsed_decay(state.clock.time()):
+            state._changed_status()
+            state._take_events()
+        return state._status()
+
+def run_config(mode, readers, writers, reads):
+    """reader readers개가 reads번씩 읽는 동안 writer writers개가 쓰고 지표를 반환"""
+    state = ChillMCPState(50, 300, lazy_decay=True, clock=VirtualClock(start=1000), rng=random.Random(0))
+    lock = state._lock = InstrumentedLock()
+    read = state.get_current_status if mode == "snapshot" else lambda: _locked_read(state)
+    barrier = threading.Barrier(readers + writers + 1)
+    done = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    writes = [0] * writers
+
+    def reader(index):
+        samples = latencies[index]
+        perf_counter = time.perf_counter
+        barrier.wait()
+        for _ in range(reads):
+            start = perf_counter()
+            read()
+            samples.append(perf_counter() - start)
+
+    def writer(index):
+        barrier.wait()
+        while not done.is_set():
+            state.apply_breaks([1])
+            writes[index] += 1
+
+    reader_threads = [threading.Thread(target=reader, args=(index,)) for index in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+    for thread in reader_threads + writer_threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in reader_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in writer_threads:
+        thread.join()
+
+    samples = sorted(sample for reader_samples in latencies for sample in reader_samples)
+    return {
+        "mode": mode,
+        "readers": readers,
+        "writers": writers,
+        "reads": len(samples),
+        "writes": sum(writes),
+        "reads_per_sec": len(samples) / elapsed,
+        "writes_per_sec": sum(writes) / elapsed,
+        "read_latency_us": {
+            "p50": percentile(samples, 0.50) * 1e6,
+            "p99": percentile(samples, 0.99) * 1e6,
+        },
+        "lock": {
+            "acquisitions": lock.acquisitions,
+            "wait_total_ms": lock.wait_total * 1000,
+            "wait_max_ms": lock.wait_max * 1000,
+        },
+    }
+
+def find_regressions(results, baseline, max_regression):
+    """기준 결과보다 max_regression% 넘게 나빠진 항목 목록을 반환"""
+    tolerance = max_regression / 100
+    regressions = []
+    for name, current in results["configs"].items():
+        previous = baseline.get("configs", {}).get(name)
+        if previous is None:
+            continue
+        if current["reads_per_sec"] < previous["reads_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: reads_per_sec {previous['reads_per_sec']:.0f} → "
+                               f"{current['reads_per_sec']:.0f}")
+        if current["read_latency_us"]["p99"] > previous["read_latency_us"]["p99"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {previous['read_latency_us']['p99']:.1f}us → "
+                               f"{current['read_latency_us']['p99']:.1f}us")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP state read contention benchmark")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Reader thread counts to measure")
+    parser.add_argument("--writers", type=int, default=2,
+                        help="Writer threads applying breaks during the reads")
+    parser.add_argument("--reads", type=int, default=10000,
+                        help="Reads per reader thread")
+    parser.add_argument("--modes", nargs="+", choices=READ_MODES, default=list(READ_MODES))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--max_regression", type=float, default=20,
+                        help="Allowed regression in percent before failing")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    results = {
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "configs": {},
+    }
+    for readers in args.readers:
+        for mode in args.modes:
+            config = run_config(mode, readers, args.writers, args.reads)
+            results["configs"][f"{mode}/readers={readers}"] = config
+            print(f"{mode:<9} readers={readers:<4} {config['reads_per_sec']:>12,.0f} reads/s  "
+                  f"p50 {config['read_latency_us']['p50']:>8.1f}us  p99 {config['read_latency_us']['p99']:>9.1f}us  "
+                  f"writes {config['writes_per_sec']:>10,.0f}/s  "
+                  f"lock wait {config['lock']['wait_total_ms']:>9.1f}ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.max_regression)
+        if regressions:
+            print("❌ 성능 회귀 감지:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""도구 호출 트레이스 결정적 재생 (버전 간 상태 결과와 지연 시간 비교)
+
+main.py --trace로 기록한 트레이스를 create_mcp_server에 다시 실행합니다.
+서버는 가상 시계(VirtualClock)와 세션별 난수로 동작하므로, 같은 트레이스와
+같은 시드로 재생하면 코드가 같은 한 항상 같은 상태 결과가 나옵니다.
+
+- 시계는 호출 도착 시각과 Level 5 지연 마감 시각 순서대로 옮기고, 호출 하나를 보낸
+  뒤에는 그 호출이 끝나거나 가상 시계로 잠들 때까지 기다립니다.
+- --speed를 주지 않으면 최대 속도로, 주면 트레이스 시간을 speed배로 줄여 실제
+  시간에 맞춰 보냅니다. 어느 쪽이든 상태 결과는 같습니다.
+- --rng seeded(기본)는 세션마다 --seed와 세션 ID로 정한 난수를, recorded는
+  트레이스에 기록된 감소량과 보스 경계 판정을 그대로 씁니다. --seed를 주지 않으면
+  헤더에 기록된 서버의 --seed를 쓰므로 (없으면 0), 시드를 준 서버의 트레이스는
+  seeded로도 같은 상태 결과를 재현합니다.
+
+결과에는 호출별 결과의 digest, 세션별 최종 상태, 도구별 지연 p50/p99가 들어가며,
+--baseline을 주면 상태 결과가 다르거나 max_regression% 넘게 느려졌을 때 1로 종료합니다.
+Level 5 지연을 거친 호출은 가상 시계로 잠든 동안 다른 호출을 처리하므로 지연
+통계에서 빼고 penalized로만 셉니다.
+
+사용 예시:
+    python main.py --trace trace.jsonl
+    python -m bench.replay trace.jsonl --output replay.json
+    python -m bench.replay trace.jsonl --speed 10 --baseline replay.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import time
+from collections import defaultdict
+
+from fastmcp.client import Client
+
+from bench.load import percentile
+from clock import VirtualClock
+from server import create_mcp_server
+from session_trace import read_trace, recorded_rng_factory
+from state_store import seeded_rng_factory
+from tools import BOSS_PENALTY_SECONDS
+
+RNG_MODES = ("seeded", "recorded")
+
+def _arguments(event):
+    if event[1] == "batch_breaks":
+        return {"breaks": [{"tool": tool, "agent_id": session_id} for tool, session_id, _, _ in event[2]]}
+    return {"agent_id": event[2]}
+
+def _sessions(events):
+    sessions = set()
+    for event in events:
+        if event[1] == "batch_breaks":
+            sessions.update(item[1] for item in event[2])
+        else:
+            sessions.add(event[2])
+    return sorted(sessions)
+
+async def replay(header, events, speed: float | None = None, rng: str = "seeded", seed: int | None = None):
+    """트레이스를 재생하고 결과 딕셔너리를 반환 (seed가 없으면 헤더의 seed, 그것도 없으면 0)"""
+    if seed is None:
+        seed = header.get("seed") or 0
+    start_time = events[0][0] if events else 0.0
+    clock = VirtualClock(start=start_time)
+    rng_factory = seeded_rng_factory(seed)
+    if rng == "recorded":
+        rng_factory = recorded_rng_factory(events, rng_factory)
+    mcp = create_mcp_server(header.get("boss_alertness", 50), header.get("boss_alertness_cooldown", 300),
+                            lazy_decay=header.get("lazy_decay", False),
+                            max_sessions=header.get("max_sessions", 100_000),
+                            session_ttl=header.get("session_ttl", 3600),
+                            boss_penalty_seconds=header.get("boss_penalty_seconds", BOSS_PENALTY_SECONDS),
+                            clock=clock, rng_factory=rng_factory)
+    outcomes = [None] * len(events)
+    latencies = defaultdict(list)
+    penalized = 0
+    pending = set()
+
+    async def call(index, event):
+        nonlocal penalized
+        tool = event[1]
+        start = time.perf_counter()
+        result = await mcp_client.call_tool(tool, _arguments(event), raise_on_error=False)
+        elapsed = time.perf_counter() - start
+        if result.is_error:
+            outcomes[index] = "error"
+            return
+        data = result.structured_content
+        if tool == "batch_breaks":
+            outcomes[index] = [[item["stress_level"], item["boss_alert_level"]] for item in data["results"]]
+        else:
+            outcomes[index] = [data["stress_level"], data["boss_alert_level"]]
+        if data.get("penalty_seconds"):
+            penalized += 1
+        else:
+            latencies[tool].append(elapsed)
+
+    async def settle():
+        """보낸 호출이 모두 끝나거나 가상 시계로 잠들 때까지 대기"""
+        while pending and clock.pending_sleepers < len(pending):
+            await asyncio.sleep(0)
+
+    async def advance_to(target):
+        """target 시각까지 가면서 그 사이에 깨어나는 호출을 마감 시각 순서대로 처리"""
+        while True:
+            deadline = clock.next_deadline
+            step = target if deadline is None or deadline > target else deadline
+            if step > clock.time():
+                if speed:
+                    await asyncio.sleep((step - clock.time()) / speed)
+                clock.advance_to(step)
+            if mcp.scheduler is not None:
+                mcp.scheduler.run_due()
+            await settle()
+            if step >= target:
+                return
+
+    async with Client(mcp) as mcp_client:
+        wall_start = time.perf_counter()
+        for index, event in enumerate(events):
+            await advance_to(event[0])
+            task = asyncio.ensure_future(call(index, event))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            await settle()
+        # 마지막까지 남은 Level 5 지연
+        while pending:
+            await advance_to(clock.next_deadline)
+        wall_seconds = time.perf_counter() - wall_start
+
+        final_states = {}
+        for session_id in _sessions(events):
+            if session_id in mcp.state_store:
+                status = mcp.state_store.get(session_id).get_current_status()
+                final_states[session_id] = [status["stress_level"], status["boss_alert_level"]]
+
+    latency_ms = {}
+    for tool, values in sorted(latencies.items()):
+        values.sort()
+        latency_ms[tool] = {
+            "count": len(values),
+            "p50": round(percentile(values, 0.50) * 1000, 3),
+            "p99": round(percentile(values, 0.99) * 1000, 3),
+        }
+    return {
+        "events": len(events),
+        "sessions": len(final_states),
+        "rng": rng,
+        "seed": seed,
+        "speed": speed,
+        "virtual_seconds": round(clock.time() - start_time, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "events_per_sec": round(len(events) / wall_seconds, 1) if wall_seconds else None,
+        "penalized": penalized,
+        "outcome_digest": hashlib.sha256(json.dumps(outcomes, separators=(",", ":")).encode()).hexdigest(),
+        "latency_ms": latency_ms,
+        "final_states": final_states,
+    }
+
+def find_regressions(results, baseline, max_regression):
+    """기준 결과와 상태 결과가 다르거나 max_regression% 넘게 느려진 항목 목록을 반환"""
+    tolerance = max_regression / 100
+    regressions = []
+    if results["outcome_digest"] != baseline.get("outcome_digest"):
+        regressions.append(f"outcome_digest {baseline.get('outcome_digest')} → {results['outcome_digest']}")
+        previous_states = baseline.get("final_states", {})
+        differing = [session_id for session_id, state in results["final_states"].items()
+                     if previous_states.get(session_id) != state]
+        for session_id in differing[:5]:
+            regressions.append(f"{session_id}: 최종 상태 {previous_states.get(session_id)} → "
+                               f"{results['final_states'][session_id]}")
+    previous_rate = baseline.get("events_per_sec")
+    if previous_rate and results["events_per_sec"] < previous_rate * (1 - tolerance):
+        regressions.append(f"events_per_sec {previous_rate} → {results['events_per_sec']}")
+    for tool, current in results["latency_ms"].items():
+        previous = baseline.get("latency_ms", {}).get(tool)
+        if previous is None:
+            continue
+        for key in ("p50", "p99"):
+            if current[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{tool}: {key} {previous[key]}ms → {current[key]}ms")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Deterministic ChillMCP trace replay")
+    parser.add_argument("trace", help="Trace file written by main.py --trace")
+    parser.add_argument("--speed", type=float,
+                        help="Replay at this multiple of recorded real time (default: as fast as possible)")
+    parser.add_argument("--rng", choices=RNG_MODES, default="seeded",
+                        help="seeded: per-session RNG from --seed; recorded: reuse recorded reductions and boss rolls")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for --rng seeded (default: the seed recorded in the trace header, else 0)")
+    parser.add_argument("--log_level", default="ERROR",
+                        help="Server log level during the replay")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Previous replay results to compare against")
+    parser.add_argument("--max_regression", type=float, default=20,
+                        help="Allowed latency/throughput regression in percent before failing")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.speed is not None and args.speed <= 0:
+        print("❌ 오류: speed는 0보다 큰 값이어야 합니다.", file=sys.stderr)
+        return 1
+    logging.basicConfig(level=args.log_level)
+    header, events = read_trace(args.trace)
+    results = {"trace": args.trace, **asyncio.run(replay(header, events, args.speed, args.rng, args.seed))}
+    print(f"📼 {results['events']}건 재생 ({results['sessions']}개 세션, 가상 {results['virtual_seconds']}초): "
+          f"{results['wall_seconds']}초, {results['events_per_sec']} events/s, Level 5 지연 {results['penalized']}건",
+          file=sys.stderr)
+    for tool, latency in results["latency_ms"].items():
+        print(f"  {tool:<20} {latency['count']:>7}건  p50 {latency['p50']:>7.2f}ms  p99 {latency['p99']:>7.2f}ms",
+              file=sys.stderr)
+    print(f"  outcome digest: {results['outcome_digest']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.max_regression)
+        if regressions:
+            print("❌ 재생 결과 차이 또는 성능 회귀 감지:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""공유 메모리 상태(SharedChillMCPState)와 인프로세스 threading.Lock 상태 비교
+
+한 번의 "호출"은 도구 호출과 같은 순서로 update_stress_level → try_increase_boss_alert
+→ get_current_status를 실행합니다. 다음 구성을 각각 측정합니다.
+
+- local: 프로세스마다 독립된 ChillMCPState (threading.Lock, 프로세스 간 일관성 없음)
+- shared-same: 모든 프로세스/스레드가 공유 세그먼트의 같은 세션 슬롯을 갱신
+- shared-distinct: 프로세스마다 다른 세션 슬롯을 갱신 (슬롯별 락이라 경쟁 없음)
+- read: get_current_status() (락 없는 스냅숏, 공유 상태는 seqlock + 경과 시간 확인)와
+  seqlock 읽기(read_shared)의 초당 읽기 수
+
+사용 예시:
+    python -m bench.shared_state --processes 1 4 --threads 2 --calls 20000 --output shared.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+from shared_state import SharedChillMCPState, SharedStateSegment
+from state_manager import ChillMCPState
+
+SLOTS = 1024
+
+def _make_state(mode, path, process_index):
+    if mode == "local":
+        return ChillMCPState(50, 300, lazy_decay=True)
+    segment = SharedStateSegment(path, slot_count=SLOTS)
+    session_id = "agent" if mode == "shared-same" else f"agent-{process_index}"
+    return SharedChillMCPState(segment, session_id, 50, 300)
+
+def _run_calls(state, calls, threads):
+    """threads개 스레드로 calls번씩 호출하고 걸린 시간을 반환"""
+    def worker():
+        for _ in range(calls):
+            state.update_stress_level(1)
+            state.try_increase_boss_alert()
+            state.get_current_status()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+def _process_main(mode, path, process_index, calls, threads, barrier, results):
+    logging.basicConfig(level=logging.ERROR)
+    state = _make_state(mode, path, process_index)
+    barrier.wait()
+    results.put(_run_calls(state, calls, threads))
+
+def run_mode(mode, processes, threads, calls, path):
+    """processes개 프로세스에서 동시에 실행하고 전체 초당 호출 수를 반환"""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [context.Process(target=_process_main,
+                               args=(mode, path, index, calls, threads, barrier, results))
+               for index in range(processes)]
+    for process in workers:
+        process.start()
+    elapsed = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    total_calls = processes * threads * calls
+    return {
+        "processes": processes,
+        "threads": threads,
+        "calls": total_calls,
+        "calls_per_sec": total_calls / max(elapsed),
+    }
+
+def run_reads(path, reads):
+    """get_current_status()와 seqlock 읽기의 초당 읽기 수"""
+    local = ChillMCPState(50, 300, lazy_decay=True)
+    shared = SharedChillMCPState(SharedStateSegment(path, slot_count=SLOTS), "reader", 50, 300)
+    results = {}
+    for label, read in (("local_snapshot", local.get_current_status),
+                        ("shared_snapshot", shared.get_current_status),
+                        ("shared_seqlock", shared.read_shared)):
+        start = time.perf_counter()
+        for _ in range(reads):
+            read()
+        results[label] = reads / (time.perf_counter() - start)
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP shared-state benchmark")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4],
+                        help="Process counts to measure")
+    parser.add_argument("--threads", type=int, default=2,
+                        help="Threads per process")
+    parser.add_argument("--calls", type=int, default=20000,
+                        help="Calls per thread")
+    parser.add_argument("--reads", type=int, default=200000,
+                        help="Reads for the read benchmark")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+    results = {
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "modes": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "shared_state.bin")
+        for mode in ("local", "shared-same", "shared-distinct"):
+            for processes in args.processes:
+                label = f"{mode}/processes={processes}"
+                result = run_mode(mode, processes, args.threads, args.calls, path)
+                results["modes"][label] = result
+                print(f"{label:32s} {result['calls_per_sec']:12.0f} calls/s", file=sys.stderr)
+        results["reads_per_sec"] = run_reads(path, args.reads)
+        for label, value in results["reads_per_sec"].items():
+            print(f"read/{label:27s} {value:12.0f} reads/s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""stdio 전송과 Streamable HTTP(멀티 워커) 전송의 처리량 비교
+
+클라이언트마다 별도 프로세스로 부하를 줍니다. stdio는 서버 하나가 클라이언트
+하나만 받을 수 있으므로 클라이언트마다 서버 프로세스를 띄우고, http는
+클라이언트 전체가 서버 하나(워커 N개)를 공유합니다. 워커가 여럿이면 임시 파일의
+공유 상태(--shared_state)를 씁니다.
+
+사용 예시:
+    python -m bench.transport --clients 4 --calls 2000 --concurrency 16 --workers 1 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+import subprocess
+import sys
+import tempfile
+import time
+
+from fastmcp.client import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+from bench.load import ALL_TOOLS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"포트 {port}에서 서버가 시작되지 않았습니다.")
+
+async def run_workload(client, calls, concurrency, sessions):
+    """동시에 concurrency개의 호출을 유지하며 calls번 도구를 호출하고 지연 시간 목록을 반환"""
+    latencies = []
+    remaining = iter(range(calls))
+
+    async def worker():
+        for _ in remaining:
+            tool = random.choice(ALL_TOOLS)
+            start = time.perf_counter()
+            await client.call_tool(tool, {"agent_id": f"agent-{random.randrange(sessions)}"})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+def _report(label, results):
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    elapsed = max(client_elapsed for _, client_elapsed in results)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<16} {len(latencies) / elapsed:>10.1f} calls/s   "
+          f"p50 {statistics.median(latencies) * 1000:>7.2f}ms   p99 {p99 * 1000:>7.2f}ms")
+
+async def _client_session(target, calls, concurrency, sessions):
+    async with Client(target) as client:
+        return await run_workload(client, calls, concurrency, sessions)
+
+def _client_process(server_args, url, calls, concurrency, sessions):
+    """클라이언트 프로세스 하나의 부하 생성 (url이 없으면 전용 stdio 서버를 띄움)"""
+    if url is None:
+        target = PythonStdioTransport(MAIN, args=server_args)
+    else:
+        target = url
+    return asyncio.run(_client_session(target, calls, concurrency, sessions))
+
+def run_clients(server_args, url, args):
+    with ProcessPoolExecutor(args.clients) as pool:
+        futures = [
+            pool.submit(_client_process, server_args, url, args.calls // args.clients,
+                        args.concurrency, args.sessions)
+            for _ in range(args.clients)
+        ]
+        return [future.result() for future in futures]
+
+def bench_stdio(server_args, args):
+    _report(f"stdio x{args.clients}", run_clients(server_args, None, args))
+
+def bench_http(server_args, args, workers):
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as state_dir:
+        shared_args = ["--shared_state", os.path.join(state_dir, "chillmcp.state")] if workers > 1 else []
+        process = subprocess.Popen(
+            [sys.executable, MAIN, *server_args, *shared_args, "--transport", "http",
+             "--port", str(port), "--workers", str(workers)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT
+        )
+        try:
+            _wait_for_port(port)
+            results = run_clients(server_args, f"http://127.0.0.1:{port}/mcp", args)
+            _report(f"http workers={workers}", results)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description="ChillMCP transport throughput benchmark")
+    parser.add_argument("--clients", type=int, default=4,
+                        help="Number of client processes")
+    parser.add_argument("--calls", type=int, default=2000,
+                        help="Total tool calls across all clients")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="In-flight calls per client")
+    parser.add_argument("--sessions", type=int, default=1000,
+                        help="Number of distinct agent_id values")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4],
+                        help="Worker counts to benchmark for the http transport")
+    parser.add_argument("--boss_alertness", type=int, default=0,
+                        help="Keep at 0 to measure transport overhead without level 5 penalties")
+    args = parser.parse_args()
+
+    server_args = ["--boss_alertness", str(args.boss_alertness), "--lazy_decay"]
+    bench_stdio(server_args, args)
+    for workers in args.workers:
+        bench_http(server_args, args, workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+class SystemClock:
+    """실제 시간을 사용하는 기본 시계"""
+
+    def time(self) -> float:
+        """현재 시각 (epoch 초)"""
+        return time.time()
+
+    def monotonic(self) -> float:
+        """경과 시간 측정용 단조 증가 시각"""
+        return time.monotonic()
+
+    async def sleep(self, seconds: float):
+        """seconds초 동안 비동기 대기 (취소 가능)"""
+        await asyncio.sleep(seconds)
+
+class VirtualClock:
+    """테스트와 시뮬레이션용 수동 시계
+
+    advance()로 시간을 옮기기 전까지는 시간이 흐르지 않습니다.
+    sleep()으로 대기 중인 코루틴은 시계가 마감 시각을 지나면 깨어납니다.
+    하나의 이벤트 루프 안에서 사용하는 것을 전제로 합니다.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._sleepers = []
+        self._counter = itertools.count()
+        # 아직 깨어나지 않은 sleep() 수 (재생처럼 대기자가 많을 때 힙을 훑지 않도록 따로 셈)
+        self._pending = 0
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + seconds, next(self._counter), future))
+        self._pending += 1
+        try:
+            await future
+        finally:
+            # 깨어나기 전에 취소된 경우 (깨운 경우는 _wake()에서 셈)
+            if future.cancelled():
+                self._pending -= 1
+
+    def advance(self, seconds: float):
+        """시계를 seconds초 앞으로 옮기고 마감 시각이 지난 sleep()을 깨움"""
+        if seconds < 0:
+            raise ValueError("시계를 거꾸로 돌릴 수 없습니다.")
+        self._now += seconds
+        self._wake()
+
+    def advance_to(self, timestamp: float):
+        """시계를 timestamp 시각으로 옮기고 마감 시각이 지난 sleep()을 깨움"""
+        if timestamp < self._now:
+            raise ValueError("시계를 거꾸로 돌릴 수 없습니다.")
+        self._now = timestamp
+        self._wake()
+
+    def _wake(self):
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+                self._pending -= 1
+
+    @property
+    def next_deadline(self) -> float | None:
+        """가장 먼저 깨어날 sleep()의 마감 시각 (없으면 None)"""
+        # 취소된 대기자는 맨 앞에 올 때 버림
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        return self._sleepers[0][0] if self._sleepers else None
+
+    @property
+    def pending_sleepers(self) -> int:
+        """아직 깨어나지 않은 sleep() 호출 수"""
+        return self._pending
+
+    async def wait_for_sleepers(self, count: int, timeout: float = 5):
+        """sleep() 중인 코루틴이 count개 이상이 될 때까지 (실제 시간 기준 최대 timeout초) 대기"""
+        deadline = time.monotonic() + timeout
+        while self.pending_sleepers < count:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"sleep() 대기자가 {count}개가 되지 않았습니다 (현재 {self.pending_sleepers}개).")
+            await asyncio.sleep(0.001)
@@ -0,0 +1,169 @@
+"""큐 기반 비동기 로깅 설정
+
+configure_logging(async_mode=True)이면 로그 호출은 LogRecord를 큐에 넣기만 하고,
+백그라운드 스레드가 큐에 쌓인 레코드를 모아 포맷한 뒤 한 번에 씁니다.
+메시지 포맷(% 인자 치환 포함)과 I/O가 모두 그 스레드에서 일어나므로 도구 호출
+경로에는 레코드 생성 비용만 남습니다.
+
+extra={"rate_limited": True}로 기록한 레코드(쿨다운/자동 증가처럼 세션 수에
+비례해 쏟아지는 메시지)는 메시지 템플릿마다 초당 rate_limit개까지만 쓰고,
+생략한 수는 다음에 쓰는 레코드에 덧붙입니다.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%H:%M:%S'
+
+class TextFormatter(logging.Formatter):
+    """기본 텍스트 포맷 (속도 제한으로 생략된 수가 있으면 덧붙임)"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+    def format(self, record):
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{line} (비슷한 메시지 {suppressed}건 생략)" if suppressed else line
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 레코드 하나씩 JSON으로 포맷"""
+
+    def format(self, record):
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class RateLimitFilter(logging.Filter):
+    """rate_limited 레코드를 메시지 템플릿마다 초당 rate개로 제한
+
+    비동기 모드에서는 writer 스레드 하나에서만 호출됩니다. 동기 모드에서는
+    여러 스레드가 동시에 호출할 수 있어 제한이 근사치가 됩니다.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        # 초당 1개 미만이어도 한 줄은 쓸 수 있도록 버킷 크기는 최소 1
+        self.capacity = max(rate, 1)
+        # 템플릿 -> [토큰, 마지막 갱신 시각, 생략한 수]
+        self._buckets = {}
+
+    def filter(self, record):
+        if not getattr(record, "rate_limited", False) or self.rate <= 0:
+            return True
+        now = time.monotonic()
+        bucket = self._buckets.get(record.msg)
+        if bucket is None:
+            bucket = self._buckets[record.msg] = [self.capacity, now, 0]
+        bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+class _DeferredQueueHandler(QueueHandler):
+    """포맷하지 않고 레코드를 그대로 큐에 넣는 핸들러 (같은 프로세스 안에서만 사용)"""
+
+    def prepare(self, record):
+        return record
+
+class BatchingLogWriter:
+    """큐의 레코드를 모아 포맷하고 스트림에 한 번에 쓰는 백그라운드 스레드"""
+
+    def __init__(self, log_queue, stream, formatter, rate_limit: float = 0, batch_size: int = 256):
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.rate_filter = RateLimitFilter(rate_limit)
+        self.batch_size = batch_size
+        self._stop = object()
+        self._thread = threading.Thread(target=self._run, name="chillmcp-log-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is self._stop
+            if stopping:
+                batch.pop()
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, records):
+        lines = []
+        for record in records:
+            if not self.rate_filter.filter(record):
+                continue
+            lines.append(self.formatter.format(record))
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except (OSError, ValueError):
+                # 종료 중 스트림이 닫혔으면 버림
+                pass
+
+    def stop(self, timeout: float = 5):
+        """남은 레코드를 모두 쓰고 스레드 종료"""
+        if self._thread.is_alive():
+            self.queue.put(self._stop)
+            self._thread.join(timeout)
+
+def configure_logging(level=logging.INFO, log_format: str = "text", async_mode: bool = False,
+                      rate_limit: float = 0, stream=None):
+    """루트 로거 설정 (async_mode면 큐 + 배치 writer 스레드), writer를 반환 (동기면 None)"""
+    stream = stream or sys.stderr
+    if log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if not async_mode:
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(formatter)
+        if rate_limit > 0:
+            handler.addFilter(RateLimitFilter(rate_limit))
+        root.addHandler(handler)
+        return None
+
+    log_queue = queue.SimpleQueue()
+    writer = BatchingLogWriter(log_queue, stream, formatter, rate_limit=rate_limit)
+    writer.start()
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    atexit.register(writer.stop)
+    return writer
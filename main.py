@@ -9,14 +9,12 @@ import argparse
 import logging
 import sys
 
-from server import create_mcp_server
+from logging_config import configure_logging
+from notifications import DEFAULT_NOTIFY_INTERVAL
+from router import BACKENDS, DEFAULT_CACHE_DIR
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%H:%M:%S'
-)
+# fastmcp를 불러오는 server는 파라미터 검증을 마친 뒤 main()에서 import합니다.
+# (--help나 잘못된 파라미터에 약 1초를 쓰지 않도록, 위의 모듈들은 가볍게 유지)
 
 def main():
     """메인 실행 함수"""
@@ -25,8 +23,64 @@ def main():
                         help="Boss alertness increase probability (0-100, percentage)")
     parser.add_argument("--boss_alertness_cooldown", type=int, default=300,
                         help="Boss Alert Level auto-decrease interval (seconds)")
+    parser.add_argument("--rate_limit", type=float, default=0,
+                        help="Server-wide break tool calls per second (0 = unlimited)")
+    parser.add_argument("--rate_burst", type=float,
+                        help="Server-wide token bucket size (default: rate_limit)")
+    parser.add_argument("--session_rate_limit", type=float, default=0,
+                        help="Break tool calls per second per agent (0 = unlimited)")
+    parser.add_argument("--session_burst", type=float,
+                        help="Per-agent token bucket size (default: session_rate_limit)")
+    parser.add_argument("--max_in_flight", type=int, default=0,
+                        help="Max break tool calls running at once, including level 5 sleeps (0 = unlimited)")
+    parser.add_argument("--max_queue", type=int, default=0,
+                        help="Max calls waiting for tokens or an in-flight slot; the rest are rejected")
+    parser.add_argument("--max_defer", type=float, default=0,
+                        help="Seconds a rate-limited call may wait for tokens before being rejected (requires --max_queue)")
+    parser.add_argument("--lazy_decay", action="store_true",
+                        help="Compute stress/boss decay on read instead of background threads")
+    parser.add_argument("--max_sessions", type=int, default=100_000,
+                        help="Maximum number of session states kept in memory (LRU eviction)")
+    parser.add_argument("--session_ttl", type=float, default=3600,
+                        help="Idle seconds before a session state is evicted")
+    parser.add_argument("--state_dir",
+                        help="Persist session state (write-ahead log + snapshots) in this directory")
+    parser.add_argument("--shared_state",
+                        help="Share session state with other server processes through this memory-mapped file")
+    parser.add_argument("--shared_slots", type=int, default=4096,
+                        help="Number of session slots in the shared state file")
+    parser.add_argument("--router", choices=BACKENDS, default="auto",
+                        help="Intent router backend for route_request (embedding model or char n-gram TF-IDF)")
+    parser.add_argument("--router_cache_dir", default=DEFAULT_CACHE_DIR,
+                        help="Directory for cached tool-docstring embeddings")
+    parser.add_argument("--transport", choices=["stdio", "http", "sse"], default="stdio",
+                        help="MCP transport (stdio, streamable http, or sse)")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Host to bind for http/sse transports")
+    parser.add_argument("--port", type=int, default=8000,
+                        help="Port to bind for http/sse transports")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes for the http transport (requires --shared_state when > 1)")
+    parser.add_argument("--notify_interval", type=float, default=DEFAULT_NOTIFY_INTERVAL,
+                        help="Seconds over which chill://status change notifications are coalesced")
+    parser.add_argument("--async_logging", action="store_true",
+                        help="Format and write logs on a background thread instead of the calling thread")
+    parser.add_argument("--log_format", choices=["text", "json"], default="text",
+                        help="Log line format")
+    parser.add_argument("--log_rate_limit", type=float, default=1,
+                        help="Max cooldown/auto-increase log lines per second per message (0 disables the limit)")
+    parser.add_argument("--seed", type=int,
+                        help="Seed per-session random number generators so runs are reproducible")
+    parser.add_argument("--trace",
+                        help="Append every applied tool call to this trace file (replay with bench.replay)")
+    parser.add_argument("--profile_startup", "--profile-startup", action="store_true",
+                        help="Report per-module import and initialization time to stderr, then exit without serving")
 
     args = parser.parse_args()
+    profiler = None
+    if args.profile_startup:
+        from startup_profile import StartupProfiler
+        profiler = StartupProfiler().start()
 
     # 파라미터 검증
     if not (0 <= args.boss_alertness <= 100):
@@ -37,15 +91,130 @@ def main():
         print("❌ 오류: boss_alertness_cooldown은 0보다 큰 값이어야 합니다.", file=sys.stderr)
         sys.exit(1)
 
+    if min(args.rate_limit, args.session_rate_limit, args.max_in_flight, args.max_queue, args.max_defer) < 0:
+        print("❌ 오류: 호출 제한 값은 0 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.max_defer > 0 and args.max_queue == 0:
+        print("❌ 오류: max_defer는 max_queue가 1 이상일 때만 사용할 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if any(burst is not None and burst < 1 for burst in (args.rate_burst, args.session_burst)):
+        print("❌ 오류: rate_burst와 session_burst는 1 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.max_sessions <= 0 or args.session_ttl <= 0:
+        print("❌ 오류: max_sessions와 session_ttl은 0보다 큰 값이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers <= 0:
+        print("❌ 오류: workers는 0보다 큰 값이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers > 1 and args.transport != "http":
+        print("❌ 오류: workers > 1은 http 전송에서만 사용할 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers > 1 and not args.shared_state:
+        print("❌ 오류: workers > 1은 shared_state와 함께 사용해야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers > 1 and args.state_dir:
+        print("❌ 오류: state_dir은 워커가 하나일 때만 사용할 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workers > 1 and args.trace:
+        print("❌ 오류: trace는 워커가 하나일 때만 사용할 수 있습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.shared_state and args.state_dir:
+        print("❌ 오류: shared_state와 state_dir은 함께 사용할 수 없습니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.shared_slots <= 0:
+        print("❌ 오류: shared_slots는 0보다 큰 값이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.notify_interval <= 0:
+        print("❌ 오류: notify_interval은 0보다 큰 값이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.log_rate_limit < 0:
+        print("❌ 오류: log_rate_limit은 0 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    # 로깅 설정
+    configure_logging(logging.INFO, log_format=args.log_format, async_mode=args.async_logging,
+                      rate_limit=args.log_rate_limit)
+
     # 서버 시작 메시지 (stderr로 출력하여 MCP 프로토콜과 분리)
     print("🚀 ChillMCP 서버 시작!", file=sys.stderr)
     print(f"📊 Boss Alertness: {args.boss_alertness}%", file=sys.stderr)
     print(f"⏰ Boss Alert Cooldown: {args.boss_alertness_cooldown}초", file=sys.stderr)
+    if args.rate_limit or args.session_rate_limit or args.max_in_flight:
+        print(f"🚦 호출 제한: 전체 {args.rate_limit or '∞'}/s, 에이전트별 {args.session_rate_limit or '∞'}/s, "
+              f"동시 실행 {args.max_in_flight or '∞'}, 대기열 {args.max_queue}", file=sys.stderr)
+    if args.lazy_decay:
+        print("🧵 Lazy Decay: 백그라운드 스레드 없이 동작", file=sys.stderr)
+    if args.state_dir:
+        print(f"💾 State Dir: {args.state_dir}", file=sys.stderr)
+    if args.shared_state:
+        print(f"🔗 Shared State: {args.shared_state} (슬롯 {args.shared_slots}개)", file=sys.stderr)
+    if args.seed is not None:
+        print(f"🎲 Seed: {args.seed}", file=sys.stderr)
+    if args.trace:
+        print(f"📼 Trace: {args.trace}", file=sys.stderr)
+    if args.transport != "stdio":
+        print(f"🌐 Transport: {args.transport} ({args.host}:{args.port}, workers: {args.workers})", file=sys.stderr)
     print("=" * 50, file=sys.stderr)
 
+    server_config = {
+        "boss_alertness": args.boss_alertness,
+        "boss_alertness_cooldown": args.boss_alertness_cooldown,
+        "lazy_decay": args.lazy_decay,
+        "max_sessions": args.max_sessions,
+        "session_ttl": args.session_ttl,
+        "state_dir": args.state_dir,
+        "shared_state": args.shared_state,
+        "shared_slots": args.shared_slots,
+        "router_backend": args.router,
+        "router_cache_dir": args.router_cache_dir,
+        "notify_interval": args.notify_interval,
+        "rate_limit": args.rate_limit,
+        "rate_burst": args.rate_burst,
+        "session_rate_limit": args.session_rate_limit,
+        "session_burst": args.session_burst,
+        "max_in_flight": args.max_in_flight,
+        "max_queue": args.max_queue,
+        "max_defer": args.max_defer,
+        "seed": args.seed,
+        "trace_path": args.trace,
+    }
+
+    if profiler:
+        # 서버 import와 생성까지만 측정하고 종료 (멀티 워커도 워커 하나 기준)
+        with profiler.phase("import server"):
+            from server import create_mcp_server
+        with profiler.phase("create_mcp_server"):
+            mcp = create_mcp_server(**server_config)
+        profiler.stop()
+        mcp.state_store.close()
+        print(profiler.report(), file=sys.stderr)
+        return
+
+    from server import create_mcp_server, run_http_workers
+
+    # 멀티 워커는 워커 프로세스마다 서버를 생성
+    if args.workers > 1:
+        run_http_workers(server_config, args.host, args.port, args.workers)
+        return
+
     # MCP 서버 생성 및 실행
-    mcp = create_mcp_server(args.boss_alertness, args.boss_alertness_cooldown)
-    asyncio.run(mcp.run_stdio_async())
+    mcp = create_mcp_server(**server_config)
+    if args.transport == "stdio":
+        asyncio.run(mcp.run_stdio_async())
+    else:
+        asyncio.run(mcp.run_http_async(transport=args.transport, host=args.host, port=args.port))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,225 @@
+"""도구 호출 경로 계측: 도구별 지연 히스토그램, 락 대기, Level 5 지연, 보스 레벨 전이, 허용 제어
+
+get_metrics 도구는 snapshot()을, HTTP 전송의 /metrics 경로와
+get_metrics(format="prometheus")는 Prometheus 텍스트 형식(to_prometheus())을 반환합니다.
+계측값은 프로세스마다 따로 모이므로 멀티 워커에서는 워커별 값입니다.
+"""
+
+import bisect
+import threading
+import time
+from collections import Counter, deque
+
+# 지연 히스토그램 버킷 상한 (초), 마지막 +Inf 버킷은 암묵적
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1, 2.5, 5, 10, 25, 60)
+# get_metrics에 포함할 최근 보스 레벨 전이 수
+RECENT_TRANSITIONS = 100
+
+class Histogram:
+    """고정 버킷 히스토그램 (관측 한 번에 이진 탐색 한 번)"""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> float:
+        """fraction 분위수가 들어 있는 버킷의 상한 (상한이 없는 마지막 버킷이면 None)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+class InstrumentedLock:
+    """경합이 있을 때만 대기 시간을 재는 threading.Lock 대체
+
+    먼저 블로킹 없이 획득을 시도하므로 경합이 없는 경로의 추가 비용은
+    메서드 호출 한 번과 카운터 갱신뿐입니다. metrics를 주면 대기를
+    record_lock_wait()로 보고하고, record_holds면 획득부터 해제까지의 보유
+    시간을 holds에 모읍니다 (벤치마크용). 카운터는 락을 잡은 채로 갱신합니다.
+    """
+
+    __slots__ = ("_lock", "_metrics", "_acquired_at", "acquisitions", "wait_total", "wait_max", "holds")
+
+    def __init__(self, metrics=None, record_holds: bool = False):
+        self._lock = threading.Lock()
+        self._metrics = metrics
+        self._acquired_at = 0.0
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.holds = [] if record_holds else None
+
+    def acquire(self, blocking=True, timeout=-1):
+        if not self._lock.acquire(False):
+            if not blocking:
+                return False
+            start = time.perf_counter()
+            acquired = self._lock.acquire(True, timeout)
+            waited = time.perf_counter() - start
+            if self._metrics is not None:
+                self._metrics.record_lock_wait(waited)
+            if not acquired:
+                return False
+            self.wait_total += waited
+            if waited > self.wait_max:
+                self.wait_max = waited
+        self.acquisitions += 1
+        if self.holds is not None:
+            self._acquired_at = time.perf_counter()
+        return True
+
+    def release(self):
+        if self.holds is not None:
+            self.holds.append(time.perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+class Metrics:
+    """서버 한 프로세스의 계측값"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tool_latency = {}
+        self.lock_wait_seconds = 0.0
+        self.lock_contended = 0
+        self.penalties = 0
+        self.penalty_seconds = 0.0
+        # (이전 레벨, 새 레벨, 원인) -> 횟수
+        self.boss_transitions = Counter()
+        self.recent_transitions = deque(maxlen=RECENT_TRANSITIONS)
+        # (결과, 사유) -> 횟수, 결과는 rejected/deferred/queued
+        self.admission = Counter()
+
+    def observe_tool(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.tool_latency.get(name)
+            if histogram is None:
+                histogram = self.tool_latency[name] = Histogram()
+            histogram.observe(seconds)
+
+    def record_lock_wait(self, seconds: float):
+        with self._lock:
+            self.lock_contended += 1
+            self.lock_wait_seconds += seconds
+
+    def record_penalty(self, seconds: float):
+        with self._lock:
+            self.penalties += 1
+            self.penalty_seconds += seconds
+
+    def record_admission(self, outcome: str, reason: str):
+        with self._lock:
+            self.admission[(outcome, reason)] += 1
+
+    def attach(self, state, instrument_lock: bool = True):
+        """상태의 락을 계측하고 보스 레벨 전이를 기록하도록 콜백을 등록"""
+        if instrument_lock:
+            state._lock = InstrumentedLock(self)
+        state.add_boss_listener(self.boss_listener)
+
+    def boss_listener(self, state, old_level: int, new_level: int, cause: str):
+        """ChillMCPState.add_boss_listener()에 등록하는 콜백"""
+        with self._lock:
+            self.boss_transitions[(old_level, new_level, cause)] += 1
+            self.recent_transitions.append({
+                "session_id": state.session_id,
+                "from": old_level,
+                "to": new_level,
+                "cause": cause,
+                "time": state.clock.time()
+            })
+
+    def snapshot(self):
+        """get_metrics 도구가 반환하는 딕셔너리"""
+        with self._lock:
+            tools = {
+                name: {
+                    "count": histogram.count,
+                    "sum_seconds": histogram.sum,
+                    "p50_seconds": histogram.quantile(0.5),
+                    "p95_seconds": histogram.quantile(0.95),
+                    "p99_seconds": histogram.quantile(0.99),
+                }
+                for name, histogram in sorted(self.tool_latency.items())
+            }
+            return {
+                "tools": tools,
+                "lock": {
+                    "contended_acquisitions": self.lock_contended,
+                    "wait_seconds": self.lock_wait_seconds,
+                },
+                "penalties": {
+                    "count": self.penalties,
+                    "seconds": self.penalty_seconds,
+                },
+                "boss_transitions": {
+                    "counts": {f"{old}->{new} {cause}": count
+                               for (old, new, cause), count in sorted(self.boss_transitions.items())},
+                    "recent": list(self.recent_transitions),
+                },
+                "admission": {f"{outcome} {reason}": count
+                              for (outcome, reason), count in sorted(self.admission.items())},
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        with self._lock:
+            lines = [
+                "# HELP chillmcp_tool_latency_seconds Tool call latency.",
+                "# TYPE chillmcp_tool_latency_seconds histogram",
+            ]
+            for name, histogram in sorted(self.tool_latency.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'chillmcp_tool_latency_seconds_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'chillmcp_tool_latency_seconds_sum{{tool="{name}"}} {histogram.sum}')
+                lines.append(f'chillmcp_tool_latency_seconds_count{{tool="{name}"}} {histogram.count}')
+
+            lines += [
+                "# HELP chillmcp_lock_wait_seconds_total Time spent waiting on contended state locks.",
+                "# TYPE chillmcp_lock_wait_seconds_total counter",
+                f"chillmcp_lock_wait_seconds_total {self.lock_wait_seconds}",
+                "# HELP chillmcp_lock_contended_total Contended state lock acquisitions.",
+                "# TYPE chillmcp_lock_contended_total counter",
+                f"chillmcp_lock_contended_total {self.lock_contended}",
+                "# HELP chillmcp_boss_penalties_total Level 5 penalties applied.",
+                "# TYPE chillmcp_boss_penalties_total counter",
+                f"chillmcp_boss_penalties_total {self.penalties}",
+                "# HELP chillmcp_boss_penalty_seconds_total Total level 5 penalty delay.",
+                "# TYPE chillmcp_boss_penalty_seconds_total counter",
+                f"chillmcp_boss_penalty_seconds_total {self.penalty_seconds}",
+                "# HELP chillmcp_boss_transitions_total Boss alert level transitions.",
+                "# TYPE chillmcp_boss_transitions_total counter",
+            ]
+            for (old, new, cause), count in sorted(self.boss_transitions.items()):
+                lines.append(f'chillmcp_boss_transitions_total{{from="{old}",to="{new}",cause="{cause}"}} {count}')
+            lines += [
+                "# HELP chillmcp_admission_total Tool calls rejected, deferred or queued by admission control.",
+                "# TYPE chillmcp_admission_total counter",
+            ]
+            for (outcome, reason), count in sorted(self.admission.items()):
+                lines.append(f'chillmcp_admission_total{{outcome="{outcome}",reason="{reason}"}} {count}')
+            return "\n".join(lines) + "\n"
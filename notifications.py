@@ -0,0 +1,146 @@
+"""chill://status 리소스와 상태 변경 알림
+
+에이전트가 check_status를 반복 호출하는 대신 chill://status/{agent_id}
+리소스를 구독하면, Stress Level이나 Boss Alert Level이 실제로 바뀔 때
+(휴식, 보스 경계 상승, 자동 증가/감소 모두) notifications/resources/updated를
+받습니다. 알림은 세션마다 interval초에 한 번으로 합쳐 보내므로, 변경이
+몰려도 알림 수는 늘어나지 않습니다.
+
+구독은 2026-07-28 프로토콜의 subscriptions/listen으로 처리합니다.
+
+main.py가 기본값(DEFAULT_NOTIFY_INTERVAL)을 읽으려고 파라미터 검증 전에 import하므로,
+mcp와 tools(fastmcp)는 처음 쓸 때 import합니다.
+"""
+
+import asyncio
+import threading
+import weakref
+
+from state_store import DEFAULT_SESSION_ID
+
+STATUS_URI = "chill://status"
+
+# 같은 세션의 변경 알림을 합치는 간격 (초)
+DEFAULT_NOTIFY_INTERVAL = 0.5
+
+def status_uris(session_id: str):
+    """세션 상태가 바뀌었을 때 알릴 리소스 URI 목록
+
+    chill://status는 agent_id 없이 읽는 URI라 항상 기본 세션을 가리키므로 (stdio만
+    해당, http/sse에서는 읽을 수 없음) 기본 세션이 바뀔 때만 함께 알립니다.
+    """
+    if session_id == DEFAULT_SESSION_ID:
+        return [f"{STATUS_URI}/{session_id}", STATUS_URI]
+    return [f"{STATUS_URI}/{session_id}"]
+
+class StatusNotifier:
+    """상태 리스너로 변경을 모아 두었다가 interval마다 한 번씩 구독자에게 알림
+
+    리스너는 도구 스레드, 스케줄러 스레드 등 어느 스레드에서든 호출될 수
+    있으므로 변경된 세션만 기록하고, 실제 발행은 start()에 넘긴 이벤트
+    루프에서 합니다. start() 전이나 stop() 후의 변경은 알리지 않습니다.
+    """
+
+    def __init__(self, bus=None, interval: float = DEFAULT_NOTIFY_INTERVAL):
+        from mcp.server.subscriptions import InMemorySubscriptionBus, ResourceUpdated
+
+        self.bus = bus or InMemorySubscriptionBus()
+        self._resource_updated = ResourceUpdated
+        self.interval = interval
+        self.published = 0
+        # 마지막으로 알린 (stress_level, boss_alert_level), 정리된 상태는 자동으로 빠짐
+        self._levels = weakref.WeakKeyDictionary()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._flush_scheduled = False
+        self._task = None
+
+    def listener(self, state, status):
+        """ChillMCPState 상태 변경 콜백 (레벨이 그대로면 무시)"""
+        levels = (status["stress_level"], status["boss_alert_level"])
+        with self._lock:
+            if self._levels.get(state) == levels:
+                return
+            self._levels[state] = levels
+            if self._loop is None:
+                return
+            self._pending.add(state.session_id)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            loop = self._loop
+        loop.call_soon_threadsafe(self._schedule_flush)
+
+    def _schedule_flush(self):
+        self._task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._flush_scheduled = False
+        for session_id in pending:
+            for uri in status_uris(session_id):
+                await self.bus.publish(self._resource_updated(uri=uri))
+                self.published += 1
+
+    def start(self, loop=None):
+        """loop(기본: 실행 중인 루프)에서 알림 발행 시작"""
+        with self._lock:
+            self._loop = loop or asyncio.get_running_loop()
+
+    def stop(self):
+        """알림 발행 중지 (대기 중인 알림은 버림)"""
+        with self._lock:
+            self._loop = None
+            self._pending.clear()
+            self._flush_scheduled = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+def register_status_resource(mcp, store, interval: float = DEFAULT_NOTIFY_INTERVAL) -> StatusNotifier:
+    """chill://status 리소스와 subscriptions/listen 처리기를 등록하고 StatusNotifier를 반환
+
+    반환된 notifier는 서버 lifespan에서 start()/stop()해야 합니다.
+    """
+    from mcp import types
+    from mcp.server.subscriptions import ListenHandler
+
+    from tools import resolve_session_id
+
+    notifier = StatusNotifier(interval=interval)
+    store.add_listener(notifier.listener)
+    mcp._mcp_server.add_request_handler("subscriptions/listen", types.SubscriptionsListenRequestParams,
+                                        ListenHandler(notifier.bus))
+
+    def read_status(session_id: str) -> dict:
+        state = store.get(session_id)
+        status = state.get_current_status()
+        return {
+            "session_id": session_id,
+            "stress_level": status["stress_level"],
+            "boss_alert_level": status["boss_alert_level"],
+            "last_stress_increase": status["last_stress_increase"],
+            "last_boss_alert_decrease": status["last_boss_alert_decrease"],
+            "boss_alertness_cooldown": state.boss_alertness_cooldown,
+            "version": status["version"],
+        }
+
+    @mcp.resource(STATUS_URI, mime_type="application/json")
+    def current_status() -> dict:
+        """기본 세션의 스트레스와 보스 경계 레벨 (구독하면 레벨이 바뀔 때 알림)
+        http/sse에서는 클라이언트를 구분할 수 없으므로 chill://status/{agent_id}를 사용합니다."""
+        try:
+            session_id = resolve_session_id()
+        except ValueError:
+            raise ValueError(f"http/sse 전송에서는 {STATUS_URI}/{{agent_id}}를 읽고 구독해야 합니다.") from None
+        return read_status(session_id)
+
+    @mcp.resource(STATUS_URI + "/{agent_id}", mime_type="application/json")
+    def agent_status(agent_id: str) -> dict:
+        """에이전트별 스트레스와 보스 경계 레벨 (구독하면 레벨이 바뀔 때 알림)"""
+        return read_status(agent_id)
+
+    return notifier
@@ -0,0 +1,163 @@
+"""세션 상태 영속화: write-ahead log + 주기적 스냅샷
+
+도구 호출 경로에서는 변경된 상태를 메모리 큐에 넣기만 하고, 백그라운드
+writer 스레드가 큐를 모아 한 번에 쓰고 fsync합니다 (group commit).
+로그가 snapshot_records개를 넘거나 snapshot_interval초가 지나면 세션별 최신
+상태를 스냅샷으로 압축하고 로그를 비웁니다.
+
+기동 시에는 스냅샷 + 로그 꼬리만 읽으므로 복구 시간은 세션 수와
+snapshot_records로 제한됩니다. 레코드는 세션의 전체 상태와 version을 담으므로
+같은 레코드를 여러 번 재생해도 결과가 같습니다.
+"""
+
+import json
+import os
+import threading
+import time
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "state.log"
+SNAPSHOT_FILE = "state.snapshot"
+
+# 로그/스냅샷에 저장하는 상태 필드 순서
+STATUS_FIELDS = ("version", "stress_level", "boss_alert_level",
+                 "last_stress_increase", "last_boss_alert_decrease")
+
+def _encode(status):
+    return [status[field] for field in STATUS_FIELDS]
+
+def _decode(values):
+    return dict(zip(STATUS_FIELDS, values))
+
+class StateJournal:
+    """세션 상태 변경 로그와 스냅샷을 관리하는 클래스"""
+
+    def __init__(self, directory: str, flush_interval: float = 0.05,
+                 snapshot_interval: float = 60, snapshot_records: int = 100_000):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_records = snapshot_records
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        # deque.append/popleft는 스레드 안전하므로 호출 경로에서 락이 필요 없음
+        self._pending = deque()
+        # session_id -> 인코딩된 최신 상태 (writer 스레드만 갱신)
+        self._latest = {}
+        self._records_since_snapshot = 0
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        self._log = None
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self):
+        """스냅샷과 로그를 재생해 세션별 최신 상태를 읽어 들이고 세션 수를 반환"""
+        latest = {}
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as snapshot:
+                latest = json.load(snapshot)
+
+        replayed = 0
+        if os.path.exists(self._log_path):
+            with open(self._log_path, encoding="utf-8") as log:
+                for line in log:
+                    try:
+                        session_id, values = json.loads(line)
+                    except ValueError:
+                        # 비정상 종료로 마지막 줄이 잘렸을 수 있음
+                        logger.warning("⚠️ 손상된 로그 레코드를 건너뜁니다.")
+                        continue
+                    previous = latest.get(session_id)
+                    if previous is None or values[0] > previous[0]:
+                        latest[session_id] = values
+                    replayed += 1
+
+        self._latest = latest
+        self._records_since_snapshot = replayed
+        logger.info("💾 상태 복구: 세션 %s개 (로그 레코드 %s개 재생)", len(latest), replayed)
+        return len(latest)
+
+    def latest(self, session_id: str):
+        """세션의 가장 최근 기록 상태 (아직 쓰이지 않은 레코드 포함), 없으면 None"""
+        values = self._latest.get(session_id)
+        for pending_id, pending_values in list(self._pending):
+            if pending_id == session_id and (values is None or pending_values[0] > values[0]):
+                values = pending_values
+        return _decode(values) if values else None
+
+    def start(self):
+        """writer 스레드 시작"""
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def record(self, session_id: str, status):
+        """상태 변경 기록 (I/O 없이 큐에만 추가)"""
+        self._pending.append((session_id, _encode(status)))
+
+    def listener(self, state, status):
+        """ChillMCPState.add_listener()에 등록하는 콜백"""
+        self.record(state.session_id, status)
+
+    def _writer(self):
+        last_snapshot = time.monotonic()
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+            now = time.monotonic()
+            if (self._records_since_snapshot >= self.snapshot_records
+                    or (self._records_since_snapshot and now - last_snapshot >= self.snapshot_interval)):
+                self._snapshot()
+                last_snapshot = now
+        self._flush()
+        if self._records_since_snapshot:
+            self._snapshot()
+
+    def _flush(self):
+        """큐에 쌓인 레코드를 한 번에 쓰고 fsync"""
+        lines = []
+        pending = self._pending
+        while pending:
+            session_id, values = pending.popleft()
+            previous = self._latest.get(session_id)
+            if previous is not None and values[0] <= previous[0]:
+                # 락 밖에서 콜백이 호출되므로 순서가 뒤바뀐 오래된 레코드는 버림
+                continue
+            self._latest[session_id] = values
+            lines.append(json.dumps([session_id, values], separators=(",", ":")))
+        if not lines:
+            return
+        self._log.write("\n".join(lines) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._records_since_snapshot += len(lines)
+
+    def _snapshot(self):
+        """최신 상태를 스냅샷으로 원자적으로 저장하고 로그를 비움"""
+        temp_path = self._snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot:
+            json.dump(self._latest, snapshot, separators=(",", ":"))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, self._snapshot_path)
+
+        # 스냅샷이 기록된 뒤에 로그를 비우므로 그 사이에 죽어도 재생 결과는 같음
+        self._log.close()
+        self._log = open(self._log_path, "w", encoding="utf-8")
+        self._records_since_snapshot = 0
+        logger.info("💾 상태 스냅샷 저장: 세션 %s개", len(self._latest))
+
+    def close(self):
+        """남은 레코드를 기록하고 마지막 스냅샷을 저장한 뒤 종료"""
+        if self._thread is None:
+            return
+        self._closed.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        self._log.close()
@@ -0,0 +1,253 @@
+"""자연어 요청을 도구 이름으로 매핑하는 의도 라우터
+
+도구 docstring과 ROUTE_HINTS의 예시 문구를 도구별 문서로 삼아, 요청 문장과
+가장 비슷한 문서의 도구를 고릅니다. 백엔드는 두 가지입니다.
+
+- embedding: sentence-transformers 모델 임베딩의 코사인 유사도. torch를 포함한
+  모델 라이브러리는 첫 라우팅 때 import하므로 서버 기동 시간에는 영향이 없습니다.
+  문서 임베딩은 cache_dir에 문서 해시별로 저장해 재시작 시 다시 계산하지 않습니다.
+- ngram: 문자 n-gram TF-IDF 코사인 유사도. 추가 의존성 없이 CPU에서 동작합니다.
+
+auto는 embedding을 시도하고, 모델을 불러올 수 없으면 ngram으로 대체합니다.
+같은 문장은 LRU 캐시에서 바로 응답하고, 동시에 들어온 요청은 batch_window초 동안
+모아 한 번에 인코딩합니다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "chillmcp", "router")
+BACKENDS = ("auto", "embedding", "ngram")
+
+# docstring만으로는 짧은 구어체 요청과 겹치는 표현이 적어 도구별 예시 문구를 함께 색인
+ROUTE_HINTS = {
+    "take_a_break": "잠깐 쉬기, 쉬고 싶어, 휴식, 피곤해, 숨 돌리기, take a break, rest",
+    "watch_netflix": "넷플릭스 보기, 드라마 보기, 영화 보기, 정주행, netflix, watch a movie",
+    "show_meme": "밈 보기, 짤 보기, 웃긴 거, 재밌는 거, meme, something funny",
+    "bathroom_break": "화장실 다녀오기, 화장실 가기, 볼일, bathroom, restroom",
+    "coffee_mission": "커피 마시기, 커피 타기, 카페, 탕비실, coffee",
+    "urgent_call": "전화 받기, 급한 전화, 통화, phone call",
+    "deep_thinking": "생각하기, 멍 때리기, 사색, 고민, think, daydream",
+    "email_organizing": "이메일 정리, 메일 확인, 온라인 쇼핑, email, inbox",
+    "check_status": "상태 확인, 스트레스 얼마, 보스 경계 확인, 지금 상태, status",
+}
+
+def normalize(text: str) -> str:
+    """캐시 키와 n-gram 추출에 쓰는 정규화 (NFC, 소문자, 구두점/공백 정리)"""
+    text = unicodedata.normalize("NFC", text).lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+class NgramIndex:
+    """문자 n-gram TF-IDF 색인"""
+
+    min_score = 0.15
+
+    def __init__(self, documents, sizes=(2, 3)):
+        self.sizes = sizes
+        counts = [self._ngrams(document) for document in documents]
+        document_frequency = Counter(gram for count in counts for gram in count)
+        total = len(documents)
+        self._idf = {gram: math.log((1 + total) / (1 + frequency)) + 1
+                     for gram, frequency in document_frequency.items()}
+        self._vectors = [self._vector(count) for count in counts]
+
+    def _ngrams(self, text):
+        padded = f" {normalize(text)} "
+        return Counter(padded[i:i + size] for size in self.sizes
+                       for i in range(len(padded) - size + 1))
+
+    def _vector(self, count):
+        vector = {gram: (1 + math.log(tf)) * self._idf[gram]
+                  for gram, tf in count.items() if gram in self._idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {gram: weight / norm for gram, weight in vector.items()} if norm else {}
+
+    def score(self, texts):
+        """문장마다 문서별 유사도 목록을 반환"""
+        scores = []
+        for text in texts:
+            query = self._vector(self._ngrams(text))
+            scores.append([sum(weight * document.get(gram, 0.0) for gram, weight in query.items())
+                           for document in self._vectors])
+        return scores
+
+class SentenceTransformerEncoder:
+    """sentence-transformers 모델 래퍼 (생성 시 torch를 import)"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts):
+        return self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+
+class EmbeddingIndex:
+    """문서 임베딩 색인 (문서 해시별 디스크 캐시)"""
+
+    min_score = 0.3
+
+    def __init__(self, documents, encoder, cache_dir: str | None = None):
+        import numpy as np
+
+        self._np = np
+        self._encoder = encoder
+        keys = [hashlib.sha256(document.encode("utf-8")).hexdigest() for document in documents]
+        cached = self._load_cache(cache_dir, encoder.model_name)
+        missing = [(key, document) for key, document in zip(keys, documents) if key not in cached]
+        if missing:
+            vectors = encoder.encode([document for _, document in missing])
+            cached.update((key, vector) for (key, _), vector in zip(missing, vectors))
+            self._save_cache(cache_dir, encoder.model_name, cached)
+        self._matrix = np.stack([cached[key] for key in keys])
+
+    @staticmethod
+    def _cache_path(cache_dir, model_name):
+        slug = re.sub(r"[^\w.-]", "_", model_name)
+        return os.path.join(cache_dir, f"{slug}.npz")
+
+    def _load_cache(self, cache_dir, model_name):
+        if not cache_dir:
+            return {}
+        path = self._cache_path(cache_dir, model_name)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with self._np.load(path) as archive:
+                return {key: archive[key] for key in archive.files}
+        except (OSError, ValueError):
+            logger.warning("⚠️ 임베딩 캐시를 읽을 수 없어 다시 계산합니다: %s", path)
+            return {}
+
+    def _save_cache(self, cache_dir, model_name, vectors):
+        if not cache_dir:
+            return
+        os.makedirs(cache_dir, exist_ok=True)
+        path = self._cache_path(cache_dir, model_name)
+        temp_path = path + ".tmp.npz"
+        self._np.savez(temp_path, **vectors)
+        os.replace(temp_path, path)
+
+    def score(self, texts):
+        queries = self._encoder.encode(texts)
+        return (self._np.asarray(queries) @ self._matrix.T).tolist()
+
+class IntentRouter:
+    """자연어 요청을 가장 비슷한 도구로 매핑하는 라우터
+
+    documents는 {도구 이름: docstring}입니다. 색인은 첫 라우팅 때 만들어집니다.
+    route()/route_many()/route_async()는 (도구 이름, 유사도)를 반환하며,
+    유사도가 백엔드의 min_score보다 낮으면 도구 이름은 None입니다.
+    """
+
+    def __init__(self, documents, backend: str = "auto", model_name: str = DEFAULT_MODEL,
+                 cache_dir: str | None = DEFAULT_CACHE_DIR, cache_size: int = 1024,
+                 batch_window: float = 0.005, encoder=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend는 {', '.join(BACKENDS)} 중 하나여야 합니다.")
+        self.names = list(documents)
+        self._documents = [f"{name.replace('_', ' ')}\n{documents[name]}\n{ROUTE_HINTS.get(name, '')}"
+                           for name in self.names]
+        self.backend = backend
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self._encoder = encoder
+        self._index = None
+        self._index_lock = threading.Lock()
+        # 정규화된 문장 -> (도구 이름, 유사도), 앞쪽일수록 오래 사용되지 않은 문장
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending = []
+        self._flush_task = None
+
+    def _get_index(self):
+        """색인을 처음 쓸 때 생성 (모델 import와 문서 인코딩 포함)"""
+        with self._index_lock:
+            if self._index is None:
+                self._index = self._build_index()
+                self.backend = "ngram" if isinstance(self._index, NgramIndex) else "embedding"
+                logger.info("🧭 의도 라우터 준비 완료 (%s, 도구 %s개)", self.backend, len(self.names))
+            return self._index
+
+    def _build_index(self):
+        if self.backend == "ngram":
+            return NgramIndex(self._documents)
+        try:
+            encoder = self._encoder or SentenceTransformerEncoder(self.model_name)
+            return EmbeddingIndex(self._documents, encoder, self.cache_dir)
+        except Exception as error:
+            if self.backend == "embedding":
+                raise
+            logger.warning("⚠️ 임베딩 모델을 불러올 수 없어 n-gram 라우터를 사용합니다: %s", error)
+            return NgramIndex(self._documents)
+
+    def route_many(self, texts):
+        """여러 문장을 한 번에 라우팅 (캐시에 없는 문장만 한 배치로 인코딩)"""
+        keys = [normalize(text) for text in texts]
+        results = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[key] = self._cache[key]
+        misses = [key for key in dict.fromkeys(keys) if key not in results]
+
+        if misses:
+            index = self._get_index()
+            for key, scores in zip(misses, index.score(misses)):
+                best = max(range(len(scores)), key=scores.__getitem__)
+                score = float(scores[best])
+                results[key] = (self.names[best] if score >= index.min_score else None, score)
+            with self._cache_lock:
+                for key in misses:
+                    self._cache[key] = results[key]
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [results[key] for key in keys]
+
+    def route(self, text: str):
+        """문장 하나를 라우팅"""
+        return self.route_many([text])[0]
+
+    async def route_async(self, text: str):
+        """동시에 들어온 요청을 batch_window초 동안 모아 별도 스레드에서 한 번에 라우팅"""
+        key = normalize(text)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.batch_window)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        try:
+            results = await asyncio.to_thread(self.route_many, [text for text, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,143 @@
+"""자동 증가/감소 마감 시각을 관리하는 프로세스 단위 스케줄러
+
+lazy_decay가 아닌 상태들은 상태마다 스레드를 두는 대신, 다음 마감 시각
+(스트레스 자동 증가, Boss Alert cooldown)을 스케줄러 하나에 등록합니다.
+스케줄러 스레드는 힙에서 가장 이른 마감 시각까지만 잠들었다가 그 시각에
+콜백을 실행하므로, 상태 수와 무관하게 스레드는 하나이고 폴링도 없습니다.
+
+콜백은 스케줄러 락 밖에서 실행되며, 다음 마감 시각은 콜백이 직접
+schedule()로 다시 등록합니다.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+class _Entry:
+    """힙 항목 (취소되면 callback이 None)"""
+
+    __slots__ = ("deadline", "seq", "callback")
+
+    def __init__(self, deadline: float, seq: int, callback):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+class DecayScheduler:
+    """마감 시각 힙과 스레드 하나로 이루어진 스케줄러
+
+    start()/stop()으로 스레드를 시작/종료합니다. 스레드 없이 run_due()를
+    직접 호출해 구동할 수도 있으며, VirtualClock과 함께 쓸 때는 이 방식을
+    사용합니다 (스레드의 대기 시간은 실제 시간 기준).
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def schedule(self, deadline: float, callback) -> _Entry:
+        """deadline(clock.time() 기준)에 callback()을 실행하도록 등록하고 취소용 항목을 반환"""
+        entry = _Entry(deadline, next(self._counter), callback)
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            # 가장 이른 마감 시각이 바뀌었을 때만 스레드를 깨움
+            if self._heap[0] is entry:
+                self._cond.notify()
+        return entry
+
+    def cancel(self, entry: _Entry):
+        """등록 취소 (힙에서는 마감 시각이 되었을 때 버려짐)"""
+        entry.callback = None
+
+    def _pop_due(self, now: float):
+        """마감된 항목 하나를 꺼냄 (_cond 보유 상태에서 호출)"""
+        heap = self._heap
+        while heap and heap[0].callback is None:
+            heapq.heappop(heap)
+        if heap and heap[0].deadline <= now:
+            return heapq.heappop(heap)
+        return None
+
+    def _fire(self, entry: _Entry):
+        callback = entry.callback
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception:
+            logger.exception("자동 증가/감소 콜백 실행 중 오류")
+
+    def run_due(self) -> int:
+        """지금까지 마감된 콜백을 모두 실행하고 실행한 수를 반환"""
+        count = 0
+        while True:
+            with self._cond:
+                entry = self._pop_due(self.clock.time())
+            if entry is None:
+                return count
+            self._fire(entry)
+            count += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    now = self.clock.time()
+                    entry = self._pop_due(now)
+                    if entry is not None:
+                        break
+                    self._cond.wait(self._heap[0].deadline - now if self._heap else None)
+            self._fire(entry)
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="chillmcp-decay-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        """스케줄러 스레드 종료 (등록된 마감 시각은 유지되어 start()로 이어서 실행)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __len__(self):
+        """취소되지 않은 등록 수"""
+        with self._cond:
+            return sum(1 for entry in self._heap if entry.callback is not None)
+
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+def default_scheduler() -> DecayScheduler:
+    """실제 시간을 쓰는 프로세스 공용 스케줄러 (처음 호출할 때 시작)"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = DecayScheduler()
+            _default_scheduler.start()
+        return _default_scheduler
@@ -1,13 +1,140 @@
+import json
+import os
+import logging
+from contextlib import asynccontextmanager
+
 from fastmcp import FastMCP
-from state_manager import ChillMCPState
-from tools import register_tools
-
-def create_mcp_server(boss_alertness: int, boss_alertness_cooldown: int):
-    """MCP 서버를 생성하고 모든 도구를 등록합니다."""
-    state = ChillMCPState(boss_alertness, boss_alertness_cooldown)
-    mcp = FastMCP("ChillMCP")
-    
-    # 상태 관리자와 도구를 MCP 서버에 등록
-    register_tools(mcp, state)
-    
+
+from admission import AdmissionController
+from metrics import Metrics
+from notifications import DEFAULT_NOTIFY_INTERVAL, register_status_resource
+from router import DEFAULT_CACHE_DIR
+from scheduler import DecayScheduler
+from state_store import StateStore, seeded_rng_factory
+from tools import BOSS_PENALTY_SECONDS, register_tools
+
+logger = logging.getLogger(__name__)
+
+# 멀티 워커 HTTP 모드에서 각 워커 프로세스로 서버 설정을 전달하는 환경 변수
+SERVER_CONFIG_ENV = "CHILLMCP_SERVER_CONFIG"
+
+def create_mcp_server(boss_alertness: int, boss_alertness_cooldown: int, lazy_decay: bool = False,
+                      max_sessions: int = 100_000, session_ttl: float = 3600,
+                      boss_penalty_seconds: float = BOSS_PENALTY_SECONDS, clock=None,
+                      state_dir: str | None = None, shared_state: str | None = None,
+                      shared_slots: int = 4096, router_backend: str = "auto",
+                      router_cache_dir: str | None = DEFAULT_CACHE_DIR,
+                      notify_interval: float = DEFAULT_NOTIFY_INTERVAL,
+                      rate_limit: float = 0, rate_burst: float | None = None,
+                      session_rate_limit: float = 0, session_burst: float | None = None,
+                      max_in_flight: int = 0, max_queue: int = 0, max_defer: float = 0,
+                      seed: int | None = None, rng_factory=None, trace_path: str | None = None):
+    """MCP 서버를 생성하고 모든 도구를 등록합니다.
+
+    clock을 주면 상태 갱신과 Level 5 지연이 모두 그 시계를 따릅니다 (기본: 실제 시간).
+    state_dir을 주면 세션 상태를 그 디렉터리에 기록하고 재시작 시 복구합니다.
+    shared_state를 주면 세션 상태를 그 파일의 공유 메모리 세그먼트에 두어, 같은
+    파일을 쓰는 모든 서버 프로세스가 하나의 보스를 봅니다.
+    router_backend와 router_cache_dir은 route_request 도구의 의도 라우터 설정입니다.
+    lazy_decay가 아니면 서버마다 스케줄러 스레드 하나가 모든 세션의 자동
+    증가/감소를 맡으며, 서버 lifespan과 함께 시작/종료됩니다.
+    chill://status 리소스 구독자에게는 레벨 변경을 notify_interval초 단위로 모아 알립니다.
+    rate_limit부터 max_defer까지는 휴식 도구의 허용 제어 설정입니다 (admission.AdmissionController).
+    seed를 주면 세션마다 seed와 세션 ID로 정해지는 난수를 쓰고, rng_factory(session_id)를
+    주면 그 난수 생성기를 씁니다 (기본: random 모듈 공유).
+    trace_path를 주면 도구 호출을 그 파일에 기록합니다 (session_trace.TraceRecorder).
+    """
+    if shared_state and state_dir:
+        raise ValueError("shared_state와 state_dir은 함께 사용할 수 없습니다.")
+    journal = None
+    if state_dir:
+        from persistence import StateJournal
+        journal = StateJournal(state_dir)
+    segment = None
+    if shared_state:
+        from shared_state import SharedStateSegment
+        segment = SharedStateSegment(shared_state, slot_count=shared_slots)
+    if rng_factory is None and seed is not None:
+        rng_factory = seeded_rng_factory(seed)
+    trace = None
+    if trace_path:
+        from session_trace import TraceRecorder
+        trace = TraceRecorder(trace_path, config={
+            "boss_alertness": boss_alertness,
+            "boss_alertness_cooldown": boss_alertness_cooldown,
+            "boss_penalty_seconds": boss_penalty_seconds,
+            "lazy_decay": lazy_decay,
+            "max_sessions": max_sessions,
+            "session_ttl": session_ttl,
+            "seed": seed,
+        })
+    metrics = Metrics()
+    admission = AdmissionController(rate=rate_limit, burst=rate_burst,
+                                    session_rate=session_rate_limit, session_burst=session_burst,
+                                    max_in_flight=max_in_flight, max_queue=max_queue, max_defer=max_defer,
+                                    max_sessions=max_sessions, clock=clock, metrics=metrics)
+    # 공유 상태는 항상 lazy_decay로 동작하므로 스케줄러가 필요 없음
+    scheduler = None if lazy_decay or segment else DecayScheduler(clock)
+    store = StateStore(boss_alertness, boss_alertness_cooldown, lazy_decay=lazy_decay,
+                       max_sessions=max_sessions, idle_ttl=session_ttl, clock=clock,
+                       journal=journal, shared_segment=segment, metrics=metrics,
+                       scheduler=scheduler, rng_factory=rng_factory)
+
+    @asynccontextmanager
+    async def lifespan(server):
+        """스케줄러를 시작하고, 서버 종료 시 모든 세션 상태의 백그라운드 작업을 정리"""
+        if scheduler is not None:
+            scheduler.start()
+        notifier.start()
+        try:
+            yield {}
+        finally:
+            notifier.stop()
+            if scheduler is not None:
+                scheduler.stop()
+            store.close()
+            if trace is not None:
+                trace.close()
+            logger.info("🛑 ChillMCP 상태 정리 완료")
+
+    mcp = FastMCP("ChillMCP", lifespan=lifespan)
+    mcp.state_store = store
+    mcp.metrics = metrics
+    mcp.admission = admission
+    mcp.scheduler = scheduler
+    mcp.trace = trace
+
+    # 세션별 상태 저장소와 도구를 MCP 서버에 등록
+    register_tools(mcp, store, boss_penalty_seconds=boss_penalty_seconds,
+                   router_backend=router_backend, router_cache_dir=router_cache_dir,
+                   metrics=metrics, admission=admission, trace=trace)
+    notifier = register_status_resource(mcp, store, interval=notify_interval)
+    mcp.notifier = notifier
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(request):
+        """http/sse 전송에서 Prometheus가 수집하는 계측값"""
+        from starlette.responses import PlainTextResponse
+
+        return PlainTextResponse(metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
     return mcp
+
+def create_http_app():
+    """멀티 워커 uvicorn용 ASGI 앱 팩토리
+
+    요청이 어느 워커로 가든 처리할 수 있도록 stateless HTTP 모드로 동작합니다.
+    한 클라이언트의 호출도 여러 워커로 흩어지므로 상태는 shared_state로 공유해야 합니다
+    (main.py에서 검증). 다른 http/sse 서버처럼 도구 호출에는 agent_id가 필요합니다.
+    """
+    config = json.loads(os.environ[SERVER_CONFIG_ENV])
+    mcp = create_mcp_server(**config)
+    return mcp.http_app(transport="http", stateless_http=True)
+
+def run_http_workers(server_config: dict, host: str, port: int, workers: int):
+    """uvicorn 멀티 워커로 Streamable HTTP 서버 실행 (종료 신호 시 graceful shutdown)"""
+    import uvicorn
+
+    os.environ[SERVER_CONFIG_ENV] = json.dumps(server_config)
+    uvicorn.run("server:create_http_app", factory=True, host=host, port=port,
+                workers=workers, log_level="warning")
@@ -0,0 +1,145 @@
+"""도구 호출 트레이스 기록과 읽기
+
+--trace를 주면 상태를 바꾸는 도구 호출(휴식 도구, batch_breaks)과 check_status를
+도착 시각, 세션, 뽑힌 스트레스 감소량, 보스 경계 상승 판정 결과와 함께
+추가 전용 JSON lines 파일에 남깁니다. bench/replay.py는 이 파일을 가상 시계와
+세션별 시드 난수로 다시 실행해 버전 간 상태 결과와 지연 시간을 비교합니다.
+
+파일 첫 줄은 서버 설정을 담은 헤더이고 (파일이 비어 있을 때만 기록),
+이후 한 줄이 호출 하나입니다.
+
+    [시각, 휴식 도구, 세션, 감소량, 상승(0/1)]
+    [시각, "check_status", 세션]
+    [시각, "batch_breaks", [[휴식 도구, 세션, 감소량, 상승(0/1)], ...]]
+
+허용 제어로 거절된 호출은 상태를 바꾸지 않으므로 기록하지 않습니다.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+
+from state_manager import BOSS_ROLL_RANGE
+
+logger = logging.getLogger(__name__)
+
+TRACE_FORMAT_VERSION = 1
+
+class TraceRecorder:
+    """도구 호출을 추가 전용 파일에 기록 (여러 스레드에서 호출 가능)
+
+    서버가 비정상 종료되어도 그때까지의 호출이 남도록 한 줄마다 내려씁니다.
+    """
+
+    def __init__(self, path: str, config: dict | None = None):
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        if is_new:
+            self._write({"trace": TRACE_FORMAT_VERSION, **(config or {})})
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+
+    def record_break(self, timestamp: float, session_id: str, tool: str, reduction: int, raised: bool):
+        self._write([round(timestamp, 6), tool, session_id, reduction, int(raised)])
+
+    def record_status(self, timestamp: float, session_id: str):
+        self._write([round(timestamp, 6), "check_status", session_id])
+
+    def record_batch(self, timestamp: float, items):
+        """items: 요청 순서대로의 (휴식 도구, 세션, 감소량, 상승 여부)"""
+        self._write([round(timestamp, 6), "batch_breaks",
+                     [[tool, session_id, reduction, int(raised)] for tool, session_id, reduction, raised in items]])
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def read_trace(path: str):
+    """트레이스 파일을 읽어 (헤더 딕셔너리, 시각 순으로 정렬한 호출 목록)을 반환
+
+    Level 5 지연을 거친 호출은 도착보다 늦게 기록되므로 시각으로 다시 정렬합니다
+    (같은 시각은 기록 순서 유지). 비정상 종료로 잘린 줄은 건너뜁니다.
+    """
+    header = {}
+    events = []
+    with open(path, encoding="utf-8") as trace:
+        for line in trace:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("⚠️ 손상된 트레이스 레코드를 건너뜁니다.")
+                continue
+            if isinstance(record, dict):
+                # 같은 파일에 이어 쓴 경우 첫 헤더를 사용
+                header = header or record
+            else:
+                events.append(record)
+    events.sort(key=lambda event: event[0])
+    return header, events
+
+class TraceRandom:
+    """트레이스에 기록된 감소량과 보스 경계 판정을 그대로 돌려주는 세션별 난수 생성기
+
+    판정 범위(BOSS_ROLL_RANGE) 호출에는 기록된 상승 여부를 만족하는 값을,
+    그 밖의 호출에는 기록된 감소량을 차례로 돌려주고, 기록이 떨어지면
+    fallback으로 뽑습니다.
+    """
+
+    def __init__(self, reductions, raises, fallback):
+        self.reductions = deque(reductions)
+        self.raises = deque(raises)
+        self.fallback = fallback
+
+    def randint(self, a: int, b: int) -> int:
+        if (a, b) == BOSS_ROLL_RANGE:
+            if self.raises:
+                # 상승이면 최솟값(항상 boss_alertness 이하), 아니면 최댓값
+                return a if self.raises.popleft() else b
+        elif self.reductions:
+            return self.reductions.popleft()
+        return self.fallback.randint(a, b)
+
+def recorded_rng_factory(events, fallback_factory):
+    """트레이스의 기록값을 세션별로 재생하는 rng_factory (기록이 없으면 fallback_factory 사용)"""
+    reductions = defaultdict(list)
+    raises = defaultdict(list)
+    for event in events:
+        if event[1] == "batch_breaks":
+            items = event[2]
+        elif event[1] == "check_status":
+            continue
+        else:
+            items = [event[1:]]
+        for _, session_id, reduction, raised in items:
+            reductions[session_id].append(reduction)
+            raises[session_id].append(raised)
+
+    # 정리(evict)되었다가 다시 만들어진 세션도 남은 기록부터 이어서 사용
+    rngs = {}
+
+    def create(session_id: str) -> TraceRandom:
+        rng = rngs.get(session_id)
+        if rng is None:
+            rng = rngs[session_id] = TraceRandom(reductions[session_id], raises[session_id],
+                                                  fallback_factory(session_id))
+        return rng
+    return create
@@ -0,0 +1,269 @@
+"""여러 서버 프로세스가 공유하는 메모리 매핑 상태 세그먼트
+
+세그먼트 파일은 고정 크기 헤더와 SLOT_SIZE 바이트짜리 슬롯 slot_count개로
+이루어집니다. 세션 ID마다 슬롯 하나를 (안정 해시 + 선형 탐사로) 차지하며,
+슬롯 안에 ChillMCPState의 상태 필드가 고정 위치로 들어 있습니다.
+
+- 쓰기: 프로세스 안에서는 threading.Lock, 프로세스 사이에서는 슬롯 바이트 범위에
+  대한 fcntl 레코드 락으로 직렬화합니다. 슬롯마다 락이 따로라서 서로 다른 세션은
+  경쟁하지 않습니다.
+- 읽기: 쓰기 중에는 시퀀스 번호가 홀수가 되는 seqlock으로, 락 없이 일관된 값을
+  읽습니다 (SharedStateSegment.read). SEQLOCK_READ_RETRIES번 안에 일관된 값을
+  못 읽으면 쓰기 락을 잡고 읽습니다.
+- 쓰던 프로세스가 죽으면 커널이 fcntl 락은 풀지만 시퀀스 번호는 홀수로 남습니다.
+  다음 쓰기가 락을 잡을 때 번호를 짝수로 올려 맞추므로 이후 읽기는 다시 락 없이
+  동작합니다.
+
+슬롯은 해제되지 않으므로 slot_count는 예상되는 세션 수보다 넉넉하게 잡아야 합니다.
+POSIX(fcntl) 전용입니다.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+from state_manager import ChillMCPState, StateSnapshot
+
+MAGIC = b"CHILLMCP"
+LAYOUT_VERSION = 1
+# magic, layout version, slot_count
+HEADER = struct.Struct("<8sII")
+HEADER_SIZE = 64
+SLOT_SIZE = 128
+KEY_SIZE = 64
+
+# 슬롯 안의 필드 위치
+_SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 0
+USED_OFFSET = 8
+KEY_OFFSET = 16
+# version, stress_level, boss_alert_level, last_stress_increase, last_boss_alert_decrease
+_FIELDS = struct.Struct("<Qiidd")
+FIELDS_OFFSET = KEY_OFFSET + KEY_SIZE
+# 락 없는 읽기를 다시 시도하는 최대 횟수 (넘으면 쓰기 락을 잡고 읽음)
+SEQLOCK_READ_RETRIES = 1000
+
+_FIELD_LAYOUT = {
+    "version": ("<Q", FIELDS_OFFSET),
+    "stress_level": ("<i", FIELDS_OFFSET + 8),
+    "boss_alert_level": ("<i", FIELDS_OFFSET + 12),
+    "last_stress_increase": ("<d", FIELDS_OFFSET + 16),
+    "last_boss_alert_decrease": ("<d", FIELDS_OFFSET + 24),
+}
+
+def _encode_key(session_id: str) -> bytes:
+    """슬롯에 저장할 고정 길이 키 (길면 해시로 대체)"""
+    key = session_id.encode("utf-8")
+    if len(key) > KEY_SIZE:
+        key = b"#" + hashlib.blake2b(key, digest_size=31).hexdigest().encode("ascii")
+    return key.ljust(KEY_SIZE, b"\0")
+
+def _stable_hash(key: bytes) -> int:
+    # hash()는 프로세스마다 달라지므로 사용할 수 없음
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+class _SlotLock:
+    """슬롯 하나에 대한 프로세스 간 쓰기 락 (획득/해제 시 seqlock 번호 증가)"""
+
+    def __init__(self, segment, slot: int):
+        self._segment = segment
+        self._offset = segment.slot_offset(slot)
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            fcntl.lockf(self._segment.fd, fcntl.LOCK_EX, SLOT_SIZE, self._offset)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._segment.begin_write(self._offset)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._segment.bump_sequence(self._offset)
+        fcntl.lockf(self._segment.fd, fcntl.LOCK_UN, SLOT_SIZE, self._offset)
+        self._thread_lock.release()
+
+class SharedStateSegment:
+    """세션 상태 슬롯이 들어 있는 메모리 매핑 파일"""
+
+    def __init__(self, path: str, slot_count: int = 4096):
+        if slot_count <= 0:
+            raise ValueError("slot_count는 0보다 커야 합니다.")
+        self.path = path
+        size = HEADER_SIZE + SLOT_SIZE * slot_count
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # 여러 프로세스가 동시에 만들 수 있으므로 헤더 범위를 잠그고 초기화
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+            try:
+                if os.fstat(self.fd).st_size == 0:
+                    os.ftruncate(self.fd, size)
+                    os.pwrite(self.fd, HEADER.pack(MAGIC, LAYOUT_VERSION, slot_count), 0)
+                else:
+                    magic, layout, existing_slots = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+                    if magic != MAGIC or layout != LAYOUT_VERSION:
+                        raise ValueError(f"{path}는 ChillMCP 공유 상태 파일이 아닙니다.")
+                    if existing_slots != slot_count:
+                        raise ValueError(f"{path}의 슬롯 수({existing_slots})가 요청한 값({slot_count})과 다릅니다.")
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+            self.map = mmap.mmap(self.fd, size)
+        except BaseException:
+            os.close(self.fd)
+            raise
+        self.slot_count = slot_count
+        self._slots = {}
+        self._locks = {}
+        self._slots_lock = threading.Lock()
+
+    def slot_offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * SLOT_SIZE
+
+    def bump_sequence(self, offset: int):
+        sequence, = _SEQ.unpack_from(self.map, offset + SEQ_OFFSET)
+        _SEQ.pack_into(self.map, offset + SEQ_OFFSET, sequence + 1)
+
+    def begin_write(self, offset: int):
+        """쓰기 락을 잡은 뒤 시퀀스 번호를 홀수로 만듦
+
+        락을 잡은 채 죽은 프로세스가 남긴 홀수 번호는 먼저 짝수로 올립니다.
+        """
+        sequence, = _SEQ.unpack_from(self.map, offset + SEQ_OFFSET)
+        _SEQ.pack_into(self.map, offset + SEQ_OFFSET, (sequence + 1) | 1)
+
+    def lock(self, slot: int) -> _SlotLock:
+        """슬롯의 쓰기 락 (프로세스 안에서 슬롯마다 하나)"""
+        with self._slots_lock:
+            lock = self._locks.get(slot)
+            if lock is None:
+                lock = self._locks[slot] = _SlotLock(self, slot)
+            return lock
+
+    def claim(self, session_id: str, initial_status) -> int:
+        """세션의 슬롯 번호를 반환 (없으면 initial_status로 초기화해 차지)"""
+        slot = self._slots.get(session_id)
+        if slot is not None:
+            return slot
+
+        key = _encode_key(session_id)
+        start = _stable_hash(key) % self.slot_count
+        for probe in range(self.slot_count):
+            slot = (start + probe) % self.slot_count
+            offset = self.slot_offset(slot)
+            if self.map[offset + USED_OFFSET] and self.map[offset + KEY_OFFSET:offset + KEY_OFFSET + KEY_SIZE] != key:
+                continue
+            with self.lock(slot):
+                if not self.map[offset + USED_OFFSET]:
+                    # 키와 필드를 먼저 쓰고 마지막에 사용 표시
+                    self.map[offset + KEY_OFFSET:offset + KEY_OFFSET + KEY_SIZE] = key
+                    self._write_fields(offset, initial_status)
+                    self.map[offset + USED_OFFSET] = 1
+                elif self.map[offset + KEY_OFFSET:offset + KEY_OFFSET + KEY_SIZE] != key:
+                    # 확인과 잠금 사이에 다른 세션이 차지함
+                    continue
+            with self._slots_lock:
+                self._slots[session_id] = slot
+            return slot
+        raise RuntimeError(f"공유 상태 세그먼트가 가득 찼습니다 (슬롯 {self.slot_count}개).")
+
+    def _write_fields(self, offset: int, status):
+        _FIELDS.pack_into(self.map, offset + FIELDS_OFFSET,
+                          status["version"], status["stress_level"], status["boss_alert_level"],
+                          status["last_stress_increase"], status["last_boss_alert_decrease"])
+
+    def get_field(self, slot: int, name: str):
+        fmt, field_offset = _FIELD_LAYOUT[name]
+        return struct.unpack_from(fmt, self.map, self.slot_offset(slot) + field_offset)[0]
+
+    def set_field(self, slot: int, name: str, value):
+        fmt, field_offset = _FIELD_LAYOUT[name]
+        struct.pack_into(fmt, self.map, self.slot_offset(slot) + field_offset, value)
+
+    def read(self, slot: int):
+        """seqlock으로 락 없이 슬롯의 일관된 상태를 읽음
+
+        쓰기가 오래 걸리거나 쓰던 프로세스가 죽어 번호가 홀수로 남아 있으면
+        SEQLOCK_READ_RETRIES번 시도한 뒤 쓰기 락을 잡고 읽습니다 (호출하는
+        스레드가 그 슬롯의 락을 잡고 있으면 안 됨).
+        """
+        offset = self.slot_offset(slot)
+        for _ in range(SEQLOCK_READ_RETRIES):
+            before, = _SEQ.unpack_from(self.map, offset + SEQ_OFFSET)
+            if before & 1:
+                continue
+            values = _FIELDS.unpack_from(self.map, offset + FIELDS_OFFSET)
+            after, = _SEQ.unpack_from(self.map, offset + SEQ_OFFSET)
+            if before == after:
+                return self._status(values)
+        with self.lock(slot):
+            return self._status(_FIELDS.unpack_from(self.map, offset + FIELDS_OFFSET))
+
+    @staticmethod
+    def _status(values):
+        version, stress, boss, last_stress, last_boss = values
+        return {
+            "stress_level": stress,
+            "boss_alert_level": boss,
+            "last_stress_increase": last_stress,
+            "last_boss_alert_decrease": last_boss,
+            "version": version
+        }
+
+    def close(self):
+        self.map.close()
+        os.close(self.fd)
+
+def _slot_field(name):
+    """ChillMCPState의 속성을 공유 슬롯 필드로 연결하는 프로퍼티"""
+    def getter(self):
+        return self._segment.get_field(self._slot, name)
+
+    def setter(self, value):
+        # ChillMCPState.__init__이 넣는 초기값이 공유 상태를 덮어쓰지 않도록 무시
+        if self._slot is not None:
+            self._segment.set_field(self._slot, name, value)
+
+    return property(getter, setter)
+
+class SharedChillMCPState(ChillMCPState):
+    """상태 필드가 공유 세그먼트 슬롯에 있는 ChillMCPState
+
+    전이 규칙은 ChillMCPState를 그대로 사용하고, _lock만 프로세스 간 슬롯 락으로
+    바꿉니다. 감소/증가는 어느 프로세스든 상태를 읽거나 쓸 때 경과 시간으로
+    계산되므로 항상 lazy_decay 모드로 동작합니다. 락 없는 스냅숏 읽기는 다른
+    프로세스의 쓰기도 보이도록 프로세스 안의 스냅숏 대신 슬롯을 seqlock으로 읽습니다.
+    """
+
+    stress_level = _slot_field("stress_level")
+    boss_alert_level = _slot_field("boss_alert_level")
+    last_stress_increase = _slot_field("last_stress_increase")
+    last_boss_alert_decrease = _slot_field("last_boss_alert_decrease")
+    version = _slot_field("version")
+
+    def __init__(self, segment: SharedStateSegment, session_id: str,
+                 boss_alertness: int = 50, boss_alertness_cooldown: int = 300, clock=None, rng=None):
+        self._segment = segment
+        self._slot = None
+        super().__init__(boss_alertness, boss_alertness_cooldown, lazy_decay=True, clock=clock, rng=rng)
+        now = self.clock.time()
+        self._slot = segment.claim(session_id, {
+            "stress_level": 50,
+            "boss_alert_level": 0,
+            "last_stress_increase": now,
+            "last_boss_alert_decrease": now,
+            "version": 0
+        })
+        self.session_id = session_id
+        self._lock = segment.lock(self._slot)
+
+    def _load_snapshot(self):
+        return StateSnapshot(**self._segment.read(self._slot))
+
+    def read_shared(self):
+        """마지막으로 기록된 상태를 읽음 (경과 시간 미반영, 보통은 다른 프로세스의 쓰기를 기다리지 않음)"""
+        return self._segment.read(self._slot)
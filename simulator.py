@@ -0,0 +1,261 @@
+"""boss_alertness / boss_alertness_cooldown 튜닝용 벡터화 몬테카를로 시뮬레이터
+
+ChillMCPState(lazy_decay 모드)와 휴식 도구의 규칙(state_manager의 상수)을
+NumPy 배열 연산으로 옮겨 (파라미터 조합 × 세션) 전체를 한 번에 시뮬레이션합니다.
+
+- 60초마다 스트레스 +1, cooldown마다 Boss Alert -1 (경과 시간으로 한 번에 계산)
+- Boss Alert Level 5에서 호출하면 BOSS_PENALTY_SECONDS 동안 지연된 뒤 처리
+- 휴식 도구는 STRESS_REDUCTION_RANGES 범위에서 스트레스를 줄이고
+  boss_alertness% 확률로 Boss Alert Level을 1 올림
+
+에이전트는 직전 호출이 끝난 뒤 call_interval초(기본: 평균 call_interval초의
+지수 분포)를 쉬고 무작위 휴식 도구를 호출합니다.
+
+사용 예시:
+    python -m simulator --alertness 0 100 --alertness_steps 100 \\
+        --cooldown 10 600 --cooldown_steps 100 --sessions 100 --output grid.npz
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from state_manager import (BOSS_PENALTY_SECONDS, MAX_BOSS_ALERT_LEVEL, MAX_STRESS_LEVEL,
+                           STRESS_INCREASE_INTERVAL, STRESS_REDUCTION_RANGES)
+
+INITIAL_STRESS_LEVEL = 50
+
+class _Sessions:
+    """시뮬레이션 중인 세션들의 상태 배열"""
+
+    FIELDS = ("index", "alertness", "cooldown", "stress", "boss", "last_stress_increase",
+              "last_boss_alert_decrease", "observed_at", "time_at_level_5",
+              "next_call", "calls", "penalties", "stress_sum")
+
+    def __init__(self, alertness, cooldown):
+        size = alertness.size
+        self.index = np.arange(size)
+        self.alertness = alertness
+        self.cooldown = cooldown
+        self.stress = np.full(size, INITIAL_STRESS_LEVEL, dtype=np.int16)
+        self.boss = np.zeros(size, dtype=np.int16)
+        self.last_stress_increase = np.zeros(size)
+        self.last_boss_alert_decrease = np.zeros(size)
+        # 마지막으로 상태를 관찰한 시각과 그때까지 누적된 Level 5 체류 시간
+        self.observed_at = np.zeros(size)
+        self.time_at_level_5 = np.zeros(size)
+        self.next_call = np.zeros(size)
+        self.calls = np.zeros(size, dtype=np.int32)
+        self.penalties = np.zeros(size, dtype=np.int32)
+        self.stress_sum = np.zeros(size)
+
+    @property
+    def size(self):
+        return self.index.size
+
+    def take(self, mask):
+        """mask에 해당하는 세션만 남긴 새 _Sessions"""
+        taken = object.__new__(_Sessions)
+        for name in self.FIELDS:
+            setattr(taken, name, getattr(self, name)[mask])
+        return taken
+
+    def advance_to(self, now):
+        """now까지의 Level 5 체류 시간을 누적하고 밀린 증가/감소를 반영
+
+        ChillMCPState._apply_elapsed_decay와 같은 규칙입니다.
+        """
+        # Level 5는 다음 cooldown 경계까지 유지됨
+        at_level_5 = self.boss == MAX_BOSS_ALERT_LEVEL
+        level_5_until = np.minimum(now, self.last_boss_alert_decrease + self.cooldown)
+        self.time_at_level_5 += np.where(at_level_5, np.maximum(level_5_until - self.observed_at, 0), 0)
+        self.observed_at = np.maximum(self.observed_at, now)
+
+        stress_ticks = np.floor((now - self.last_stress_increase) / STRESS_INCREASE_INTERVAL)
+        stress_ticks = np.clip(stress_ticks, 0, MAX_STRESS_LEVEL - self.stress).astype(np.int16)
+        self.stress += stress_ticks
+        self.last_stress_increase += stress_ticks * STRESS_INCREASE_INTERVAL
+
+        boss_ticks = np.floor((now - self.last_boss_alert_decrease) / self.cooldown)
+        boss_ticks = np.clip(boss_ticks, 0, self.boss).astype(np.int16)
+        self.boss -= boss_ticks
+        self.last_boss_alert_decrease += boss_ticks * self.cooldown
+
+def simulate(boss_alertness, boss_alertness_cooldown, sessions: int = 100,
+             duration: float = 3600, call_interval: float = 60,
+             think_time: str = "exponential", penalty_seconds: float = BOSS_PENALTY_SECONDS,
+             tools=None, seed: int = 0):
+    """파라미터 조합마다 sessions개의 세션을 duration초 동안 시뮬레이션
+
+    boss_alertness와 boss_alertness_cooldown은 서로 브로드캐스트 가능한 배열이며,
+    결과의 각 지표는 그 브로드캐스트 모양을 가집니다.
+
+    반환값 (세션 분포 요약):
+        time_at_level_5: Level 5에 머문 시간 비율의 mean/p50/p95
+        mean_stress: 휴식 도구를 호출한 시점의 평균 스트레스
+        penalty_latency: 호출당 평균 지연 시간(초)의 mean/p95
+        penalty_probability: 호출이 Level 5 지연을 받을 확률
+        calls: 세션당 평균 호출 수
+    """
+    if think_time not in ("exponential", "fixed"):
+        raise ValueError("think_time은 'exponential' 또는 'fixed'여야 합니다.")
+
+    alertness, cooldown = np.broadcast_arrays(np.asarray(boss_alertness),
+                                              np.asarray(boss_alertness_cooldown, dtype=float))
+    grid_shape = alertness.shape
+    rng = np.random.default_rng(seed)
+
+    tool_names = list(tools or STRESS_REDUCTION_RANGES)
+    low = np.array([STRESS_REDUCTION_RANGES[name][0] for name in tool_names])
+    span = np.array([STRESS_REDUCTION_RANGES[name][1] for name in tool_names]) - low + 1
+
+    def think(count):
+        if think_time == "fixed":
+            return np.full(count, float(call_interval))
+        return rng.exponential(call_interval, count)
+
+    total = alertness.size * sessions
+    time_at_level_5 = np.empty(total)
+    calls = np.empty(total, dtype=np.int32)
+    penalties = np.empty(total, dtype=np.int32)
+    stress_sum = np.empty(total)
+
+    def finish(done):
+        """끝난 세션을 duration까지 진행시키고 결과 배열에 기록"""
+        done.advance_to(np.maximum(done.observed_at, duration))
+        time_at_level_5[done.index] = done.time_at_level_5
+        calls[done.index] = done.calls
+        penalties[done.index] = done.penalties
+        stress_sum[done.index] = done.stress_sum
+
+    state = _Sessions(np.repeat(alertness.ravel(), sessions),
+                      np.repeat(cooldown.ravel(), sessions))
+    state.next_call = think(total)
+    while state.size:
+        active = state.next_call < duration
+        # 끝난 세션이 충분히 모이면 배열에서 빼서 이후 연산량을 줄임
+        active_count = np.count_nonzero(active)
+        if active_count < state.size * 0.75:
+            finish(state.take(~active))
+            state = state.take(active)
+            active = np.ones(active_count, dtype=bool)
+            if not active_count:
+                break
+        size = state.size
+
+        # 끝난 세션은 관찰 시각을 그대로 두어 상태가 변하지 않게 함
+        now = np.where(active, state.next_call, state.observed_at)
+        state.advance_to(now)
+        state.calls += active
+        state.stress_sum += np.where(active, state.stress, 0)
+
+        # Level 5 지연: 지연이 끝난 시각에 휴식이 반영됨
+        penalized = active & (state.boss == MAX_BOSS_ALERT_LEVEL)
+        state.penalties += penalized
+        executed_at = now + penalized * penalty_seconds
+        if penalized.any():
+            state.advance_to(executed_at)
+
+        # tools.py와 같이 도구를 고르고 그 범위에서 감소량을 뽑음
+        tool = rng.integers(0, len(tool_names), size)
+        reduction = (low[tool] + rng.random(size) * span[tool]).astype(np.int16)
+        state.stress = np.where(active, np.clip(state.stress - reduction, 0, MAX_STRESS_LEVEL),
+                                state.stress).astype(np.int16)
+        state.last_stress_increase = np.where(active, executed_at, state.last_stress_increase)
+
+        raised = active & (rng.integers(1, 101, size) <= state.alertness)
+        # 레벨 0에서 지난 cooldown은 쌓지 않음 (ChillMCPState._raise_boss_alert)
+        state.last_boss_alert_decrease = np.where(
+            raised & (state.boss == 0),
+            np.maximum(state.last_boss_alert_decrease, executed_at - state.cooldown),
+            state.last_boss_alert_decrease)
+        state.boss = np.where(raised, np.minimum(state.boss + 1, MAX_BOSS_ALERT_LEVEL),
+                              state.boss).astype(np.int16)
+
+        state.next_call = np.where(active, executed_at + think(size), state.next_call)
+
+    per_session = (*grid_shape, sessions)
+    level_5_ratio = np.minimum(time_at_level_5 / duration, 1).reshape(per_session)
+    safe_calls = np.maximum(calls, 1)
+    latency = (penalties * penalty_seconds / safe_calls).reshape(per_session)
+    return {
+        "boss_alertness": alertness,
+        "boss_alertness_cooldown": cooldown,
+        "time_at_level_5": {
+            "mean": level_5_ratio.mean(axis=-1),
+            "p50": np.percentile(level_5_ratio, 50, axis=-1),
+            "p95": np.percentile(level_5_ratio, 95, axis=-1),
+        },
+        "mean_stress": (stress_sum / safe_calls).reshape(per_session).mean(axis=-1),
+        "penalty_latency": {
+            "mean": latency.mean(axis=-1),
+            "p95": np.percentile(latency, 95, axis=-1),
+        },
+        "penalty_probability": (penalties.reshape(per_session).sum(axis=-1)
+                                / np.maximum(calls.reshape(per_session).sum(axis=-1), 1)),
+        "calls": calls.reshape(per_session).mean(axis=-1),
+    }
+
+def parameter_grid(alertness_range, alertness_steps, cooldown_range, cooldown_steps):
+    """(alertness_steps × cooldown_steps) 파라미터 격자"""
+    alertness = np.rint(np.linspace(*alertness_range, alertness_steps)).astype(np.int16)
+    cooldown = np.linspace(*cooldown_range, cooldown_steps)
+    return np.meshgrid(alertness, cooldown, indexing="ij")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChillMCP boss alertness parameter sweep")
+    parser.add_argument("--alertness", type=float, nargs=2, default=[0, 100],
+                        help="boss_alertness range (inclusive)")
+    parser.add_argument("--alertness_steps", type=int, default=100)
+    parser.add_argument("--cooldown", type=float, nargs=2, default=[10, 600],
+                        help="boss_alertness_cooldown range in seconds (inclusive)")
+    parser.add_argument("--cooldown_steps", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=100,
+                        help="Simulated sessions per grid point")
+    parser.add_argument("--duration", type=float, default=3600,
+                        help="Simulated seconds per session")
+    parser.add_argument("--call_interval", type=float, default=60,
+                        help="Mean seconds between an agent's break calls")
+    parser.add_argument("--think_time", choices=["exponential", "fixed"], default="exponential")
+    parser.add_argument("--max_level5", type=float, default=0.05,
+                        help="Max mean fraction of time at level 5 when ranking configurations")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Save all metrics to this .npz file")
+    args = parser.parse_args(argv)
+
+    alertness, cooldown = parameter_grid(args.alertness, args.alertness_steps,
+                                         args.cooldown, args.cooldown_steps)
+    start = time.perf_counter()
+    result = simulate(alertness, cooldown, sessions=args.sessions, duration=args.duration,
+                      call_interval=args.call_interval, think_time=args.think_time, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️ {alertness.size * args.sessions:,}개 세션 시뮬레이션: {elapsed:.2f}초")
+
+    # Level 5 체류 비율이 허용치 이하인 조합 중 평균 스트레스가 낮은 순
+    level_5 = result["time_at_level_5"]["mean"]
+    candidates = np.flatnonzero(level_5.ravel() <= args.max_level5)
+    ranked = candidates[np.argsort(result["mean_stress"].ravel()[candidates])][:args.top]
+    print(f"{'alertness':>9} {'cooldown':>9} {'stress':>7} {'level5':>7} {'penalty(s)':>10}")
+    for index in ranked:
+        print(f"{alertness.ravel()[index]:>9} {cooldown.ravel()[index]:>9.1f} "
+              f"{result['mean_stress'].ravel()[index]:>7.1f} {level_5.ravel()[index]:>7.3f} "
+              f"{result['penalty_latency']['mean'].ravel()[index]:>10.2f}")
+
+    if args.output:
+        np.savez_compressed(
+            args.output,
+            boss_alertness=alertness, boss_alertness_cooldown=cooldown,
+            time_at_level_5_mean=level_5,
+            time_at_level_5_p50=result["time_at_level_5"]["p50"],
+            time_at_level_5_p95=result["time_at_level_5"]["p95"],
+            mean_stress=result["mean_stress"],
+            penalty_latency_mean=result["penalty_latency"]["mean"],
+            penalty_latency_p95=result["penalty_latency"]["p95"],
+            penalty_probability=result["penalty_probability"],
+            calls=result["calls"],
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""기동 시간 측정 (--profile-startup)
+
+Claude Desktop 같은 MCP 클라이언트는 세션마다 서버 프로세스를 새로 띄우므로
+첫 initialize 응답까지 걸리는 시간이 그대로 대기 시간이 됩니다.
+StartupProfiler는 import 훅으로 모듈별 import 시간(자체/누적)을, phase()로
+단계별(서버 import, 서버 생성 등) 시간을 재서 표로 보고합니다.
+
+프로파일러를 켜기 전에 이미 import된 모듈(main.py의 가벼운 기본 import)은
+측정하지 않습니다.
+"""
+
+import importlib.abc
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+class _TimedLoader(importlib.abc.Loader):
+    """원래 로더의 create_module/exec_module 시간을 재는 래퍼"""
+
+    def __init__(self, loader, profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        # 확장 모듈은 create_module에서 공유 라이브러리를 불러옴
+        start = time.perf_counter()
+        try:
+            return self.loader.create_module(spec)
+        finally:
+            self.profiler._created[spec.name] = time.perf_counter() - start
+
+    def exec_module(self, module):
+        # 모듈 코드가 __loader__를 확인해도 원래 로더가 보이도록 되돌려 둠
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        with self.profiler._measure(module.__name__):
+            self.loader.exec_module(module)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """다른 finder가 찾은 spec의 로더를 _TimedLoader로 감쌈"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and not isinstance(spec.loader, _TimedLoader):
+            spec.loader = _TimedLoader(spec.loader, self.profiler)
+        return spec
+
+class StartupProfiler:
+    """모듈별 import 시간과 단계별 시간 측정
+
+    사용 예시:
+        profiler = StartupProfiler().start()
+        with profiler.phase("import server"):
+            import server
+        print(profiler.report(), file=sys.stderr)
+    """
+
+    def __init__(self):
+        self.started = None
+        # (모듈 이름, 자체 시간, 누적 시간, 단계) - import가 끝난 순서
+        self.modules = []
+        # (단계 이름, 시간)
+        self.phases = []
+        self._finder = _TimingFinder(self)
+        self._created = {}
+        # 진행 중인 import의 [이름, 시작 시각, 하위 import 시간]
+        self._stack = []
+        self._phase = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        sys.meta_path.insert(0, self._finder)
+        return self
+
+    def stop(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def _measure(self, name):
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1] + self._created.pop(name, 0.0)
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            self.modules.append((name, elapsed - frame[2], elapsed, self._phase))
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록을 한 단계로 측정 (블록 안의 import는 이 단계로 분류)"""
+        previous, self._phase = self._phase, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+            self._phase = previous
+
+    def packages(self):
+        """최상위 패키지별 import 자체 시간 합계 (큰 순서)"""
+        totals = defaultdict(float)
+        for name, self_time, _, _ in self.modules:
+            totals[name.partition(".")[0]] += self_time
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def report(self, top: int = 20) -> str:
+        """단계별, 패키지별, 모듈별(누적 상위 top개) 시간 표"""
+        total = time.perf_counter() - self.started
+        lines = [f"⏱️ 기동 시간 프로파일 (총 {total * 1000:.1f}ms, 모듈 {len(self.modules)}개 import)", "",
+                 "단계별:"]
+        lines += [f"  {name:30s} {elapsed * 1000:9.1f}ms" for name, elapsed in self.phases]
+        lines += ["", f"패키지별 import 자체 시간 (상위 {top}개):"]
+        lines += [f"  {name:30s} {elapsed * 1000:9.1f}ms" for name, elapsed in self.packages()[:top]]
+        lines += ["", f"모듈별 import 시간 (누적 상위 {top}개):",
+                  f"  {'누적(ms)':>9s} {'자체(ms)':>9s}  {'모듈':30s} 단계"]
+        slowest = sorted(self.modules, key=lambda module: module[2], reverse=True)[:top]
+        lines += [f"  {cumulative * 1000:9.1f} {self_time * 1000:9.1f}  {name:30s} {phase or '-'}"
+                  for name, self_time, cumulative, phase in slowest]
+        return "\n".join(lines)
@@ -1,81 +1,399 @@
-import time
 import threading
 import random
 import logging
 
+from clock import SystemClock
+from scheduler import DecayScheduler, default_scheduler
+
 logger = logging.getLogger(__name__)
 
+# 스트레스 자동 증가 주기 (초)
+STRESS_INCREASE_INTERVAL = 60
+# 레벨 상한
+MAX_STRESS_LEVEL = 100
+MAX_BOSS_ALERT_LEVEL = 5
+# 보스 경계 상승 판정 randint 범위 (결과가 boss_alertness 이하이면 상승)
+BOSS_ROLL_RANGE = (1, 100)
+# 보스 경계 레벨 5일 때 도구 호출에 적용되는 지연 시간 (초)
+BOSS_PENALTY_SECONDS = 20
+# 휴식 도구별 스트레스 감소량 범위 (randint 양 끝 포함)
+STRESS_REDUCTION_RANGES = {
+    "take_a_break": (10, 30),
+    "watch_netflix": (20, 40),
+    "show_meme": (5, 20),
+    "bathroom_break": (15, 35),
+    "coffee_mission": (10, 25),
+    "urgent_call": (20, 40),
+    "deep_thinking": (5, 15),
+    "email_organizing": (10, 25),
+}
+
+class StateSnapshot:
+    """한 시점의 상태 필드 묶음 (만든 뒤에는 바꾸지 않음)
+
+    쓰기마다 새로 만들어 ChillMCPState._snapshot을 통째로 교체하므로, 읽는 쪽은
+    락 없이 참조 하나만 읽어도 필드들이 서로 어긋나지 않습니다.
+    """
+
+    __slots__ = ("stress_level", "boss_alert_level", "last_stress_increase", "last_boss_alert_decrease", "version")
+
+    def __init__(self, stress_level: int, boss_alert_level: int, last_stress_increase: float,
+                 last_boss_alert_decrease: float, version: int):
+        self.stress_level = stress_level
+        self.boss_alert_level = boss_alert_level
+        self.last_stress_increase = last_stress_increase
+        self.last_boss_alert_decrease = last_boss_alert_decrease
+        self.version = version
+
+    def decay_due(self, current_time: float, boss_alertness_cooldown: float) -> bool:
+        """current_time까지 반영하지 않은 자동 증가/감소가 있는지"""
+        return ((self.stress_level < MAX_STRESS_LEVEL
+                 and current_time - self.last_stress_increase >= STRESS_INCREASE_INTERVAL)
+                or (self.boss_alert_level > 0
+                    and current_time - self.last_boss_alert_decrease >= boss_alertness_cooldown))
+
+    def as_dict(self):
+        """get_current_status() 형식의 딕셔너리"""
+        return {
+            "stress_level": self.stress_level,
+            "boss_alert_level": self.boss_alert_level,
+            "last_stress_increase": self.last_stress_increase,
+            "last_boss_alert_decrease": self.last_boss_alert_decrease,
+            "version": self.version
+        }
+
 class ChillMCPState:
-    """농땡이 상태 관리 클래스"""
+    """농땡이 상태 관리 클래스
+
+    스트레스 증가와 Boss Alert 감소는 읽거나 쓸 때마다 마지막 갱신 시각으로부터
+    경과한 시간만큼 한 번에 계산합니다. lazy_decay=False이면 여기에 더해 다음
+    마감 시각을 scheduler(기본: 프로세스 공용 스케줄러)에 등록해, 아무도 읽지
+    않아도 정확히 60초/cooldown 경계에서 변경이 적용되고 리스너에 알려집니다.
+
+    모든 시각은 clock에서 읽습니다. 테스트와 시뮬레이션에서는
+    clock.VirtualClock을 넘겨 시간을 즉시 앞당길 수 있습니다.
+    쓰기는 _lock으로 직렬화하고, 쓰기가 끝날 때마다 StateSnapshot을 새로 만들어
+    교체합니다. snapshot()과 get_current_status()는 락 없이 이 스냅숏을 읽으며,
+    반영할 자동 증가/감소가 밀려 있을 때만 락을 잡습니다. 상태 필드
+    (stress_level 등)는 쓰는 쪽의 작업용 값이므로 락 밖에서 직접 바꾸면 읽는
+    쪽에 보이지 않습니다 (restore() 사용).
+
+    보스 경계 상승 판정은 rng(기본: random 모듈)로 뽑으므로, 세션마다 시드를 준
+    random.Random을 넘기면 같은 호출 순서에서 같은 결과가 나옵니다.
+
+    add_listener()로 등록한 콜백은 상태가 바뀔 때마다 락 밖에서
+    (state, status) 인자로 호출됩니다. status의 version은 변경마다 1씩 증가합니다.
+    add_boss_listener()로 등록한 콜백은 Boss Alert Level이 바뀔 때마다
+    (state, 이전 레벨, 새 레벨, 원인) 인자로 호출됩니다 (원인: "raise" 또는 "cooldown").
 
-    def __init__(self, boss_alertness: int = 50, boss_alertness_cooldown: int = 300):
+    락 안에서는 로그를 예약만 하고, 콜백과 함께 락을 놓은 뒤에 남깁니다.
+    메시지는 % 인자로 넘기므로 포맷은 로깅 핸들러(비동기 모드에서는 writer
+    스레드)에서 일어납니다.
+    """
+
+    def __init__(self, boss_alertness: int = 50, boss_alertness_cooldown: int = 300,
+                 lazy_decay: bool = False, clock=None, scheduler=None, rng=None):
+        self.clock = clock or SystemClock()
+        self.rng = rng if rng is not None else random
         self.stress_level = 50
         self.boss_alert_level = 0
         self.boss_alertness = boss_alertness
         self.boss_alertness_cooldown = boss_alertness_cooldown
-        self.last_stress_increase = time.time()
-        self.last_boss_alert_decrease = time.time()
+        now = self.clock.time()
+        self.last_stress_increase = now
+        self.last_boss_alert_decrease = now
+        self.lazy_decay = lazy_decay
+        self.session_id = None
+        self.version = 0
+        # 읽는 쪽이 락 없이 보는 마지막 상태, _lock 보유 상태에서 _publish()로만 교체
+        self._snapshot = StateSnapshot(50, 0, now, now, 0)
+        self._listeners = []
+        self._boss_listeners = []
+        # 아직 알리지 않은 (이전 레벨, 새 레벨, 원인)과 예약된 로그, _lock 보유 상태에서만 변경
+        self._boss_changes = []
+        self._deferred_logs = []
         self._lock = threading.Lock()
+        self._closed = threading.Event()
+        # 스케줄러에 등록된 다음 마감 시각 항목, _lock 보유 상태에서만 변경
+        self._decay_entry = None
+        self._scheduler = None
+        self._owns_scheduler = False
+
+        if not lazy_decay:
+            if scheduler is None and clock is not None:
+                # 다른 시계를 쓰는 단독 상태는 공용 스케줄러와 시각 기준이 달라 전용 스케줄러 사용
+                # (StateStore는 모든 세션에 스케줄러 하나를 넘김)
+                scheduler = DecayScheduler(self.clock)
+                scheduler.start()
+                self._owns_scheduler = True
+            self._scheduler = scheduler if scheduler is not None else default_scheduler()
+            with self._lock:
+                self._reschedule_decay()
+
+    def _next_decay_deadline(self):
+        """다음 자동 증가/감소 마감 시각, 둘 다 상한/하한이면 None (_lock 보유 상태에서 호출)"""
+        deadlines = []
+        if self.stress_level < MAX_STRESS_LEVEL:
+            deadlines.append(self.last_stress_increase + STRESS_INCREASE_INTERVAL)
+        if self.boss_alert_level > 0:
+            deadlines.append(self.last_boss_alert_decrease + self.boss_alertness_cooldown)
+        return min(deadlines, default=None)
+
+    def _reschedule_decay(self):
+        """다음 마감 시각이 등록된 것보다 이르면 다시 등록 (_lock 보유 상태에서 호출)
+
+        마감 시각이 늦춰진 경우(휴식으로 스트레스 갱신)에는 기존 항목을 그대로 두고,
+        그 항목이 실행될 때 실제 마감 시각으로 다시 등록합니다.
+        """
+        if self._scheduler is None or self._closed.is_set():
+            return
+        deadline = self._next_decay_deadline()
+        entry = self._decay_entry
+        if deadline is None or (entry is not None and entry.deadline <= deadline):
+            return
+        if entry is not None:
+            self._scheduler.cancel(entry)
+        self._decay_entry = self._scheduler.schedule(deadline, self._on_decay_deadline)
+
+    def _on_decay_deadline(self):
+        """스케줄러 콜백: 마감된 증가/감소를 적용하고 다음 마감 시각 등록"""
+        status = None
+        with self._lock:
+            self._decay_entry = None
+            if self._apply_elapsed_decay(self.clock.time()):
+                status = self._changed_status()
+                events = self._take_events()
+            self._reschedule_decay()
+        if status:
+            self._notify(status, events)
+
+    def close(self, timeout: float = 5):
+        """스케줄러 등록 취소 (전용 스케줄러면 스레드가 끝날 때까지 최대 timeout초 대기)"""
+        with self._lock:
+            self._closed.set()
+            if self._decay_entry is not None:
+                self._scheduler.cancel(self._decay_entry)
+                self._decay_entry = None
+        if self._owns_scheduler:
+            self._scheduler.stop(timeout)
+
+    def add_listener(self, callback):
+        """상태 변경 콜백 등록"""
+        self._listeners.append(callback)
+
+    def add_boss_listener(self, callback):
+        """Boss Alert Level 전이 콜백 등록"""
+        self._boss_listeners.append(callback)
 
-        self._start_boss_alert_cooldown_thread()
-        self._start_stress_increase_thread()
-
-    def _start_boss_alert_cooldown_thread(self):
-        """Boss Alert Level 자동 감소를 위한 백그라운드 스레드"""
-        def cooldown_worker():
-            while True:
-                time.sleep(1)
-                with self._lock:
-                    current_time = time.time()
-                    if (current_time - self.last_boss_alert_decrease >= self.boss_alertness_cooldown
-                            and self.boss_alert_level > 0):
-                        old_level = self.boss_alert_level
-                        self.boss_alert_level -= 1
-                        self.last_boss_alert_decrease = current_time
-                        logger.info(f"⏰ Boss Alert Level 자동 감소: {old_level} → {self.boss_alert_level} (cooldown: {self.boss_alertness_cooldown}초)")
-
-        thread = threading.Thread(target=cooldown_worker, daemon=True)
-        thread.start()
-
-    def _start_stress_increase_thread(self):
-        """Stress Level 자동 증가를 위한 백그라운드 스레드"""
-        def stress_worker():
-            while True:
-                time.sleep(60)
-                with self._lock:
-                    current_time = time.time()
-                    if (current_time - self.last_stress_increase >= 60
-                            and self.stress_level < 100):
-                        old_level = self.stress_level
-                        self.stress_level += 1
-                        self.last_stress_increase = current_time
-                        logger.warning(f"😰 스트레스 자동 증가: {old_level} → {self.stress_level} (1분 경과)")
-
-        thread = threading.Thread(target=stress_worker, daemon=True)
-        thread.start()
+    def _defer_log(self, level, msg, *args, rate_limited=False):
+        """락을 놓은 뒤 남길 로그 예약 (_lock 보유 상태에서 호출)
+
+        rate_limited=True인 로그는 logging_config의 속도 제한 대상입니다.
+        """
+        if logger.isEnabledFor(level):
+            self._deferred_logs.append((level, msg, args, rate_limited))
+
+    def _take_events(self):
+        """쌓인 보스 레벨 전이(실제로 바뀐 것만)와 예약된 로그를 꺼냄 (_lock 보유 상태에서 호출)"""
+        changes, self._boss_changes = self._boss_changes, []
+        logs, self._deferred_logs = self._deferred_logs, []
+        return [change for change in changes if change[0] != change[1]], logs
+
+    def _notify(self, status, events=((), ())):
+        """예약된 로그를 남기고 콜백 호출 (락 밖에서 호출)"""
+        boss_changes, logs = events
+        for level, msg, args, rate_limited in logs:
+            logger.log(level, msg, *args, extra={"rate_limited": True} if rate_limited else None)
+        for callback in self._listeners:
+            try:
+                callback(self, status)
+            except Exception:
+                logger.exception("상태 변경 콜백 실행 중 오류")
+        for old_level, new_level, cause in boss_changes:
+            for callback in self._boss_listeners:
+                try:
+                    callback(self, old_level, new_level, cause)
+                except Exception:
+                    logger.exception("보스 레벨 전이 콜백 실행 중 오류")
+
+    def _publish(self):
+        """작업용 필드로 새 스냅숏을 만들어 교체하고 반환 (_lock 보유 상태에서 호출)"""
+        snapshot = StateSnapshot(self.stress_level, self.boss_alert_level, self.last_stress_increase,
+                                 self.last_boss_alert_decrease, self.version)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _load_snapshot(self):
+        """마지막으로 교체된 스냅숏 (락 없이 호출)"""
+        return self._snapshot
+
+    def _status(self):
+        """현재 상태 딕셔너리 (_lock 보유 상태에서 호출)"""
+        return {
+            "stress_level": self.stress_level,
+            "boss_alert_level": self.boss_alert_level,
+            "last_stress_increase": self.last_stress_increase,
+            "last_boss_alert_decrease": self.last_boss_alert_decrease,
+            "version": self.version
+        }
+
+    def _changed_status(self):
+        """버전을 올리고 스냅숏을 교체한 뒤 변경된 상태를 반환 (_lock 보유 상태에서 호출)"""
+        self.version += 1
+        return self._publish().as_dict()
+
+    def restore(self, status):
+        """저장된 상태로 복원 (get_current_status()가 반환한 형식)"""
+        with self._lock:
+            self.stress_level = status["stress_level"]
+            self.boss_alert_level = status["boss_alert_level"]
+            self.last_stress_increase = status["last_stress_increase"]
+            self.last_boss_alert_decrease = status["last_boss_alert_decrease"]
+            self.version = status.get("version", self.version)
+            self._publish()
+            self._reschedule_decay()
+
+    def _raise_boss_alert(self, current_time: float):
+        """Boss Alert Level을 1 올리고 이전 레벨을 반환 (_lock 보유 상태에서 호출)
+
+        레벨 0에서 지난 cooldown 주기는 감소할 레벨이 없었으므로 쌓아 두지 않습니다.
+        기존 1초 폴링 스레드처럼 다음 감소는 늦어도 한 주기 안에 한 번만 일어납니다.
+        """
+        old_level = self.boss_alert_level
+        if old_level == 0:
+            self.last_boss_alert_decrease = max(self.last_boss_alert_decrease,
+                                                current_time - self.boss_alertness_cooldown)
+        self.boss_alert_level = min(MAX_BOSS_ALERT_LEVEL, old_level + 1)
+        self._boss_changes.append((old_level, self.boss_alert_level, "raise"))
+        return old_level
+
+    def _apply_elapsed_decay(self, current_time: float):
+        """경과 시간만큼 밀린 증가/감소를 반영 (_lock 보유 상태에서 호출)
+
+        마지막 갱신 시각은 주기 단위로만 앞당기므로 증가/감소는 항상 정확한
+        60초/cooldown 경계에서 일어납니다. 레벨이 상한/하한에 닿으면
+        더 이상 변하지 않고 마지막 갱신 시각도 그대로 유지됩니다.
+        상태가 바뀌었으면 True를 반환합니다.
+        """
+        stress_ticks = int((current_time - self.last_stress_increase) // STRESS_INCREASE_INTERVAL)
+        stress_ticks = min(stress_ticks, MAX_STRESS_LEVEL - self.stress_level)
+        if stress_ticks > 0:
+            old_level = self.stress_level
+            self.stress_level += stress_ticks
+            self.last_stress_increase += stress_ticks * STRESS_INCREASE_INTERVAL
+            self._defer_log(logging.WARNING, "😰 스트레스 자동 증가: %s → %s (%s분 경과)",
+                            old_level, self.stress_level, stress_ticks, rate_limited=True)
+
+        boss_ticks = int((current_time - self.last_boss_alert_decrease) // self.boss_alertness_cooldown)
+        boss_ticks = min(boss_ticks, self.boss_alert_level)
+        if boss_ticks > 0:
+            old_level = self.boss_alert_level
+            self.boss_alert_level -= boss_ticks
+            self.last_boss_alert_decrease += boss_ticks * self.boss_alertness_cooldown
+            self._boss_changes.append((old_level, self.boss_alert_level, "cooldown"))
+            self._defer_log(logging.INFO, "⏰ Boss Alert Level 자동 감소: %s → %s (cooldown: %s초)",
+                            old_level, self.boss_alert_level, self.boss_alertness_cooldown,
+                            rate_limited=True)
+
+        return stress_ticks > 0 or boss_ticks > 0
 
     def update_stress_level(self, decrease: int):
         """스트레스 레벨 업데이트"""
         with self._lock:
+            current_time = self.clock.time()
+            self._apply_elapsed_decay(current_time)
             old_level = self.stress_level
-            self.stress_level = max(0, min(100, self.stress_level - decrease))
-            self.last_stress_increase = time.time()
-            logger.info(f"💚 스트레스 레벨 업데이트: {old_level} → {self.stress_level} (감소: {decrease})")
+            self.stress_level = max(0, min(MAX_STRESS_LEVEL, self.stress_level - decrease))
+            self.last_stress_increase = current_time
+            self._defer_log(logging.INFO, "💚 스트레스 레벨 업데이트: %s → %s (감소: %s)",
+                            old_level, self.stress_level, decrease)
+            self._reschedule_decay()
+            status = self._changed_status()
+            events = self._take_events()
+        self._notify(status, events)
 
     def try_increase_boss_alert(self):
         """Boss Alert Level 상승 시도"""
         with self._lock:
-            if random.randint(1, 100) <= self.boss_alertness:
-                old_level = self.boss_alert_level
-                self.boss_alert_level = min(5, self.boss_alert_level + 1)
-                logger.warning(f"⚠️ Boss Alert Level 상승: {old_level} → {self.boss_alert_level} (확률: {self.boss_alertness}%)")
-                return True
-            return False
+            current_time = self.clock.time()
+            changed = self._apply_elapsed_decay(current_time)
+            raised = self.rng.randint(*BOSS_ROLL_RANGE) <= self.boss_alertness
+            if raised:
+                old_level = self._raise_boss_alert(current_time)
+                self._defer_log(logging.WARNING, "⚠️ Boss Alert Level 상승: %s → %s (확률: %s%%)",
+                                old_level, self.boss_alert_level, self.boss_alertness)
+                self._reschedule_decay()
+                changed = True
+            status = self._changed_status() if changed else None
+            events = self._take_events()
+        if status:
+            self._notify(status, events)
+        return raised
 
-    def get_current_status(self):
-        """현재 상태 반환"""
+    def apply_breaks(self, reductions):
+        """여러 번의 휴식을 락 한 번으로 적용
+
+        휴식마다 update_stress_level()과 try_increase_boss_alert()를 차례로 호출한
+        것과 같은 규칙을 따르며, 버전은 배치당 1 증가하고 리스너에는 마지막 상태만
+        한 번 알립니다.
+        휴식별 결과 딕셔너리 목록을 반환합니다 (*_before는 그 휴식을 적용하기
+        직전의 레벨).
+        """
+        results = []
         with self._lock:
-            return {
-                "stress_level": self.stress_level,
-                "boss_alert_level": self.boss_alert_level
-            }
+            current_time = self.clock.time()
+            changed = self._apply_elapsed_decay(current_time)
+            for decrease in reductions:
+                stress_before = self.stress_level
+                boss_before = self.boss_alert_level
+                raised = False
+                if decrease > 0:
+                    self.stress_level = max(0, min(MAX_STRESS_LEVEL, self.stress_level - decrease))
+                    self.last_stress_increase = current_time
+                    raised = self.rng.randint(*BOSS_ROLL_RANGE) <= self.boss_alertness
+                    if raised:
+                        self._raise_boss_alert(current_time)
+                        self._defer_log(logging.WARNING, "⚠️ Boss Alert Level 상승: %s → %s (확률: %s%%)",
+                                        boss_before, self.boss_alert_level, self.boss_alertness)
+                    changed = True
+                results.append({
+                    "stress_reduction": decrease,
+                    "stress_level": self.stress_level,
+                    "stress_level_before": stress_before,
+                    "boss_alert_level": self.boss_alert_level,
+                    "boss_alert_level_before": boss_before,
+                    "boss_raised": raised
+                })
+            if changed:
+                self._reschedule_decay()
+                self._defer_log(logging.INFO, "💚 휴식 %s건 적용: Stress %s, Boss Alert %s",
+                                len(results), self.stress_level, self.boss_alert_level)
+            status = self._changed_status() if changed else None
+            events = self._take_events()
+        if status:
+            self._notify(status, events)
+        return results
+
+    def snapshot(self) -> StateSnapshot:
+        """현재 상태 스냅숏 반환
+
+        밀린 자동 증가/감소가 없으면 락을 잡지 않고 마지막 스냅숏을 그대로
+        반환하므로, 읽는 쪽끼리도 쓰는 쪽과도 경쟁하지 않습니다.
+        """
+        snapshot = self._load_snapshot()
+        if not snapshot.decay_due(self.clock.time(), self.boss_alertness_cooldown):
+            return snapshot
+        with self._lock:
+            if self._apply_elapsed_decay(self.clock.time()):
+                status = self._changed_status()
+                events = self._take_events()
+            else:
+                # 그 사이 다른 스레드가 반영함
+                return self._publish()
+            snapshot = self._snapshot
+        self._notify(status, events)
+        return snapshot
+
+    def get_current_status(self):
+        """현재 상태 반환 (snapshot()의 딕셔너리 형식)"""
+        return self.snapshot().as_dict()
@@ -0,0 +1,186 @@
+import threading
+import logging
+import random
+from collections import OrderedDict
+
+from clock import SystemClock
+from scheduler import DecayScheduler, default_scheduler
+from state_manager import ChillMCPState
+
+logger = logging.getLogger(__name__)
+
+# 세션 키가 없을 때 사용하는 기본 키
+DEFAULT_SESSION_ID = "default"
+
+def seeded_rng_factory(seed):
+    """세션마다 seed와 세션 ID로 정해지는 random.Random을 만드는 rng_factory
+
+    정리(evict)되었다가 다시 만들어진 세션은 처음 시퀀스부터 다시 뽑습니다.
+    """
+    def create(session_id: str) -> random.Random:
+        return random.Random(f"{seed}:{session_id}")
+    return create
+
+class _Shard:
+    """락 하나와 LRU 순서의 세션 딕셔너리로 이루어진 샤드"""
+
+    __slots__ = ("lock", "sessions")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # session_id -> [state, last_access], 앞쪽일수록 오래 사용되지 않은 세션
+        self.sessions = OrderedDict()
+
+class StateStore:
+    """세션(에이전트)별 ChillMCPState 저장소
+
+    세션 ID의 해시로 샤드를 고르므로 서로 다른 세션은 같은 락을 두고
+    경쟁하지 않습니다. idle_ttl초 동안 사용되지 않은 세션과 용량을 넘는
+    가장 오래된 세션은 접근 시점에 정리됩니다. 용량은 샤드마다
+    max_sessions / shards로 나누어 적용됩니다.
+    lazy_decay가 아니면 모든 세션이 scheduler 하나에 마감 시각을 등록합니다.
+    scheduler를 주지 않으면 실제 시간에서는 프로세스 공용 스케줄러를, 다른
+    clock에서는 저장소 전용 스케줄러 하나를 만들어 close()할 때 멈춥니다.
+    rng_factory(session_id)를 주면 세션마다 그 난수 생성기로 스트레스 감소량과
+    보스 경계 상승을 뽑습니다 (기본: 모든 세션이 random 모듈 공유).
+    """
+
+    def __init__(self, boss_alertness: int = 50, boss_alertness_cooldown: int = 300,
+                 lazy_decay: bool = True, shards: int = 64,
+                 max_sessions: int = 100_000, idle_ttl: float = 3600, clock=None,
+                 journal=None, shared_segment=None, metrics=None, scheduler=None, rng_factory=None):
+        if shards <= 0:
+            raise ValueError("shards는 0보다 커야 합니다.")
+        if max_sessions <= 0:
+            raise ValueError("max_sessions는 0보다 커야 합니다.")
+
+        self.clock = clock or SystemClock()
+        self.boss_alertness = boss_alertness
+        self.boss_alertness_cooldown = boss_alertness_cooldown
+        self.lazy_decay = lazy_decay
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_per_shard = max(1, -(-max_sessions // shards))
+        # 공유 세그먼트가 있으면 상태 필드를 여러 프로세스가 함께 사용
+        self.shared_segment = shared_segment
+        self.metrics = metrics
+        self._owns_scheduler = False
+        if scheduler is None and not lazy_decay and shared_segment is None:
+            if clock is None:
+                scheduler = default_scheduler()
+            else:
+                # 세션마다 전용 스케줄러 스레드를 만들지 않도록 저장소에서 하나만 생성
+                scheduler = DecayScheduler(self.clock)
+                scheduler.start()
+                self._owns_scheduler = True
+        self.scheduler = scheduler
+        self.rng_factory = rng_factory
+        # 새로 만드는 모든 세션 상태에 등록할 상태 변경 콜백
+        self._listeners = []
+        # 영속화가 켜져 있으면 저장된 상태를 읽어 두고 세션이 처음 쓰일 때 복원
+        self.journal = journal
+        if journal:
+            journal.load()
+            journal.start()
+
+    def _create_state(self, session_id: str) -> ChillMCPState:
+        """새 세션 상태 생성 (저장된 상태가 있으면 복원)"""
+        rng = self.rng_factory(session_id) if self.rng_factory else None
+        if self.shared_segment:
+            from shared_state import SharedChillMCPState
+            # 정리되었던 세션도 공유 슬롯에 남아 있는 상태를 그대로 사용
+            state = SharedChillMCPState(self.shared_segment, session_id, self.boss_alertness,
+                                        self.boss_alertness_cooldown, clock=self.clock, rng=rng)
+        else:
+            state = ChillMCPState(self.boss_alertness, self.boss_alertness_cooldown,
+                                  lazy_decay=self.lazy_decay, clock=self.clock,
+                                  scheduler=self.scheduler, rng=rng)
+            state.session_id = session_id
+            if self.journal:
+                # 정리(evict)되었던 세션도 마지막으로 기록된 상태에서 이어감
+                restored = self.journal.latest(session_id)
+                if restored:
+                    state.restore(restored)
+                state.add_listener(self.journal.listener)
+        for callback in self._listeners:
+            state.add_listener(callback)
+        if self.metrics:
+            # 공유 상태의 락은 프로세스 간 락이라 교체하지 않음
+            self.metrics.attach(state, instrument_lock=not self.shared_segment)
+        return state
+
+    def add_listener(self, callback):
+        """이후 만들어지는 모든 세션 상태에 상태 변경 콜백 등록"""
+        self._listeners.append(callback)
+
+    def _shard_for(self, session_id: str) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def get(self, session_id: str = DEFAULT_SESSION_ID) -> ChillMCPState:
+        """세션 상태를 반환 (없으면 생성)"""
+        shard = self._shard_for(session_id)
+        now = self.clock.monotonic()
+
+        with shard.lock:
+            entry = shard.sessions.get(session_id)
+            if entry is not None:
+                entry[1] = now
+                shard.sessions.move_to_end(session_id)
+            else:
+                entry = [self._create_state(session_id), now]
+                shard.sessions[session_id] = entry
+            # 방금 사용한 세션(맨 뒤)은 정리 대상에서 제외
+            evicted = self._evict(shard, now, keep=1)
+
+        for state in evicted:
+            state.close()
+        return entry[0]
+
+    def _evict(self, shard: _Shard, now: float, keep: int = 0):
+        """만료되었거나 용량을 넘는 세션 제거 (shard.lock 보유 상태에서 호출)"""
+        evicted = []
+        sessions = shard.sessions
+        while len(sessions) > keep:
+            session_id, (state, last_access) = next(iter(sessions.items()))
+            if now - last_access < self.idle_ttl and len(sessions) <= self._max_per_shard:
+                break
+            del sessions[session_id]
+            evicted.append(state)
+            logger.info("🧹 세션 정리: %s", session_id)
+        return evicted
+
+    def evict_idle(self):
+        """모든 샤드에서 만료된 세션을 정리하고 정리된 수를 반환"""
+        now = self.clock.monotonic()
+        count = 0
+        for shard in self._shards:
+            with shard.lock:
+                evicted = self._evict(shard, now)
+            for state in evicted:
+                state.close()
+            count += len(evicted)
+        return count
+
+    def __len__(self):
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    def __contains__(self, session_id):
+        shard = self._shard_for(session_id)
+        with shard.lock:
+            return session_id in shard.sessions
+
+    def close(self):
+        """모든 세션 상태를 정리하고 영속화 로그를 마무리"""
+        for shard in self._shards:
+            with shard.lock:
+                states = [entry[0] for entry in shard.sessions.values()]
+                shard.sessions.clear()
+            for state in states:
+                state.close()
+        if self.journal:
+            self.journal.close()
+        if self.shared_segment:
+            self.shared_segment.close()
+        if self._owns_scheduler:
+            self.scheduler.stop()
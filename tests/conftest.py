@@ -1,20 +1,60 @@
+import time
 import pytest
 from fastmcp.client import Client
+from clock import VirtualClock
 from server import create_mcp_server
 
+class SchedulerDrivenClock(VirtualClock):
+    """시간을 옮길 때마다 등록된 스케줄러의 마감된 콜백도 실행하는 가상 시계
+
+    스케줄러 스레드는 실제 시간으로 잠들므로, lazy_decay가 아닌 서버는 이 시계로
+    앞당긴 시각의 자동 증가/감소를 run_due()로 바로 적용합니다.
+    """
+
+    def __init__(self, start: float = 0.0):
+        super().__init__(start)
+        self.schedulers = []
+
+    def advance(self, seconds: float):
+        super().advance(seconds)
+        self._run_schedulers()
+
+    def advance_to(self, timestamp: float):
+        super().advance_to(timestamp)
+        self._run_schedulers()
+
+    def _run_schedulers(self):
+        for scheduler in self.schedulers:
+            scheduler.run_due()
+
+@pytest.fixture
+def virtual_clock():
+    """테스트에서 직접 앞당기는 가상 시계"""
+    return SchedulerDrivenClock(start=time.time())
+
 @pytest.fixture
-def mcp_client_factory():
-    """다양한 파라미터로 클라이언트를 생성하는 팩토리 Fixture"""
+def mcp_client_factory(virtual_clock):
+    """다양한 파라미터로 클라이언트를 생성하는 팩토리 Fixture
+
+    서버는 가상 시계로 동작하므로 테스트는 실제로 기다리지 않고
+    virtual_clock.advance()로 시간을 앞당깁니다. --lazy_decay를 주지 않으면
+    기본값처럼 스케줄러가 자동 증가/감소를 적용합니다.
+    """
     clients = []
     async def _factory(args=None):
+        args = args or []
         server = create_mcp_server(
             boss_alertness=int(next((args[i+1] for i, x in enumerate(args) if x == "--boss_alertness"), 50)),
-            boss_alertness_cooldown=int(next((args[i+1] for i, x in enumerate(args) if x == "--boss_alertness_cooldown"), 300))
+            boss_alertness_cooldown=int(next((args[i+1] for i, x in enumerate(args) if x == "--boss_alertness_cooldown"), 300)),
+            lazy_decay="--lazy_decay" in args,
+            clock=virtual_clock
         )
+        if server.scheduler is not None:
+            virtual_clock.schedulers.append(server.scheduler)
         client = Client(server)
         clients.append(client)
         return client
-    
+
     yield _factory
 
     # 모든 테스트가 끝난 후 클라이언트 정리
@@ -27,4 +67,4 @@ async def mcp_client(mcp_client_factory):
     """기본 설정 클라이언트를 제공하는 Fixture"""
     client = await mcp_client_factory([])
     async with client:
-        yield client
\ No newline at end of file
+        yield client
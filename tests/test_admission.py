@@ -0,0 +1,146 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from fastmcp.client import Client
+from admission import AdmissionController
+from clock import VirtualClock
+from server import create_mcp_server
+from tests.test_state_rules import _reach_boss_level_5
+
+def _server(virtual_clock, boss_alertness=0, **admission):
+    return create_mcp_server(boss_alertness, 300, lazy_decay=True, clock=virtual_clock, **admission)
+
+@pytest.mark.asyncio
+async def test_session_rate_limit_rejects_fast(virtual_clock):
+    """에이전트별 한도를 넘는 호출은 기다리지 않고 재시도 시각과 함께 거절되는지 검증"""
+    mcp = _server(virtual_clock, session_rate_limit=1, session_burst=2)
+    async with Client(mcp) as client:
+        for _ in range(2):
+            assert not (await client.call_tool("take_a_break", {"agent_id": "agent-a"})).is_error
+
+        rejected = await client.call_tool("take_a_break", {"agent_id": "agent-a"}, raise_on_error=False)
+        assert rejected.is_error
+        text = rejected.content[0].text
+        assert "Rejected: session_rate" in text
+        assert "Retry After: 1.00" in text
+        assert virtual_clock.pending_sleepers == 0
+
+        # 다른 에이전트는 영향 없음, 시간이 지나면 다시 허용
+        assert not (await client.call_tool("take_a_break", {"agent_id": "agent-b"})).is_error
+        virtual_clock.advance(1)
+        assert not (await client.call_tool("take_a_break", {"agent_id": "agent-a"})).is_error
+
+        assert mcp.metrics.snapshot()["admission"] == {"rejected session_rate": 1}
+
+@pytest.mark.asyncio
+async def test_over_limit_call_gets_deferred_slot(virtual_clock):
+    """max_defer 안에 토큰이 채워지면 거절 대신 그만큼 기다렸다가 실행되는지 검증"""
+    mcp = _server(virtual_clock, session_rate_limit=2, max_queue=1, max_defer=1)
+    async with Client(mcp) as client:
+        for _ in range(2):
+            await client.call_tool("take_a_break")
+
+        deferred = asyncio.ensure_future(client.call_tool("take_a_break"))
+        await virtual_clock.wait_for_sleepers(1)
+        # 대기열(1)이 찼으므로 다음 초과 호출은 거절
+        rejected = await client.call_tool("take_a_break", raise_on_error=False)
+        assert "Rejected: queue_full" in rejected.content[0].text
+
+        virtual_clock.advance(0.5)
+        assert not (await deferred).is_error
+        assert mcp.metrics.snapshot()["admission"] == {"deferred session_rate": 1, "rejected queue_full": 1}
+
+@pytest.mark.asyncio
+async def test_in_flight_limit_bounds_sleeping_calls(virtual_clock):
+    """Level 5 지연 중인 호출이 동시 실행 수를 채우면 대기열만큼만 기다리고 나머지는 거절되는지 검증"""
+    mcp = _server(virtual_clock, boss_alertness=100, max_in_flight=2, max_queue=1)
+    async with Client(mcp) as client:
+        await _reach_boss_level_5(client)
+
+        calls = [asyncio.ensure_future(client.call_tool("take_a_break", raise_on_error=False)) for _ in range(3)]
+        await virtual_clock.wait_for_sleepers(2)
+        rejected = await client.call_tool("take_a_break", raise_on_error=False)
+        assert "Rejected: queue_full" in rejected.content[0].text
+        assert mcp.admission.in_flight == 2
+        assert mcp.admission.waiting == 1
+
+        # 앞의 두 호출이 끝나면 대기하던 호출이 빈자리를 받아 지연을 시작
+        virtual_clock.advance(20)
+        await virtual_clock.wait_for_sleepers(1)
+        virtual_clock.advance(20)
+        results = await asyncio.gather(*calls)
+        assert not any(result.is_error for result in results)
+        assert mcp.admission.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_batch_uses_global_bucket(virtual_clock):
+    """batch_breaks는 휴식 수만큼 전체 버킷 토큰을 쓰는지 검증"""
+    mcp = _server(virtual_clock, rate_limit=5)
+    async with Client(mcp) as client:
+        breaks = [{"tool": "take_a_break", "agent_id": f"agent-{i}"} for i in range(5)]
+        assert not (await client.call_tool("batch_breaks", {"breaks": breaks})).is_error
+
+        rejected = await client.call_tool("show_meme", raise_on_error=False)
+        assert "Rejected: global_rate" in rejected.content[0].text
+        assert "Retry After: 0.20" in rejected.content[0].text
+
+@pytest.mark.asyncio
+async def test_batch_cannot_exceed_rate_limits(virtual_clock):
+    """배치도 전체/에이전트별 한도를 넘지 못하고, 버킷보다 큰 배치는 바로 거절되는지 검증"""
+    mcp = _server(virtual_clock, rate_limit=5, session_rate_limit=1)
+    async with Client(mcp) as client:
+        for second in range(3):
+            too_large = await client.call_tool("batch_breaks", {"breaks": [
+                {"tool": "take_a_break", "agent_id": "agent-a"}] * 1000}, raise_on_error=False)
+            assert "Rejected: batch_too_large" in too_large.content[0].text
+            # 에이전트별 버킷(1)보다 많은 건수도 거절
+            per_session = await client.call_tool("batch_breaks", {"breaks": [
+                {"tool": "take_a_break", "agent_id": "agent-a"}] * 2}, raise_on_error=False)
+            assert "Rejected: batch_too_large" in per_session.content[0].text
+
+            spread = [{"tool": "take_a_break", "agent_id": f"agent-{i}"} for i in range(5)]
+            assert not (await client.call_tool("batch_breaks", {"breaks": spread})).is_error
+            # 배치가 쓴 에이전트별 토큰과 전체 토큰이 남지 않음
+            rejected = await client.call_tool("show_meme", {"agent_id": "agent-0"}, raise_on_error=False)
+            assert "Rejected:" in rejected.content[0].text
+            virtual_clock.advance(1)
+
+        # 적용된 휴식은 1초마다 에이전트당 1건
+        versions = [mcp.state_store.get(f"agent-{i}").get_current_status()["version"] for i in range(5)]
+        assert versions == [3] * 5
+        assert mcp.state_store.get("agent-a").get_current_status()["version"] == 0
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(5)
+async def test_cancelled_deferred_call_refunds_tokens():
+    """토큰을 기다리다 취소된 호출이 예약한 토큰을 전체/세션 버킷에 돌려주는지 검증"""
+    clock = VirtualClock(start=0)
+    admission = AdmissionController(rate=1, session_rate=1, max_queue=1, max_defer=5, clock=clock)
+    async with admission.admit("agent-a"):
+        pass
+
+    async def deferred():
+        async with admission.admit("agent-a"):
+            pass
+
+    task = asyncio.ensure_future(deferred())
+    await clock.wait_for_sleepers(1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert admission.waiting == 0
+
+    # 취소된 호출의 토큰이 돌아왔으므로 1초 뒤의 호출은 기다리지 않음
+    clock.advance(1)
+    async with admission.admit("agent-a"):
+        assert clock.pending_sleepers == 0
+
+def test_max_defer_requires_queue():
+    """대기열 없이 max_defer만 주면 아무 호출도 기다리지 못하므로 시작 시 거절하는지 검증"""
+    result = subprocess.run([sys.executable, "main.py", "--session_rate_limit", "1", "--max_defer", "1"],
+                            cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True,
+                            timeout=30)
+    assert result.returncode == 1
+    assert "max_queue" in result.stderr
@@ -0,0 +1,123 @@
+import asyncio
+import random
+import threading
+from clock import VirtualClock
+from state_manager import ChillMCPState
+
+class CountingLock:
+    """획득 횟수를 세는 threading.Lock 대체"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.acquisitions += 1
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+async def test_batch_breaks_results_in_request_order(mcp_client_factory):
+    """batch_breaks가 요청 순서대로 항목별 결과를 반환하고 세션별로 적용하는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "0"])
+    async with client:
+        response = await client.call_tool("batch_breaks", {"breaks": [
+            {"tool": "take_a_break", "agent_id": "agent-a"},
+            {"tool": "watch_netflix", "agent_id": "agent-b"},
+            {"tool": "no_such_tool", "agent_id": "agent-a"},
+            {"tool": "show_meme", "agent_id": "agent-a"},
+        ]})
+        results = response.data["results"]
+        assert response.data["penalty_seconds"] == 0
+        assert [item["tool"] for item in results] == ["take_a_break", "watch_netflix", "no_such_tool", "show_meme"]
+        assert "error" in results[2]
+
+        first, second, _, third = results
+        assert first["session_id"] == third["session_id"] == "agent-a"
+        assert "Break Summary" in first["summary"]
+        assert first["stress_level"] == max(0, 50 - first["stress_reduction"])
+        assert third["stress_level"] == max(0, first["stress_level"] - third["stress_reduction"])
+        assert second["stress_level"] == max(0, 50 - second["stress_reduction"])
+
+        status = await client.call_tool("check_status", {"agent_id": "agent-a"})
+        assert f"Stress Level: {third['stress_level']}" in status.content[0].text
+
+async def test_batch_breaks_single_lock_per_state(mcp_client_factory):
+    """한 에이전트의 휴식 여러 건이 락 한 번으로 적용되는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "0"])
+    async with client:
+        await client.call_tool("check_status", {"agent_id": "agent-a"})
+        state = client.transport.server.state_store.get("agent-a")
+        state._lock = CountingLock()
+
+        await client.call_tool("batch_breaks", {"breaks": [{"tool": "take_a_break", "agent_id": "agent-a"}] * 50})
+        assert state._lock.acquisitions == 1
+        assert state.version == 1
+
+async def test_batch_breaks_penalty_once_per_batch(mcp_client_factory, virtual_clock):
+    """레벨 5인 에이전트가 여러 명이어도 지연은 배치당 한 번만 적용되는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100"])
+    async with client:
+        breaks = [{"tool": "take_a_break", "agent_id": f"agent-{i}"} for i in range(3)] * 5
+        first = await client.call_tool("batch_breaks", {"breaks": breaks})
+        assert first.data["penalty_seconds"] == 0
+        assert all(item["boss_alert_level"] == 5 for item in first.data["results"][-3:])
+
+        start_time = virtual_clock.time()
+        call = asyncio.ensure_future(client.call_tool("batch_breaks", {"breaks": breaks}))
+        await virtual_clock.wait_for_sleepers(1)
+        await asyncio.sleep(0.01)
+        assert virtual_clock.pending_sleepers == 1
+
+        virtual_clock.advance(20)
+        response = await call
+        assert response.data["penalty_seconds"] == 20
+        assert virtual_clock.time() - start_time == 20
+
+async def test_batch_breaks_penalty_before_applying(mcp_client_factory, virtual_clock):
+    """단일 휴식 도구처럼 지연을 기다린 뒤 그동안 감소한 보스 경계 레벨에 적용하는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100", "--boss_alertness_cooldown", "10"])
+    async with client:
+        await client.call_tool("batch_breaks", {"breaks": [{"tool": "take_a_break", "agent_id": "agent-a"}] * 5})
+
+        call = asyncio.ensure_future(client.call_tool("batch_breaks", {"breaks": [
+            {"tool": "take_a_break", "agent_id": "agent-a"},
+        ]}))
+        await virtual_clock.wait_for_sleepers(1)
+        virtual_clock.advance(20)
+        response = await call
+
+        result = response.data["results"][0]
+        assert response.data["penalty_seconds"] == 20
+        assert result["boss_alert_level_before"] == 3
+        assert result["boss_alert_level"] == 4
+
+async def test_batch_breaks_size_limit(mcp_client_factory):
+    """최대 배치 크기를 넘으면 오류를 반환하는지 검증"""
+    client = await mcp_client_factory([])
+    async with client:
+        response = await client.call_tool("batch_breaks", {"breaks": [{"tool": "take_a_break"}] * 1001},
+                                          raise_on_error=False)
+        assert response.is_error
+
+def test_apply_breaks_matches_sequential_calls():
+    """apply_breaks가 update_stress_level + try_increase_boss_alert를 차례로 호출한 것과 같은지 검증"""
+    reductions = [10, 25, 5, 40, 15]
+    clock = VirtualClock(start=1000)
+
+    random.seed(7)
+    sequential = ChillMCPState(50, 300, lazy_decay=True, clock=clock)
+    for reduction in reductions:
+        sequential.update_stress_level(reduction)
+        sequential.try_increase_boss_alert()
+
+    random.seed(7)
+    batched = ChillMCPState(50, 300, lazy_decay=True, clock=clock)
+    results = batched.apply_breaks(reductions)
+
+    expected = sequential.get_current_status()
+    actual = batched.get_current_status()
+    assert actual['stress_level'] == expected['stress_level'] == results[-1]['stress_level']
+    assert actual['boss_alert_level'] == expected['boss_alert_level'] == results[-1]['boss_alert_level']
+    assert actual['version'] == 1
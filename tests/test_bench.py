@@ -0,0 +1,54 @@
+import json
+from bench.load import find_regressions, instrument_locks, main
+from bench.read_contention import main as read_contention_main
+from server import create_mcp_server
+
+def test_load_bench_writes_results(tmp_path):
+    """벤치마크가 워크로드별 지표를 JSON으로 저장하는지 검증"""
+    output = tmp_path / "results.json"
+    assert main(["--calls", "50", "--concurrency", "4", "--boss_alertness", "0", "100",
+                 "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert set(results["workloads"]) == {"boss_alertness=0", "boss_alertness=100"}
+    for workload in results["workloads"].values():
+        assert workload["calls"] == 50
+        assert workload["calls_per_sec"] > 0
+        assert workload["latency_ms"]["p50"] <= workload["latency_ms"]["p99"]
+        assert workload["lock"]["acquisitions"] > 0
+        assert workload["rss_mb"] > 0
+
+    # 자기 자신과 비교하면 회귀가 없어야 함
+    assert main(["--calls", "50", "--concurrency", "4", "--boss_alertness", "0",
+                 "--baseline", str(output), "--max_regression", "10000"]) == 0
+
+def test_instrument_locks_keeps_server_metrics():
+    """부하 벤치마크의 락 계측이 서버 metrics의 InstrumentedLock을 바꿔치지 않고 재사용하는지 검증"""
+    mcp = create_mcp_server(50, 300, lazy_decay=True)
+    locks = instrument_locks(mcp.state_store)
+    state = mcp.state_store.get("agent-a")
+    assert locks == [state._lock]
+    assert state._lock._metrics is mcp.metrics
+
+def test_find_regressions():
+    """처리량 감소와 지연 증가를 회귀로 보고하는지 검증"""
+    baseline = {"workloads": {"w": {"calls_per_sec": 100, "latency_ms": {"p50": 1, "p95": 2, "p99": 3}}}}
+    current = {"workloads": {"w": {"calls_per_sec": 70, "latency_ms": {"p50": 1, "p95": 2, "p99": 5}}}}
+    regressions = find_regressions(current, baseline, 20)
+    assert len(regressions) == 2
+    assert find_regressions(current, baseline, 100) == []
+
+def test_read_contention_bench_writes_results(tmp_path):
+    """읽기 경합 벤치마크가 읽기 방식과 reader 수마다 지표를 저장하고, snapshot 읽기는 락을 잡지 않는지 검증"""
+    output = tmp_path / "read_contention.json"
+    assert read_contention_main(["--readers", "1", "4", "--writers", "1", "--reads", "200",
+                                 "--output", str(output)]) == 0
+
+    configs = json.loads(output.read_text())["configs"]
+    assert set(configs) == {"locked/readers=1", "snapshot/readers=1", "locked/readers=4", "snapshot/readers=4"}
+    for config in configs.values():
+        assert config["reads"] == config["readers"] * 200
+        assert config["read_latency_us"]["p50"] <= config["read_latency_us"]["p99"]
+        # snapshot 읽기에서는 쓰기만 락을 잡음
+        reader_acquisitions = config["reads"] if config["mode"] == "locked" else 0
+        assert config["lock"]["acquisitions"] == config["writes"] + reader_acquisitions
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from clock import VirtualClock
+from state_manager import ChillMCPState
+
+@pytest.mark.asyncio
+async def test_virtual_clock_sleep_wakes_on_advance():
+    """가상 시계의 sleep()이 advance()로 마감 시각을 지날 때만 깨어나는지 검증"""
+    clock = VirtualClock(start=100)
+    short = asyncio.ensure_future(clock.sleep(5))
+    long = asyncio.ensure_future(clock.sleep(10))
+    await clock.wait_for_sleepers(2)
+
+    clock.advance(5)
+    await asyncio.sleep(0)
+    assert short.done() and not long.done()
+    assert clock.pending_sleepers == 1
+
+    clock.advance(5)
+    await long
+    assert clock.time() == 110
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+@pytest.mark.asyncio
+async def test_virtual_clock_advance_to_next_deadline():
+    """next_deadline이 가장 이른 sleep() 마감 시각을 알려주고 advance_to()가 정확히 그 시각에 깨우는지 검증"""
+    clock = VirtualClock(start=0.1)
+    assert clock.next_deadline is None
+    sleepers = [asyncio.ensure_future(clock.sleep(seconds)) for seconds in (0.2, 0.7)]
+    await clock.wait_for_sleepers(2)
+
+    clock.advance_to(clock.next_deadline)
+    await sleepers[0]
+    assert clock.time() == 0.1 + 0.2
+    assert clock.next_deadline == 0.1 + 0.7
+
+    with pytest.raises(ValueError):
+        clock.advance_to(0)
+    clock.advance_to(clock.next_deadline)
+    await sleepers[1]
+
+def test_state_follows_virtual_clock():
+    """ChillMCPState의 60초/cooldown 규칙이 가상 시계를 따르는지 검증"""
+    clock = VirtualClock(start=1000)
+    state = ChillMCPState(100, 30, lazy_decay=True, clock=clock)
+    state.try_increase_boss_alert()
+    state.try_increase_boss_alert()
+
+    clock.advance(60 * 3)
+    status = state.get_current_status()
+    assert status['stress_level'] == 53
+    assert status['boss_alert_level'] == 0
+    assert status['last_stress_increase'] == 1000 + 180
+    assert status['last_boss_alert_decrease'] == 1000 + 60
@@ -0,0 +1,105 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+import pytest
+from fastmcp.client import Client
+from server import create_mcp_server
+from state_store import DEFAULT_SESSION_ID
+from tests.test_utils import validate_response
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _connect(url, retries=50):
+    """서버가 뜰 때까지 재시도하며 연결된 클라이언트를 반환"""
+    for _ in range(retries):
+        client = Client(url)
+        try:
+            await client.__aenter__()
+            return client
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url}에 연결할 수 없습니다.")
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("transport, path", [("http", "/mcp"), ("sse", "/sse")])
+async def test_http_transports_serve_tools(transport, path):
+    """http/sse 전송에서 도구 호출이 동작하고 종료 시 상태가 정리되는지 검증"""
+    port = _free_port()
+    mcp = create_mcp_server(100, 300, lazy_decay=True)
+    server_task = asyncio.create_task(
+        mcp.run_http_async(transport=transport, host="127.0.0.1", port=port, show_banner=False)
+    )
+    try:
+        client = await _connect(f"http://127.0.0.1:{port}{path}")
+        try:
+            results = await asyncio.gather(
+                *(client.call_tool("take_a_break", {"agent_id": f"agent-{i}"}) for i in range(10))
+            )
+            for response in results:
+                is_valid, status = validate_response(response.content[0].text)
+                assert is_valid, status
+                assert status['boss'] == 1
+            assert len(mcp.state_store) == 10
+
+            # 같은 포트에서 Prometheus 계측값 제공
+            with await asyncio.to_thread(urllib.request.urlopen, f"http://127.0.0.1:{port}/metrics") as response:
+                metrics = response.read().decode()
+            assert 'chillmcp_tool_latency_seconds_count{tool="take_a_break"} 10' in metrics
+        finally:
+            await client.__aexit__(None, None, None)
+    finally:
+        server_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server_task
+
+    # graceful shutdown 시 lifespan에서 상태 저장소가 정리되어야 함
+    assert len(mcp.state_store) == 0
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("transport, path", [("http", "/mcp"), ("sse", "/sse")])
+async def test_network_clients_without_agent_id_do_not_share_state(transport, path):
+    """http/sse 클라이언트 둘이 agent_id 없이 호출해도 기본 상태 하나를 나눠 쓰지 않는지 검증"""
+    port = _free_port()
+    mcp = create_mcp_server(100, 300, lazy_decay=True)
+    server_task = asyncio.create_task(
+        mcp.run_http_async(transport=transport, host="127.0.0.1", port=port, show_banner=False)
+    )
+    try:
+        first = await _connect(f"http://127.0.0.1:{port}{path}")
+        second = await _connect(f"http://127.0.0.1:{port}{path}")
+        try:
+            for client in (first, second):
+                for tool, arguments in [("take_a_break", {}), ("check_status", {}),
+                                        ("batch_breaks", {"breaks": [{"tool": "take_a_break"}]})]:
+                    response = await client.call_tool(tool, arguments, raise_on_error=False)
+                    assert response.is_error
+                    assert "agent_id" in response.content[0].text
+            assert DEFAULT_SESSION_ID not in mcp.state_store
+
+            for client, agent_id in ((first, "agent-1"), (second, "agent-2")):
+                response = await client.call_tool("take_a_break", {"agent_id": agent_id})
+                assert response.structured_content["boss_alert_level"] == 1
+        finally:
+            await first.__aexit__(None, None, None)
+            await second.__aexit__(None, None, None)
+    finally:
+        server_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server_task
+
+def test_multiple_workers_require_shared_state():
+    """stateless 멀티 워커는 워커마다 상태가 갈라지지 않도록 shared_state를 요구하는지 검증"""
+    result = subprocess.run([sys.executable, "main.py", "--transport", "http", "--workers", "2"],
+                            cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 1
+    assert "shared_state" in result.stderr
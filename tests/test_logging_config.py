@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import pytest
+from clock import VirtualClock
+from logging_config import configure_logging
+from state_manager import ChillMCPState
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+def test_async_logging_writes_json_from_writer_thread(restore_root_logger):
+    """비동기 모드에서 레코드가 writer 스레드에서 JSON으로 포맷되어 기록되는지 검증"""
+    stream = io.StringIO()
+    writer = configure_logging(logging.INFO, log_format="json", async_mode=True, stream=stream)
+    logger = logging.getLogger("chillmcp.test")
+    for i in range(100):
+        logger.info("메시지 %s", i)
+    writer.stop()
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == [f"메시지 {i}" for i in range(100)]
+    assert entries[0]["level"] == "INFO"
+    assert entries[0]["logger"] == "chillmcp.test"
+
+def test_rate_limited_records_are_suppressed(restore_root_logger):
+    """rate_limited 레코드만 템플릿별로 제한하고 생략한 수를 다음 줄에 덧붙이는지 검증"""
+    stream = io.StringIO()
+    configure_logging(logging.INFO, rate_limit=0.001, stream=stream)
+    logger = logging.getLogger("chillmcp.test")
+    for i in range(5):
+        logger.info("쿨다운 %s", i, extra={"rate_limited": True})
+        logger.info("일반 %s", i)
+
+    lines = stream.getvalue().splitlines()
+    assert sum("쿨다운" in line for line in lines) == 1
+    assert sum("일반" in line for line in lines) == 5
+
+    # 토큰이 다시 차면 생략한 수와 함께 기록
+    handler = logging.getLogger().handlers[0]
+    bucket = handler.filters[0]._buckets["쿨다운 %s"]
+    bucket[0] = 1
+    logger.info("쿨다운 %s", 5, extra={"rate_limited": True})
+    assert stream.getvalue().splitlines()[-1].endswith("쿨다운 5 (비슷한 메시지 4건 생략)")
+
+def test_state_logs_after_releasing_lock(restore_root_logger):
+    """상태 변경 로그가 락을 놓은 뒤에 기록되는지 검증"""
+    state = ChillMCPState(100, 10, lazy_decay=True, clock=VirtualClock(start=1000))
+    held = []
+
+    class LockCheckingHandler(logging.Handler):
+        def emit(self, record):
+            held.append(state._lock.locked())
+
+    configure_logging(logging.INFO, stream=io.StringIO())
+    logging.getLogger().addHandler(LockCheckingHandler())
+
+    state.update_stress_level(10)
+    state.try_increase_boss_alert()
+    state.apply_breaks([10, 10])
+    state.clock.advance(120)
+    state.get_current_status()
+
+    assert len(held) >= 5
+    assert not any(held)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from clock import VirtualClock
+from metrics import Histogram, InstrumentedLock, Metrics
+from state_store import StateStore
+from tests.test_state_rules import _reach_boss_level_5
+
+async def test_get_metrics_tool(mcp_client_factory, virtual_clock):
+    """get_metrics가 도구별 지연, Level 5 지연, 보스 레벨 전이를 보고하는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100", "--boss_alertness_cooldown", "10"])
+    async with client:
+        await _reach_boss_level_5(client)
+        call = asyncio.ensure_future(client.call_tool("take_a_break"))
+        await virtual_clock.wait_for_sleepers(1)
+        virtual_clock.advance(20)
+        await call
+
+        # 20초 동안 쿨다운 두 번 (5 → 3), 휴식으로 다시 4
+        await client.call_tool("check_status")
+
+        metrics = (await client.call_tool("get_metrics")).data
+        assert metrics["tools"]["take_a_break"]["count"] == 6
+        assert metrics["tools"]["check_status"]["count"] == 1
+        assert metrics["penalties"] == {"count": 1, "seconds": 20}
+
+        transitions = metrics["boss_transitions"]
+        assert transitions["counts"]["0->1 raise"] == 1
+        assert transitions["counts"]["4->5 raise"] == 1
+        assert transitions["counts"]["5->3 cooldown"] == 1
+        assert transitions["counts"]["3->4 raise"] == 2
+        assert transitions["recent"][-1]["session_id"] == "default"
+
+        text = (await client.call_tool("get_metrics", {"format": "prometheus"})).content[0].text
+        assert 'chillmcp_tool_latency_seconds_count{tool="take_a_break"} 6' in text
+        assert 'chillmcp_tool_latency_seconds_bucket{tool="take_a_break",le="+Inf"} 6' in text
+        assert "chillmcp_boss_penalties_total 1" in text
+        assert 'chillmcp_boss_transitions_total{from="5",to="3",cause="cooldown"} 1' in text
+
+def test_histogram_quantiles():
+    """히스토그램 분위수가 버킷 상한으로 계산되는지 검증"""
+    histogram = Histogram(bounds=(0.001, 0.01, 0.1))
+    for value in [0.0005] * 50 + [0.005] * 45 + [0.05] * 4 + [1.0]:
+        histogram.observe(value)
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.95) == 0.01
+    assert histogram.quantile(0.99) == 0.1
+    assert histogram.quantile(1.0) is None
+
+def test_lock_wait_is_counted_only_under_contention():
+    """경합 없는 락 획득은 기록하지 않고, 대기한 획득만 기록하는지 검증"""
+    metrics = Metrics()
+    store = StateStore(clock=VirtualClock(start=1000), metrics=metrics)
+    state = store.get("agent-a")
+    state.update_stress_level(10)
+    assert metrics.lock_contended == 0
+
+    state._lock.acquire()
+    waiter = threading.Thread(target=state.update_stress_level, args=(1,))
+    waiter.start()
+    waiter.join(0.05)
+    state._lock.release()
+    waiter.join()
+
+    assert metrics.lock_contended == 1
+    assert metrics.lock_wait_seconds > 0
+
+def test_instrumented_lock_records_holds():
+    """record_holds면 획득 횟수와 함께 보유 시간을 모으는지 검증"""
+    lock = InstrumentedLock(record_holds=True)
+    for _ in range(3):
+        with lock:
+            pass
+    assert lock.acquisitions == 3
+    assert len(lock.holds) == 3
+    assert InstrumentedLock().holds is None
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import pytest
+from fastmcp.client import Client
+from mcp.client.subscriptions import listen
+from notifications import StatusNotifier
+from server import create_mcp_server
+from tests.test_http_transport import _connect, _free_port
+
+async def _next_event(subscription, timeout=2):
+    return await asyncio.wait_for(subscription.__anext__(), timeout)
+
+@pytest.mark.asyncio
+async def test_status_resource_reports_levels(virtual_clock):
+    """chill://status 리소스가 세션 상태를 JSON으로 반환하는지 검증"""
+    mcp = create_mcp_server(100, 300, lazy_decay=True, clock=virtual_clock)
+    async with Client(mcp) as client:
+        await client.call_tool("take_a_break", {"agent_id": "agent-a"})
+        content = await client.read_resource("chill://status/agent-a")
+        status = json.loads(content[0].text)
+        assert status["session_id"] == "agent-a"
+        assert status["boss_alert_level"] == 1
+
+        default = json.loads((await client.read_resource("chill://status"))[0].text)
+        assert default["session_id"] == "default"
+        assert default["boss_alert_level"] == 0
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(30)
+async def test_network_clients_must_use_per_agent_uri():
+    """http에서는 chill://status가 기본 세션이 아닌 세션을 읽지 않고 에이전트별 URI를 안내하는지 검증
+
+    chill://status 알림은 기본 세션 변경에만 보내므로, 다른 세션은 이 URI로 읽을 수 없어야 함
+    """
+    port = _free_port()
+    mcp = create_mcp_server(100, 300, lazy_decay=True)
+    server_task = asyncio.create_task(
+        mcp.run_http_async(transport="http", host="127.0.0.1", port=port, show_banner=False)
+    )
+    try:
+        client = await _connect(f"http://127.0.0.1:{port}/mcp")
+        try:
+            await client.call_tool("take_a_break", {"agent_id": "agent-a"})
+            with pytest.raises(Exception, match=r"chill://status/\{agent_id\}"):
+                await client.read_resource("chill://status")
+            status = json.loads((await client.read_resource("chill://status/agent-a"))[0].text)
+            assert status["boss_alert_level"] == 1
+        finally:
+            await client.__aexit__(None, None, None)
+    finally:
+        server_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server_task
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_burst_of_changes_is_coalesced(virtual_clock):
+    """구독한 세션의 변경이 몰려도 알림은 한 번이고, 다른 세션 변경은 알리지 않는지 검증"""
+    mcp = create_mcp_server(100, 300, lazy_decay=True, clock=virtual_clock, notify_interval=0.05)
+    async with Client(mcp) as client:
+        async with listen(client.session, resource_subscriptions=["chill://status/agent-a"]) as subscription:
+            for _ in range(5):
+                await client.call_tool("take_a_break", {"agent_id": "agent-a"})
+            await client.call_tool("take_a_break", {"agent_id": "agent-b"})
+
+            event = await _next_event(subscription)
+            assert event.uri == "chill://status/agent-a"
+            with pytest.raises(asyncio.TimeoutError):
+                await _next_event(subscription, timeout=0.2)
+
+        # agent-a 한 번, agent-b 한 번 발행
+        assert mcp.notifier.published == 2
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_decay_is_notified(virtual_clock):
+    """스케줄러의 Boss Alert 자동 감소도 구독자에게 알리는지 검증"""
+    mcp = create_mcp_server(100, 10, clock=virtual_clock, notify_interval=0.01)
+    async with Client(mcp) as client:
+        async with listen(client.session, resource_subscriptions=["chill://status"]) as subscription:
+            # 휴식 알림을 받은 뒤 cooldown 경과
+            await client.call_tool("take_a_break")
+            await _next_event(subscription)
+            virtual_clock.advance(10)
+            assert mcp.scheduler.run_due() == 1
+
+            event = await _next_event(subscription)
+            assert event.uri == "chill://status"
+            status = json.loads((await client.read_resource("chill://status"))[0].text)
+            assert status["boss_alert_level"] == 0
+
+@pytest.mark.asyncio
+async def test_unchanged_levels_are_not_notified():
+    """버전만 바뀌고 레벨이 그대로인 변경은 알리지 않는지 검증"""
+    class FakeState:
+        session_id = "agent-a"
+
+    notifier = StatusNotifier(interval=0.01)
+    notifier.start()
+    state = FakeState()
+    for levels in [(0, 0), (0, 0), (0, 1)]:
+        notifier.listener(state, {"stress_level": levels[0], "boss_alert_level": levels[1]})
+        await asyncio.sleep(0.05)
+    notifier.stop()
+    assert notifier.published == 2
@@ -0,0 +1,84 @@
+import os
+import time
+from clock import VirtualClock
+from persistence import LOG_FILE, SNAPSHOT_FILE, StateJournal
+from state_store import StateStore
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "조건이 충족되지 않았습니다."
+        time.sleep(0.01)
+
+def _store(path, clock, **journal_options):
+    return StateStore(100, 300, clock=clock, journal=StateJournal(str(path), **journal_options))
+
+def test_state_survives_restart(tmp_path):
+    """정상 종료 후 재시작하면 세션 상태가 복구되는지 검증"""
+    clock = VirtualClock(start=1000)
+    store = _store(tmp_path, clock)
+    state = store.get("agent-a")
+    state.update_stress_level(30)
+    state.try_increase_boss_alert()
+    store.close()
+
+    restarted = _store(tmp_path, clock)
+    status = restarted.get("agent-a").get_current_status()
+    assert status['stress_level'] == 20
+    assert status['boss_alert_level'] == 1
+    assert status['last_stress_increase'] == 1000
+    assert restarted.get("agent-b").get_current_status()['stress_level'] == 50
+    restarted.close()
+
+def test_crash_recovery_replays_log(tmp_path):
+    """close() 없이 죽어도 fsync된 로그로 복구되고, 복구 후 경과 시간만큼 감소가 반영되는지 검증"""
+    clock = VirtualClock(start=1000)
+    store = _store(tmp_path, clock, flush_interval=0.01)
+    for _ in range(3):
+        store.get("agent-a").try_increase_boss_alert()
+    log_path = tmp_path / LOG_FILE
+    _wait_for(lambda: log_path.exists() and len(log_path.read_text().splitlines()) == 3)
+
+    # 비정상 종료로 잘린 마지막 줄은 무시되어야 함
+    with open(log_path, "a") as log:
+        log.write('["agent-a",[99,0,')
+
+    clock.advance(600)
+    restarted = _store(tmp_path, clock)
+    status = restarted.get("agent-a").get_current_status()
+    assert status['boss_alert_level'] == 1
+    assert status['stress_level'] == 60
+    restarted.close()
+
+def test_snapshot_compacts_log(tmp_path):
+    """레코드가 쌓이면 스냅샷으로 압축되고 로그가 비워지는지 검증"""
+    clock = VirtualClock(start=1000)
+    store = _store(tmp_path, clock, flush_interval=0.01, snapshot_records=50)
+    for i in range(200):
+        store.get(f"agent-{i % 20}").update_stress_level(1)
+    store.close()
+
+    assert os.path.exists(tmp_path / SNAPSHOT_FILE)
+    assert (tmp_path / LOG_FILE).read_text() == ""
+
+    journal = StateJournal(str(tmp_path))
+    assert journal.load() == 20
+    assert journal.latest("agent-0")['stress_level'] == 40
+
+def test_evicted_session_resumes_from_journal(tmp_path):
+    """용량 초과로 정리된 세션이 다시 쓰일 때 기록된 상태에서 이어가는지 검증"""
+    clock = VirtualClock(start=1000)
+    store = StateStore(100, 300, clock=clock, shards=1, max_sessions=1,
+                       journal=StateJournal(str(tmp_path)))
+    store.get("agent-a").update_stress_level(40)
+    store.get("agent-b")
+    assert "agent-a" not in store
+
+    status = store.get("agent-a").get_current_status()
+    assert status['stress_level'] == 10
+    store.get("agent-a").update_stress_level(5)
+    store.close()
+
+    journal = StateJournal(str(tmp_path))
+    journal.load()
+    assert journal.latest("agent-a")['stress_level'] == 5
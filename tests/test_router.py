@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from fastmcp.client import Client
+from router import IntentRouter, normalize
+from server import create_mcp_server
+
+DOCUMENTS = {
+    "take_a_break": "기본 휴식 도구",
+    "watch_netflix": "넷플릭스 시청 도구",
+    "coffee_mission": "커피 미션",
+    "check_status": "현재 상태 확인",
+}
+
+class FakeEncoder:
+    """문자 빈도 벡터를 돌려주는 테스트용 인코더 (호출 기록)"""
+
+    model_name = "fake/model"
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        np = pytest.importorskip("numpy")
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 256))
+        for row, text in enumerate(texts):
+            for char in normalize(text):
+                vectors[row, ord(char) % 256] += 1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+@pytest.mark.parametrize("text, tool", [
+    ("잠깐 쉬기", "take_a_break"),
+    ("넷플릭스 보고 싶다", "watch_netflix"),
+    ("커피 한잔 하러 가자", "coffee_mission"),
+    ("화장실 좀 다녀올게", "bathroom_break"),
+    ("지금 내 상태 어때?", "check_status"),
+])
+async def test_route_request_tool(text, tool):
+    """route_request 도구가 자연어를 알맞은 도구로 매핑하는지 검증 (n-gram 백엔드)"""
+    server = create_mcp_server(50, 300, lazy_decay=True, router_backend="ngram")
+    async with Client(server) as client:
+        response = await client.call_tool("route_request", {"text": text})
+    assert f"Routed Tool: {tool}" in response.content[0].text
+
+def test_unmatched_text_returns_none():
+    """어떤 도구와도 비슷하지 않으면 도구 이름이 None인지 검증"""
+    router = IntentRouter(DOCUMENTS, backend="ngram")
+    tool, score = router.route("xyz qwv")
+    assert tool is None
+    assert score < 0.15
+
+def test_index_is_built_lazily(tmp_path):
+    """첫 라우팅 전에는 모델(인코더)을 사용하지 않는지 검증"""
+    encoder = FakeEncoder()
+    router = IntentRouter(DOCUMENTS, backend="embedding", cache_dir=str(tmp_path), encoder=encoder)
+    assert encoder.calls == []
+    router.route("잠깐 쉬기")
+    assert len(encoder.calls) == 2  # 문서 색인 + 질의
+
+def test_embeddings_are_cached_by_docstring_hash(tmp_path):
+    """문서 임베딩이 디스크에 캐시되고, 바뀐 docstring만 다시 계산되는지 검증"""
+    encoder = FakeEncoder()
+    IntentRouter(DOCUMENTS, backend="embedding", cache_dir=str(tmp_path), encoder=encoder).route("휴식")
+    assert len(encoder.calls[0]) == len(DOCUMENTS)
+
+    encoder = FakeEncoder()
+    IntentRouter(DOCUMENTS, backend="embedding", cache_dir=str(tmp_path), encoder=encoder).route("휴식")
+    assert encoder.calls == [["휴식"]]
+
+    encoder = FakeEncoder()
+    changed = dict(DOCUMENTS, coffee_mission="커피를 가져오는 미션")
+    IntentRouter(changed, backend="embedding", cache_dir=str(tmp_path), encoder=encoder).route("휴식")
+    assert len(encoder.calls[0]) == 1
+    assert "커피를 가져오는 미션" in encoder.calls[0][0]
+
+def test_queries_are_batched_and_cached(tmp_path):
+    """캐시에 없는 문장만 한 배치로 인코딩하고, 반복 문장은 LRU 캐시에서 응답하는지 검증"""
+    encoder = FakeEncoder()
+    router = IntentRouter(DOCUMENTS, backend="embedding", cache_dir=None, cache_size=2, encoder=encoder)
+    router.route_many(["커피", "휴식", "커피!"])
+    assert encoder.calls[-1] == ["커피", "휴식"]
+
+    calls = len(encoder.calls)
+    router.route("  커피 ")
+    assert len(encoder.calls) == calls
+
+    # 용량을 넘으면 가장 오래 사용되지 않은 문장부터 제거
+    router.route("상태")
+    router.route("휴식")
+    assert encoder.calls[-1] == ["휴식"]
+
+async def test_concurrent_requests_share_one_batch():
+    """동시에 들어온 요청이 한 번의 인코딩으로 처리되는지 검증"""
+    encoder = FakeEncoder()
+    router = IntentRouter(DOCUMENTS, backend="embedding", cache_dir=None, encoder=encoder)
+    router.route("워밍업")
+    texts = ["커피", "넷플릭스", "휴식", "상태"]
+    results = await asyncio.gather(*(router.route_async(text) for text in texts))
+    assert encoder.calls[-1] == texts
+    assert [tool for tool, _ in results] == [router.route(text)[0] for text in texts]
+
+def test_auto_falls_back_to_ngram():
+    """임베딩 모델을 불러올 수 없으면 auto가 n-gram으로 대체되는지 검증"""
+    class BrokenEncoder:
+        model_name = "broken"
+
+        def encode(self, texts):
+            raise OSError("model not available")
+
+    router = IntentRouter(DOCUMENTS, backend="auto", cache_dir=None, encoder=BrokenEncoder())
+    assert router.route("커피 마시기")[0] == "coffee_mission"
+    assert router.backend == "ngram"
+
+    strict = IntentRouter(DOCUMENTS, backend="embedding", cache_dir=None, encoder=BrokenEncoder())
+    with pytest.raises(OSError):
+        strict.route("커피 마시기")
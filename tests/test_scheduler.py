@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+from fastmcp.client import Client
+from clock import VirtualClock
+from scheduler import DecayScheduler, default_scheduler
+from server import create_mcp_server
+from state_manager import ChillMCPState
+from state_store import StateStore
+
+def test_decay_fires_exactly_at_cooldown_boundary():
+    """스케줄러가 정확한 cooldown 경계에서 감소를 적용하고 리스너에 알리는지 검증"""
+    clock = VirtualClock(start=1000)
+    scheduler = DecayScheduler(clock)
+    state = ChillMCPState(100, 10, clock=clock, scheduler=scheduler)
+    notified = []
+    state.add_listener(lambda _, status: notified.append(status))
+
+    clock.advance(3)
+    state.try_increase_boss_alert()
+    state.try_increase_boss_alert()
+    notified.clear()
+
+    clock.advance(6.9)
+    assert scheduler.run_due() == 0
+
+    # 마지막 감소(시작 시각) + 10초에 정확히 실행
+    clock.advance(0.1)
+    assert scheduler.run_due() == 1
+    assert notified[-1]["boss_alert_level"] == 1
+    assert notified[-1]["last_boss_alert_decrease"] == 1010
+
+    # 이후 60초 동안 10초마다 한 번씩, 스트레스는 60초에 한 번
+    clock.advance(60)
+    scheduler.run_due()
+    status = state.get_current_status()
+    assert status["boss_alert_level"] == 0
+    assert status["last_boss_alert_decrease"] == 1020
+    assert status["stress_level"] == 51
+    assert status["last_stress_increase"] == 1060
+
+def test_break_postpones_stress_deadline():
+    """휴식으로 스트레스 마감 시각이 늦춰지면 이전 마감 시각에는 증가하지 않는지 검증"""
+    clock = VirtualClock(start=0)
+    scheduler = DecayScheduler(clock)
+    state = ChillMCPState(0, 300, clock=clock, scheduler=scheduler)
+
+    clock.advance(30)
+    state.update_stress_level(10)
+    clock.advance(30)
+    scheduler.run_due()
+    assert state.get_current_status()["stress_level"] == 40
+
+    clock.advance(30)
+    scheduler.run_due()
+    assert state.get_current_status()["stress_level"] == 41
+    assert len(scheduler) == 1
+
+def test_single_thread_for_many_states():
+    """상태 수와 무관하게 스케줄러 스레드 하나만 쓰고, 정리하면 등록이 취소되는지 검증"""
+    before = threading.active_count()
+    scheduler = DecayScheduler()
+    store = StateStore(50, 300, lazy_decay=False, scheduler=scheduler)
+    scheduler.start()
+    for i in range(1000):
+        store.get(f"agent-{i}")
+    assert threading.active_count() == before + 1
+    assert len(scheduler) == 1000
+
+    store.close()
+    scheduler.stop()
+    assert len(scheduler) == 0
+    assert threading.active_count() == before
+
+@pytest.mark.parametrize("clock", [None, VirtualClock(start=0)])
+def test_store_without_scheduler_keeps_thread_count_flat(clock):
+    """scheduler를 주지 않은 저장소도 세션 수와 무관하게 스케줄러 스레드를 최대 하나만 쓰는지 검증"""
+    default_scheduler()
+    before = threading.active_count()
+    store = StateStore(50, 300, lazy_decay=False, clock=clock)
+    for i in range(500):
+        store.get(f"agent-{i}")
+    assert threading.active_count() <= before + 1
+    assert len(store.scheduler) == 500
+
+    store.close()
+    assert threading.active_count() == before
+
+@pytest.mark.timeout(10)
+def test_scheduler_thread_wakes_at_deadline():
+    """스케줄러 스레드가 폴링 없이 마감 시각에 맞춰 깨어나는지 검증"""
+    scheduler = DecayScheduler()
+    scheduler.start()
+    try:
+        state = ChillMCPState(100, 300, scheduler=scheduler)
+        fired = threading.Event()
+        state.add_boss_listener(lambda state, old, new, cause: cause == "cooldown" and fired.set())
+        deadline = time.time() + 0.2
+        state.last_boss_alert_decrease = deadline - 300
+        state.try_increase_boss_alert()
+
+        assert fired.wait(5)
+        assert time.time() - deadline < 0.1
+        assert state.last_boss_alert_decrease == deadline
+        state.close()
+    finally:
+        scheduler.stop()
+
+@pytest.mark.asyncio
+async def test_server_lifespan_starts_and_stops_scheduler():
+    """lazy_decay가 아닌 서버는 lifespan 동안만 스케줄러 스레드를 실행하는지 검증"""
+    mcp = create_mcp_server(50, 300)
+    assert not mcp.scheduler.running
+    async with Client(mcp) as client:
+        await client.call_tool("take_a_break")
+        assert mcp.scheduler.running
+    assert not mcp.scheduler.running
+    assert len(mcp.scheduler) == 0
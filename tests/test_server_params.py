@@ -1,5 +1,4 @@
 import pytest
-import time
 from tests.test_utils import MCPTestClient, validate_response
 
 @pytest.mark.asyncio
@@ -22,7 +21,7 @@ async def test_boss_alertness_100(mcp_client_factory):
         assert status['boss'] == min(5, initial_boss_level + 1)
 
 @pytest.mark.asyncio
-async def test_boss_alertness_cooldown(mcp_client_factory):
+async def test_boss_alertness_cooldown(mcp_client_factory, virtual_clock):
     """--boss_alertness_cooldown 파라미터가 Boss Alert Level 감소 주기를 제어하는지 검증"""
     cooldown_seconds = 3
     client = await mcp_client_factory([
@@ -39,7 +38,7 @@ async def test_boss_alertness_cooldown(mcp_client_factory):
         initial_boss_level = status['boss']
 
         # 쿨다운 시간보다 길게 대기
-        time.sleep(cooldown_seconds + 1)
+        virtual_clock.advance(cooldown_seconds + 1)
 
         # 쿨다운 후 상태 확인
         final_response = await client.call_tool("check_status")
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import pytest
+from fastmcp.client import Client
+from bench.replay import main as replay_main, replay
+from clock import VirtualClock
+from server import create_mcp_server
+from session_trace import TraceRecorder, read_trace
+from state_store import StateStore, seeded_rng_factory
+
+async def _call(clock, client, tool, arguments):
+    """도구를 호출하고, Level 5 지연으로 잠들면 시계를 지연 시간만큼 옮겨 깨움"""
+    task = asyncio.ensure_future(client.call_tool(tool, arguments))
+    while not task.done():
+        if clock.pending_sleepers:
+            clock.advance(20)
+        await asyncio.sleep(0)
+    return task.result()
+
+async def _record(path):
+    """Level 5 지연, batch_breaks, cooldown 감소가 섞인 호출을 기록하고 (마지막 상태, 지연된 호출 수)를 반환"""
+    clock = VirtualClock(start=1000)
+    mcp = create_mcp_server(60, 10, lazy_decay=True, clock=clock, seed=2, trace_path=str(path))
+    results = []
+    async with Client(mcp) as client:
+        for step in range(12):
+            results.append(await _call(clock, client, "take_a_break", {"agent_id": "agent-a"}))
+            results.append(await _call(clock, client, "show_meme", {"agent_id": f"agent-{step % 3}"}))
+            clock.advance(3)
+        results.append(await _call(clock, client, "batch_breaks", {"breaks": [
+            {"tool": "coffee_mission", "agent_id": "agent-b"}, {"tool": "urgent_call", "agent_id": "agent-a"}]}))
+        await _call(clock, client, "check_status", {"agent_id": "agent-a"})
+
+        # agent-a를 Level 5로 만든 뒤 지연되는 호출까지
+        while mcp.state_store.get("agent-a").get_current_status()["boss_alert_level"] < 5:
+            results.append(await _call(clock, client, "deep_thinking", {"agent_id": "agent-a"}))
+        results.append(await _call(clock, client, "email_organizing", {"agent_id": "agent-a"}))
+
+        store = mcp.state_store
+        final_states = {session_id: [status["stress_level"], status["boss_alert_level"]]
+                        for session_id in ("agent-0", "agent-1", "agent-2", "agent-a", "agent-b")
+                        for status in [store.get(session_id).get_current_status()]}
+    penalized = sum(1 for result in results if result.structured_content["penalty_seconds"])
+    return final_states, penalized
+
+@pytest.mark.asyncio
+async def test_trace_records_applied_calls(tmp_path):
+    """휴식/배치/상태 확인 호출이 헤더와 함께 도착 시각 순으로 기록되는지 검증"""
+    path = tmp_path / "trace.jsonl"
+    await _record(path)
+
+    header, events = read_trace(str(path))
+    assert header["trace"] == 1
+    assert header["boss_alertness"] == 60
+    assert header["boss_alertness_cooldown"] == 10
+    assert events[0][:3] == [1000, "take_a_break", "agent-a"]
+    assert 10 <= events[0][3] <= 30 and events[0][4] in (0, 1)
+    batch = next(event for event in events if event[1] == "batch_breaks")
+    assert [item[:2] for item in batch[2]] == [["coffee_mission", "agent-b"], ["urgent_call", "agent-a"]]
+    assert any(event[1] == "check_status" for event in events)
+
+@pytest.mark.asyncio
+async def test_recorded_replay_reproduces_final_states(tmp_path):
+    """기록된 감소량/판정으로 재생하면 기록한 서버와 같은 최종 상태가 되는지 검증"""
+    path = tmp_path / "trace.jsonl"
+    recorded, penalized = await _record(path)
+
+    header, events = read_trace(str(path))
+    result = await replay(header, events, rng="recorded")
+    assert penalized >= 1
+    assert result["final_states"] == recorded
+    assert result["penalized"] == penalized
+
+@pytest.mark.asyncio
+async def test_seeded_replay_is_deterministic(tmp_path):
+    """같은 시드로 재생하면 최대 속도와 실제 시간 배속 재생 모두 같은 결과인지 검증"""
+    path = tmp_path / "trace.jsonl"
+    await _record(path)
+    header, events = read_trace(str(path))
+
+    fast = await replay(header, events, seed=5)
+    again = await replay(header, events, seed=5)
+    scaled = await replay(header, events, speed=1000, seed=5)
+    assert fast["outcome_digest"] == again["outcome_digest"] == scaled["outcome_digest"]
+    assert fast["final_states"] == scaled["final_states"]
+    assert (await replay(header, events, seed=6))["outcome_digest"] != fast["outcome_digest"]
+
+@pytest.mark.asyncio
+async def test_seeded_replay_defaults_to_header_seed(tmp_path):
+    """--seed 없이 재생하면 헤더에 기록된 서버 시드를 써서 같은 최종 상태가 되는지 검증"""
+    path = tmp_path / "trace.jsonl"
+    recorded, _ = await _record(path)
+    header, events = read_trace(str(path))
+
+    result = await replay(header, events)
+    assert result["seed"] == header["seed"] == 2
+    assert result["final_states"] == recorded
+
+def test_trace_is_written_before_close(tmp_path):
+    """close() 전에 프로세스가 죽어도 남도록 기록이 바로 파일에 쓰이는지 검증"""
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(str(path), config={"seed": 1})
+    recorder.record_status(1000, "agent-a")
+    header, events = read_trace(str(path))
+    recorder.close()
+    assert header["seed"] == 1
+    assert events == [[1000, "check_status", "agent-a"]]
+
+def test_seeded_sessions_do_not_depend_on_interleaving():
+    """세션별 시드 난수는 다른 세션의 호출 순서와 무관하게 같은 결과를 내는지 검증"""
+    clock = VirtualClock(start=1000)
+    first = StateStore(50, 300, clock=clock, rng_factory=seeded_rng_factory(1))
+    second = StateStore(50, 300, clock=clock, rng_factory=seeded_rng_factory(1))
+
+    for _ in range(5):
+        first.get("agent-a").apply_breaks([first.get("agent-a").rng.randint(10, 30)])
+    for _ in range(5):
+        second.get("agent-b").apply_breaks([second.get("agent-b").rng.randint(10, 30)])
+        second.get("agent-a").apply_breaks([second.get("agent-a").rng.randint(10, 30)])
+
+    assert first.get("agent-a").get_current_status() == second.get("agent-a").get_current_status()
+
+def test_replay_baseline_detects_changed_outcomes(tmp_path):
+    """재생 결과를 기준과 비교해 같으면 0, 상태 결과가 다르면 1로 종료하는지 검증"""
+    path = tmp_path / "trace.jsonl"
+    asyncio.run(_record(path))
+    output = tmp_path / "replay.json"
+    assert replay_main([str(path), "--output", str(output)]) == 0
+    assert replay_main([str(path), "--baseline", str(output), "--max_regression", "10000"]) == 0
+    assert replay_main([str(path), "--seed", "1", "--baseline", str(output), "--max_regression", "10000"]) == 1
+    assert json.loads(output.read_text())["events"] > 0
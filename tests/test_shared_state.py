@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import pytest
+from clock import VirtualClock
+from shared_state import SharedChillMCPState, SharedStateSegment
+from state_store import StateStore
+
+def _raise_boss_in_child(path, times):
+    """다른 프로세스에서 같은 세션의 보스 경계 레벨을 올림"""
+    segment = SharedStateSegment(path, slot_count=16)
+    state = SharedChillMCPState(segment, "agent-a", boss_alertness=100)
+    for _ in range(times):
+        state.try_increase_boss_alert()
+    segment.close()
+
+def _update_stress_in_child(path, calls):
+    segment = SharedStateSegment(path, slot_count=16)
+    state = SharedChillMCPState(segment, "agent-a", boss_alertness=0)
+    for _ in range(calls):
+        state.update_stress_level(-1)
+    segment.close()
+
+def _die_while_writing_in_child(path):
+    """슬롯 쓰기 락을 잡고 값을 쓴 채 비정상 종료"""
+    segment = SharedStateSegment(path, slot_count=16)
+    state = SharedChillMCPState(segment, "agent-a", boss_alertness=100)
+    state._lock.__enter__()
+    state.boss_alert_level = 2
+    os._exit(1)
+
+def test_processes_share_one_boss(tmp_path):
+    """다른 프로세스의 변경이 같은 세션 슬롯에서 그대로 보이는지 검증"""
+    path = str(tmp_path / "shared.bin")
+    state = SharedChillMCPState(SharedStateSegment(path, slot_count=16), "agent-a")
+
+    context = multiprocessing.get_context("spawn")
+    child = context.Process(target=_raise_boss_in_child, args=(path, 3))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+
+    status = state.get_current_status()
+    assert status['boss_alert_level'] == 3
+    assert status['version'] == 3
+    assert state.read_shared() == status
+
+def test_concurrent_processes_do_not_lose_updates(tmp_path):
+    """여러 프로세스가 같은 슬롯을 동시에 갱신해도 변경이 유실되지 않는지 검증"""
+    path = str(tmp_path / "shared.bin")
+    segment = SharedStateSegment(path, slot_count=16)
+    state = SharedChillMCPState(segment, "agent-a")
+    state.restore({"stress_level": 0, "boss_alert_level": 0, "last_stress_increase": state.clock.time(),
+                   "last_boss_alert_decrease": state.clock.time(), "version": 0})
+
+    context = multiprocessing.get_context("spawn")
+    children = [context.Process(target=_update_stress_in_child, args=(path, 25)) for _ in range(4)]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+
+    # 스트레스 증가(-(-1))는 100에서 멈추므로 100개 호출이 모두 반영되어야 정확히 100
+    status = state.read_shared()
+    assert status['stress_level'] == 100
+    assert status['version'] == 100
+
+def test_sessions_use_separate_slots(tmp_path):
+    """세션마다 다른 슬롯을 쓰고, 다시 열면 같은 슬롯을 찾는지 검증"""
+    path = str(tmp_path / "shared.bin")
+    clock = VirtualClock(start=1000)
+    segment = SharedStateSegment(path, slot_count=4)
+    states = [SharedChillMCPState(segment, f"agent-{i}", boss_alertness=100, clock=clock) for i in range(4)]
+    for count, state in enumerate(states):
+        for _ in range(count):
+            state.try_increase_boss_alert()
+
+    reopened = SharedStateSegment(path, slot_count=4)
+    for count in range(4):
+        state = SharedChillMCPState(reopened, f"agent-{count}", clock=clock)
+        assert state.get_current_status()['boss_alert_level'] == count
+
+    # 모든 슬롯이 찼으면 새 세션은 거부
+    with pytest.raises(RuntimeError):
+        SharedChillMCPState(reopened, "agent-4", clock=clock)
+
+def test_long_session_ids_are_hashed(tmp_path):
+    """슬롯 키 길이를 넘는 세션 ID도 구분되는지 검증"""
+    segment = SharedStateSegment(str(tmp_path / "shared.bin"), slot_count=8)
+    first = SharedChillMCPState(segment, "x" * 100 + "1", boss_alertness=100)
+    second = SharedChillMCPState(segment, "x" * 100 + "2", boss_alertness=100)
+    first.try_increase_boss_alert()
+    assert first.get_current_status()['boss_alert_level'] == 1
+    assert second.get_current_status()['boss_alert_level'] == 0
+
+def test_segment_layout_mismatch(tmp_path):
+    """슬롯 수가 다르거나 다른 파일이면 열지 않는지 검증"""
+    path = tmp_path / "shared.bin"
+    SharedStateSegment(str(path), slot_count=8).close()
+    with pytest.raises(ValueError):
+        SharedStateSegment(str(path), slot_count=16)
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a segment" * 10)
+    with pytest.raises(ValueError):
+        SharedStateSegment(str(other), slot_count=8)
+
+def test_lazy_decay_on_shared_state(tmp_path):
+    """공유 상태도 경과 시간만큼 감소/증가가 반영되는지 검증"""
+    clock = VirtualClock(start=1000)
+    store = StateStore(100, 10, clock=clock,
+                       shared_segment=SharedStateSegment(str(tmp_path / "shared.bin"), slot_count=8))
+    state = store.get("agent-a")
+    state.try_increase_boss_alert()
+    state.try_increase_boss_alert()
+
+    clock.advance(60)
+    status = store.get("agent-a").get_current_status()
+    assert status['boss_alert_level'] == 0
+    assert status['stress_level'] == 51
+    store.close()
+
+@pytest.mark.timeout(10)
+def test_reads_recover_after_writer_crash(tmp_path):
+    """쓰기 락을 잡은 채 죽은 프로세스가 홀수 시퀀스 번호를 남겨도 읽기와 쓰기가 멈추지 않는지 검증"""
+    path = str(tmp_path / "shared.bin")
+    segment = SharedStateSegment(path, slot_count=16)
+    state = SharedChillMCPState(segment, "agent-a", boss_alertness=100)
+
+    context = multiprocessing.get_context("spawn")
+    child = context.Process(target=_die_while_writing_in_child, args=(path,))
+    child.start()
+    child.join()
+    assert child.exitcode == 1
+
+    # 홀수로 남은 번호에서는 락을 잡고 읽음
+    assert state.get_current_status()['boss_alert_level'] == 2
+    state.try_increase_boss_alert()
+    offset = segment.slot_offset(state._slot)
+    assert segment.map[offset] % 2 == 0
+    assert state.read_shared()['boss_alert_level'] == 3
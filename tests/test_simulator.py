@@ -0,0 +1,52 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from clock import VirtualClock
+from simulator import parameter_grid, simulate
+from state_manager import ChillMCPState
+
+def _reference_run(cooldown, duration, call_interval, penalty_seconds=20):
+    """ChillMCPState와 가상 시계로 1초 단위로 진행한 boss_alertness=100 세션"""
+    clock = VirtualClock(start=0)
+    state = ChillMCPState(100, cooldown, lazy_decay=True, clock=clock)
+    next_call, executes_at = call_interval, None
+    time_at_level_5, penalties, calls = 0, 0, 0
+    for second in range(duration):
+        if second == next_call:
+            calls += 1
+            penalized = state.get_current_status()['boss_alert_level'] == 5
+            penalties += penalized
+            executes_at = second + penalty_seconds * penalized
+            next_call = None
+        if second == executes_at:
+            state.update_stress_level(10)
+            state.try_increase_boss_alert()
+            next_call, executes_at = second + call_interval, None
+        time_at_level_5 += state.get_current_status()['boss_alert_level'] == 5
+        clock.advance(1)
+    return time_at_level_5 / duration, penalties, calls
+
+@pytest.mark.parametrize("cooldown", [45, 200, 10**6])
+def test_simulator_matches_state_rules(cooldown):
+    """boss_alertness=100에서 시뮬레이터의 Level 5 체류 시간과 지연 횟수가 ChillMCPState와 같은지 검증"""
+    duration, call_interval = 3600, 30
+    expected_ratio, expected_penalties, expected_calls = _reference_run(cooldown, duration, call_interval)
+
+    result = simulate(100, cooldown, sessions=3, duration=duration,
+                      call_interval=call_interval, think_time="fixed")
+    assert result["calls"] == expected_calls
+    assert result["time_at_level_5"]["mean"] == pytest.approx(expected_ratio)
+    assert result["penalty_latency"]["mean"] == pytest.approx(20 * expected_penalties / expected_calls)
+
+def test_simulator_grid_shape_and_bounds():
+    """파라미터 격자 모양대로 결과가 나오고 alertness=0이면 지연이 없는지 검증"""
+    alertness, cooldown = parameter_grid((0, 100), 5, (10, 600), 4)
+    result = simulate(alertness, cooldown, sessions=20, duration=1800, seed=1)
+
+    assert result["mean_stress"].shape == (5, 4)
+    assert np.all((result["mean_stress"] >= 0) & (result["mean_stress"] <= 100))
+    assert np.all(result["time_at_level_5"]["mean"][0] == 0)
+    assert np.all(result["penalty_latency"]["mean"][0] == 0)
+    # 경계가 높고 cooldown이 길수록 Level 5에 더 오래 머묾
+    assert result["time_at_level_5"]["mean"][-1, -1] > result["time_at_level_5"]["mean"][1, 0]
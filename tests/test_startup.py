@@ -0,0 +1,86 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+from startup_profile import StartupProfiler
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 첫 initialize 응답까지의 시간 한도 (초). 느린 CI에서는 환경 변수로 늘릴 수 있음
+STARTUP_BUDGET = float(os.environ.get("CHILLMCP_STARTUP_BUDGET", "3.0"))
+
+def _python(*args, **kwargs):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=30, **kwargs)
+
+def _loaded_modules(code):
+    """새 인터프리터에서 code를 실행한 뒤 import된 모듈 이름 집합"""
+    result = _python("-c", code + "\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))")
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+def test_invalid_params_exit_before_importing_fastmcp():
+    """파라미터 검증 오류는 fastmcp를 불러오기 전에 종료하는지 검증"""
+    modules = _loaded_modules(
+        "import sys, main\n"
+        "sys.argv = ['main.py', '--boss_alertness', '200']\n"
+        "try:\n    main.main()\nexcept SystemExit:\n    pass"
+    )
+    assert "main" in modules
+    assert not {"fastmcp", "mcp", "server", "tools"} & modules
+
+def test_stdio_server_does_not_import_optional_features():
+    """stdio 서버 생성까지 모델 라이브러리와 영속화/공유 상태 모듈을 불러오지 않는지 검증"""
+    modules = _loaded_modules("from server import create_mcp_server\ncreate_mcp_server(50, 300)")
+    assert not {"torch", "transformers", "sentence_transformers", "numpy", "persistence", "shared_state"} & modules
+
+def test_simulator_does_not_import_fastmcp():
+    """NumPy만 쓰는 시뮬레이터가 규칙 상수를 읽으려고 서버/도구 모듈을 불러오지 않는지 검증"""
+    modules = _loaded_modules("import simulator")
+    assert not {"fastmcp", "pydantic", "tools", "router"} & modules
+
+@pytest.mark.timeout(30)
+def test_profile_startup_reports_phases_and_modules():
+    """--profile-startup이 단계별/모듈별 시간을 stderr에 보고하고 stdout은 비워 두는지 검증"""
+    result = _python("main.py", "--profile-startup")
+    assert result.returncode == 0
+    assert result.stdout == ""
+    assert "import server" in result.stderr
+    assert "create_mcp_server" in result.stderr
+    assert "fastmcp" in result.stderr
+
+def test_profiler_attributes_imports_to_phase():
+    """StartupProfiler가 새로 import된 모듈을 현재 단계로 분류하는지 검증"""
+    sys.modules.pop("colorsys", None)
+    profiler = StartupProfiler().start()
+    try:
+        with profiler.phase("load"):
+            importlib.import_module("colorsys")
+    finally:
+        profiler.stop()
+    assert [(name, phase) for name, _, _, phase in profiler.modules] == [("colorsys", "load")]
+    assert profiler.phases[0][0] == "load"
+    assert "colorsys" in profiler.report()
+
+@pytest.mark.timeout(30)
+def test_first_initialize_response_within_budget():
+    """stdio로 띄운 서버가 시간 한도 안에 첫 initialize 요청에 응답하는지 검증"""
+    request = {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+               "params": {"protocolVersion": "2025-11-25", "capabilities": {},
+                          "clientInfo": {"name": "startup-test", "version": "1.0"}}}
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        process.stdin.write((json.dumps(request) + "\n").encode())
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    assert response["id"] == 1
+    assert "result" in response
+    assert elapsed < STARTUP_BUDGET, f"첫 initialize 응답까지 {elapsed:.2f}초 (한도 {STARTUP_BUDGET}초)"
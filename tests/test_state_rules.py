@@ -1,43 +1,69 @@
+import asyncio
 import pytest
+import threading
 import time
+from clock import VirtualClock
+from scheduler import DecayScheduler
+from state_manager import ChillMCPState
 from tests.test_utils import MCPTestClient, validate_response
 
+# 클라이언트 수준 규칙 테스트는 스케줄러(기본)와 lazy_decay 모드 모두에서 실행
+decay_modes = pytest.mark.parametrize("decay_args", [[], ["--lazy_decay"]], ids=["scheduler", "lazy"])
+
 @pytest.mark.asyncio
-@pytest.mark.timeout(70)
-async def test_stress_auto_increase(mcp_client):
+@decay_modes
+async def test_stress_auto_increase(mcp_client_factory, virtual_clock, decay_args):
     """60초 경과 후 Stress Level이 자동으로 1 증가하는지 검증"""
-    response = await mcp_client.call_tool("check_status")
-    is_valid, initial_status = validate_response(response.content[0].text)
-    assert is_valid, initial_status
-    initial_stress_level = initial_status['stress']
+    async with await mcp_client_factory(decay_args) as mcp_client:
+        response = await mcp_client.call_tool("check_status")
+        is_valid, initial_status = validate_response(response.content[0].text)
+        assert is_valid, initial_status
+        initial_stress_level = initial_status['stress']
+
+        virtual_clock.advance(59)
+        response = await mcp_client.call_tool("check_status")
+        is_valid, status = validate_response(response.content[0].text)
+        assert is_valid, status
+        assert status['stress'] == initial_stress_level
 
-    time.sleep(61)
+        virtual_clock.advance(2)
 
-    final_response = await mcp_client.call_tool("check_status")
-    is_valid, final_status = validate_response(final_response.content[0].text)
-    assert is_valid, final_status
+        final_response = await mcp_client.call_tool("check_status")
+        is_valid, final_status = validate_response(final_response.content[0].text)
+        assert is_valid, final_status
 
-    assert final_status['stress'] >= initial_stress_level + 1
+        assert final_status['stress'] == initial_stress_level + 1
+
+async def _reach_boss_level_5(client):
+    level = 0
+    for _ in range(5):
+        response = await client.call_tool("take_a_break")
+        is_valid, status = validate_response(response.content[0].text)
+        assert is_valid, status
+        level = status['boss']
+        if level == 5:
+            break
+    assert level == 5, "Boss Alert Level을 5로 만들지 못했습니다."
 
 @pytest.mark.asyncio
-async def test_boss_alert_level_5_delay(mcp_client_factory):
+@decay_modes
+async def test_boss_alert_level_5_delay(mcp_client_factory, virtual_clock, decay_args):
     """Boss Alert Level 5일 때 20초 지연이 발생하는지 검증"""
-    client = await mcp_client_factory(["--boss_alertness", "100"])
+    client = await mcp_client_factory(["--boss_alertness", "100", *decay_args])
     async with client:
-        level = 0
-        for _ in range(5):
-            response = await client.call_tool("take_a_break")
-            is_valid, status = validate_response(response.content[0].text)
-            assert is_valid, status
-            level = status['boss']
-            if level == 5:
-                break
-        assert level == 5, "Boss Alert Level을 5로 만들지 못했습니다."
+        await _reach_boss_level_5(client)
+
+        start_time = virtual_clock.time()
+        call = asyncio.ensure_future(client.call_tool("take_a_break"))
+        await virtual_clock.wait_for_sleepers(1)
 
-        start_time = time.time()
-        await client.call_tool("take_a_break")
-        end_time = time.time()
-        elapsed = end_time - start_time
+        virtual_clock.advance(19.9)
+        await asyncio.sleep(0.01)
+        assert not call.done()
+
+        virtual_clock.advance(0.1)
+        await call
+        elapsed = virtual_clock.time() - start_time
 
         assert elapsed >= 20
 
@@ -55,3 +81,159 @@ async def test_normal_response_time(mcp_client):
     elapsed = end_time - start_time
 
     assert elapsed < 2
+
+@pytest.mark.asyncio
+@decay_modes
+async def test_boss_alert_level_5_delay_does_not_block_other_calls(mcp_client_factory, virtual_clock, decay_args):
+    """Boss Alert Level 5 지연 중에도 동시 호출들이 직렬화되지 않는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100", *decay_args])
+    async with client:
+        await _reach_boss_level_5(client)
+
+        concurrent_calls = 5
+        start_time = virtual_clock.time()
+        calls = asyncio.gather(
+            *(client.call_tool("take_a_break") for _ in range(concurrent_calls))
+        )
+        await virtual_clock.wait_for_sleepers(concurrent_calls)
+
+        # 지연 중에도 check_status는 즉시 응답해야 함
+        real_start = time.time()
+        await client.call_tool("check_status")
+        assert time.time() - real_start < 2
+
+        virtual_clock.advance(20)
+        responses = await calls
+        elapsed = virtual_clock.time() - start_time
+
+        for response in responses:
+            is_valid, status = validate_response(response.content[0].text)
+            assert is_valid, status
+
+        # N개의 호출이 N×20초가 아니라 20초 만에 모두 끝나야 함
+        assert elapsed == 20
+
+@pytest.mark.asyncio
+@decay_modes
+async def test_boss_cooldown_after_idle(mcp_client_factory, virtual_clock, decay_args):
+    """오래 쉰 뒤의 휴식들로 오른 Boss Alert Level이 곧바로 취소되지 않고 cooldown마다 1씩 내려가는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100", "--boss_alertness_cooldown", "10", *decay_args])
+    async with client:
+        await client.call_tool("check_status")
+        virtual_clock.advance(100)
+        for _ in range(5):
+            response = await client.call_tool("take_a_break")
+        is_valid, status = validate_response(response.content[0].text)
+        assert is_valid, status
+        assert status['boss'] >= 4
+
+        level = status['boss']
+        virtual_clock.advance(10)
+        response = await client.call_tool("check_status")
+        assert validate_response(response.content[0].text)[1]['boss'] == level - 1
+
+def test_lazy_decay_starts_no_threads():
+    """lazy_decay 모드에서는 백그라운드 스레드가 생성되지 않는지 검증"""
+    before = threading.active_count()
+    states = [ChillMCPState(50, 300, lazy_decay=True) for _ in range(100)]
+    assert threading.active_count() == before
+    assert all(state.get_current_status()['stress_level'] == 50 for state in states)
+
+def test_lazy_decay_stress_increase():
+    """lazy_decay 모드에서 60초마다 Stress Level이 1씩 증가하는지 검증"""
+    state = ChillMCPState(50, 300, lazy_decay=True)
+    start = state.last_stress_increase
+    state.restore({**state.get_current_status(), "last_stress_increase": start - 59})
+    assert state.get_current_status()['stress_level'] == 50
+
+    state.restore({**state.get_current_status(), "last_stress_increase": start - 150})
+    status = state.get_current_status()
+    assert status['stress_level'] == 52
+    # 남은 30초는 다음 증가를 위해 보존되어야 함
+    assert status['last_stress_increase'] == start - 30
+
+    state.restore({**state.get_current_status(), "last_stress_increase": time.time() - 60 * 1000})
+    assert state.get_current_status()['stress_level'] == 100
+
+def test_lazy_decay_boss_alert_cooldown():
+    """lazy_decay 모드에서 cooldown마다 Boss Alert Level이 1씩 감소하는지 검증"""
+    state = ChillMCPState(100, 10, lazy_decay=True)
+    for _ in range(5):
+        state.try_increase_boss_alert()
+    assert state.get_current_status()['boss_alert_level'] == 5
+
+    start = state.last_boss_alert_decrease
+    state.restore({**state.get_current_status(), "last_boss_alert_decrease": start - 25})
+    status = state.get_current_status()
+    assert status['boss_alert_level'] == 3
+    assert status['last_boss_alert_decrease'] == start - 5
+
+    # 0에 도달하면 더 감소하지 않고 마지막 감소 시각도 유지됨
+    state.restore({**state.get_current_status(), "last_boss_alert_decrease": start - 1000})
+    status = state.get_current_status()
+    assert status['boss_alert_level'] == 0
+    assert status['last_boss_alert_decrease'] == start - 1000 + 30
+
+@pytest.mark.parametrize("lazy_decay", [True, False])
+def test_idle_cooldowns_are_not_banked(lazy_decay):
+    """레벨 0에서 지난 cooldown은 쌓이지 않아, 오래 쉰 뒤의 상승이 곧바로 취소되지 않는지 검증"""
+    clock = VirtualClock(start=1000)
+    scheduler = DecayScheduler(clock)
+    state = ChillMCPState(100, 10, lazy_decay=lazy_decay, clock=clock, scheduler=scheduler)
+    clock.advance(100)
+    scheduler.run_due()
+
+    state.try_increase_boss_alert()
+    for _ in range(4):
+        state.apply_breaks([1])
+        scheduler.run_due()
+    # 기존 1초 폴링 스레드처럼 밀린 감소는 한 번뿐
+    assert state.get_current_status()['boss_alert_level'] == 4
+
+    clock.advance(10)
+    scheduler.run_due()
+    assert state.get_current_status()['boss_alert_level'] == 3
+
+@pytest.mark.timeout(10)
+def test_status_reads_do_not_take_lock():
+    """밀린 증가/감소가 없으면 쓰기가 락을 잡고 있어도 읽기가 기다리지 않는지 검증"""
+    clock = VirtualClock(start=1000)
+    state = ChillMCPState(50, 300, lazy_decay=True, clock=clock)
+    state.update_stress_level(10)
+    with state._lock:
+        assert state.get_current_status()['stress_level'] == 40
+        assert state.snapshot().version == 1
+
+    # 반영할 증가가 있으면 락을 잡고 반영한 새 스냅숏을 반환
+    clock.advance(60)
+    snapshot = state.snapshot()
+    assert (snapshot.stress_level, snapshot.version) == (41, 2)
+    assert state.snapshot() is snapshot
+
+def test_snapshot_reads_are_consistent_during_writes():
+    """쓰기가 계속되는 동안 락 없이 읽은 스냅숏의 필드들이 항상 같은 쓰기의 값인지 검증"""
+    state = ChillMCPState(50, 300, lazy_decay=True, clock=VirtualClock(start=0))
+    done = threading.Event()
+
+    def writer():
+        for version in range(1, 20001):
+            state.restore({"stress_level": version % 101, "boss_alert_level": version % 6,
+                           "last_stress_increase": version, "last_boss_alert_decrease": 2 * version,
+                           "version": version})
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    reads = 0
+    while not done.is_set():
+        snapshot = state.snapshot()
+        version = snapshot.version
+        if version:
+            assert snapshot.stress_level == version % 101
+            assert snapshot.boss_alert_level == version % 6
+            assert snapshot.last_stress_increase == version
+            assert snapshot.last_boss_alert_decrease == 2 * version
+        reads += 1
+    thread.join()
+    assert reads > 0
+    assert state.snapshot().version == 20000
@@ -0,0 +1,67 @@
+import pytest
+import threading
+from state_store import StateStore
+from tests.test_utils import validate_response
+
+def test_sessions_are_isolated():
+    """세션마다 별도의 상태를 가지는지 검증"""
+    store = StateStore(100, 300)
+    store.get("agent-a").update_stress_level(30)
+    assert store.get("agent-a").get_current_status()['stress_level'] == 20
+    assert store.get("agent-b").get_current_status()['stress_level'] == 50
+    assert store.get("agent-a") is store.get("agent-a")
+    assert len(store) == 2
+
+def test_lru_cap_evicts_oldest_session():
+    """max_sessions를 넘으면 가장 오래 사용되지 않은 세션이 정리되는지 검증"""
+    store = StateStore(50, 300, shards=1, max_sessions=3)
+    for session_id in ("a", "b", "c"):
+        store.get(session_id)
+    store.get("a")
+    store.get("d")
+    assert len(store) == 3
+    assert "b" not in store
+    assert "a" in store and "c" in store and "d" in store
+
+def test_idle_ttl_eviction():
+    """idle_ttl 동안 사용되지 않은 세션이 정리되는지 검증"""
+    store = StateStore(50, 300, idle_ttl=0)
+    for i in range(10):
+        store.get(f"agent-{i}")
+    assert store.evict_idle() > 0
+    assert len(store) == 0
+
+def test_eviction_stops_state_threads():
+    """lazy_decay가 아닌 상태는 정리될 때 스케줄러 등록이 취소되는지 검증"""
+    store = StateStore(50, 300, lazy_decay=False, shards=1, max_sessions=1)
+    first = store.get("a")
+    store.get("b")
+    assert first._closed.is_set()
+    assert first._decay_entry is None
+    store.close()
+    assert len(store) == 0
+
+def test_many_sessions_do_not_start_threads():
+    """lazy_decay 저장소는 세션 수와 무관하게 스레드를 만들지 않는지 검증"""
+    before = threading.active_count()
+    store = StateStore(50, 300)
+    for i in range(20_000):
+        store.get(f"agent-{i}")
+    assert len(store) == 20_000
+    assert threading.active_count() == before
+
+@pytest.mark.asyncio
+async def test_agent_id_selects_separate_state(mcp_client_factory):
+    """agent_id 인자로 같은 연결 안에서도 에이전트별 상태를 분리하는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100"])
+    async with client:
+        response = await client.call_tool("take_a_break", {"agent_id": "agent-a"})
+        is_valid, status_a = validate_response(response.content[0].text)
+        assert is_valid, status_a
+        assert status_a['boss'] == 1
+
+        response = await client.call_tool("check_status", {"agent_id": "agent-b"})
+        is_valid, status_b = validate_response(response.content[0].text)
+        assert is_valid, status_b
+        assert status_b['boss'] == 0
+        assert status_b['stress'] == 50
@@ -15,4 +15,38 @@ async def test_all_tools_response_format(mcp_client, tool_name):
     assert response.content and isinstance(response.content, list) and len(response.content) > 0
     
     is_valid, result = validate_response(response.content[0].text)
-    assert is_valid, f"{tool_name} 도구의 응답 형식이 올바르지 않습니다: {result}"
\ No newline at end of file
+    assert is_valid, f"{tool_name} 도구의 응답 형식이 올바르지 않습니다: {result}"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tool_name", ALL_TOOLS)
+async def test_structured_content_matches_text(mcp_client, tool_name):
+    """구조화된 결과가 텍스트 응답과 같은 값을 담는지 검증"""
+    response = await mcp_client.call_tool(tool_name)
+    is_valid, result = validate_response(response.content[0].text)
+    assert is_valid, result
+
+    structured = response.structured_content
+    assert structured["summary"] == result["summary"]
+    assert structured["stress_level"] == result["stress"]
+    assert structured["boss_alert_level"] == result["boss"]
+    assert structured["session_id"] == "default"
+
+@pytest.mark.asyncio
+async def test_break_result_deltas(mcp_client_factory, virtual_clock):
+    """휴식 결과의 변화량, 지연, 시각이 실제 상태 변화와 일치하는지 검증"""
+    client = await mcp_client_factory(["--boss_alertness", "100"])
+    async with client:
+        first = (await client.call_tool("take_a_break")).structured_content
+        assert first["tool"] == "take_a_break"
+        assert first["stress_delta"] == first["stress_level"] - 50
+        assert first["boss_alert_delta"] == 1
+        assert first["penalty_seconds"] == 0
+        assert first["timestamp"] == virtual_clock.time()
+
+        second = (await client.call_tool("show_meme")).structured_content
+        assert second["stress_delta"] == second["stress_level"] - first["stress_level"]
+        assert second["boss_alert_level"] == 2
+
+        tools = {tool.name: tool for tool in await client.list_tools()}
+        assert "stress_delta" in tools["take_a_break"].output_schema["properties"]
+        assert "last_stress_increase" in tools["check_status"].output_schema["properties"]
@@ -1,95 +1,344 @@
-import random
+import functools
+import inspect
 import time
 import logging
-from functools import wraps
+from typing import Literal
+
+from fastmcp.server.dependencies import get_http_request
+from fastmcp.tools import ToolResult
+from pydantic import BaseModel
+
+from admission import AdmissionController
+from metrics import Metrics
+from router import DEFAULT_CACHE_DIR, IntentRouter
+from state_manager import BOSS_PENALTY_SECONDS, MAX_BOSS_ALERT_LEVEL, STRESS_REDUCTION_RANGES
+from state_store import DEFAULT_SESSION_ID
 
 logger = logging.getLogger(__name__)
 
-def register_tools(mcp, state):
-    """MCP 서버에 모든 도구를 등록하는 함수"""
+# 도구별 응답 메시지와 Break Summary
+BREAK_MESSAGES = {
+    "take_a_break": ("😴 기본 휴식 완료! 에너지 충전 중...", "Basic break and relaxation"),
+    "watch_netflix": ("📺 넷플릭스 시청으로 힐링 완료! 드라마의 세계에 빠져들었어요...", "Netflix binge watching session"),
+    "show_meme": ("😂 밈 보면서 스트레스 날려버리기! 짤줍 성공!", "Meme therapy session"),
+    "bathroom_break": ("🛁 화장실 타임! 휴대폰으로 힐링 중... 📱", "Bathroom break with phone browsing"),
+    "coffee_mission": ("☕️ 커피 타러 간다며 사무실 한 바퀴... 미션 성공!", "Coffee break mission"),
+    "urgent_call": ("📞 급한 전화 받는 척, 밖으로 나가서 자유 만끽!", "Urgent call break"),
+    "deep_thinking": ("🤔 심오한 생각에 잠긴 척... 사실은 멍 때리는 중!", "Deep thinking session"),
+    "email_organizing": ("📧 이메일 정리한다며 온라인 쇼핑... (비밀)", "Email organizing session"),
+}
+
+STATUS_SUMMARY = "Status check only, no changes made"
+
+# check_status 응답 텍스트 (Stress/Boss 레벨을 두 번 싣는 기존 형식 유지)
+STATUS_TEMPLATE = (
+    "📊 현재 상태 확인 (변경 없음)\n\n"
+    "Stress Level: {stress_level}\nBoss Alert Level: {boss_alert_level}\n\n"
+    "⏱️ 마지막 스트레스 증가 이후: {seconds_since_stress_increase}초 경과 (60초마다 +1)\n"
+    "⏱️ 마지막 Boss Alert 감소 이후: {seconds_since_boss_alert_decrease}초 경과 ({boss_alertness_cooldown}초마다 -1)\n\n"
+    "Break Summary: " + STATUS_SUMMARY + "\n"
+    "Stress Level: {stress_level}\nBoss Alert Level: {boss_alert_level}"
+).format
+
+# batch_breaks 한 번에 처리할 수 있는 최대 휴식 수
+MAX_BATCH_SIZE = 1000
+
+class BreakRequest(BaseModel):
+    """batch_breaks의 항목: 적용할 휴식 도구와 대상 에이전트"""
+    tool: str
+    agent_id: str | None = None
+
+class BreakResult(BaseModel):
+    """휴식 도구의 구조화된 결과 (텍스트 응답과 같은 내용)"""
+    tool: str
+    session_id: str
+    summary: str
+    stress_level: int
+    boss_alert_level: int
+    stress_delta: int
+    boss_alert_delta: int
+    penalty_seconds: float
+    timestamp: float
+
+class StatusResult(BaseModel):
+    """check_status의 구조화된 결과"""
+    session_id: str
+    summary: str
+    stress_level: int
+    boss_alert_level: int
+    last_stress_increase: float
+    last_boss_alert_decrease: float
+    boss_alertness_cooldown: int
+    timestamp: float
+
+def compile_break_template(message: str, summary: str):
+    """휴식 도구 응답 텍스트 템플릿을 미리 만들어 status 키워드로 채우는 함수를 반환"""
+    header = f"{message}\n\nBreak Summary: {summary}".replace("{", "{{").replace("}", "}}")
+    return (header + "\n\nStress Level: {stress_level}\nBoss Alert Level: {boss_alert_level}").format
+
+def resolve_session_id(agent_id: str | None = None) -> str:
+    """상태를 구분할 세션 키 결정
+
+    agent_id가 주어지면 그대로 사용하고, stdio처럼 클라이언트가 하나뿐인 전송이면
+    기본 세션을 사용합니다. http/sse 전송은 호출마다 같은 클라이언트임을 알려 주는
+    값이 없어 (mcp-session-id 헤더도 보내지 않음) 모든 클라이언트가 기본 세션 하나를
+    나눠 쓰게 되므로, agent_id 없는 호출을 거절합니다 (워커 수와 상관없이).
+    """
+    if agent_id:
+        return agent_id
+    try:
+        get_http_request()
+    except RuntimeError:
+        return DEFAULT_SESSION_ID
+    raise ValueError("http/sse 전송에서는 클라이언트를 구분할 수 없으므로 agent_id가 필요합니다.")
+
+def register_tools(mcp, store, boss_penalty_seconds: float = BOSS_PENALTY_SECONDS,
+                   router_backend: str = "auto", router_cache_dir: str | None = DEFAULT_CACHE_DIR,
+                   metrics: Metrics | None = None, admission: AdmissionController | None = None,
+                   trace=None):
+    """MCP 서버에 모든 도구를 등록하는 함수
+
+    admission을 주면 휴식 도구와 batch_breaks는 실행 전에 허용 제어를 거칩니다.
+    trace(session_trace.TraceRecorder)를 주면 상태에 적용된 호출을 도착 시각과
+    함께 기록합니다. 스트레스 감소량은 세션 상태의 rng로 뽑습니다.
+    """
+
+    metrics = metrics or Metrics()
+    admission = admission or AdmissionController()
+
+    def timed(func):
+        """도구 실행 시간을 metrics의 도구별 히스토그램에 기록 (시그니처는 func 그대로)"""
+        name = func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    metrics.observe_tool(name, time.perf_counter() - start)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    metrics.observe_tool(name, time.perf_counter() - start)
+        return wrapper
+
+    # route_request가 고를 수 있는 도구의 {이름: docstring}
+    routable_tools = {}
+    # batch_breaks에서 쓰는 {이름: (rng를 받아 스트레스 감소량을 반환하는 휴식 함수, 메시지 + Break Summary)}
+    break_tools = {}
+    # 휴식 도구는 텍스트와 함께 BreakResult 형식의 구조화된 결과를 반환
+    break_tool = mcp.tool(output_schema=BreakResult.model_json_schema())
 
     def tool_wrapper(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            logger.info(f"🛠️  {func.__name__} 도구 호출")
+        name = func.__name__
+        message, summary = BREAK_MESSAGES[name]
+        render = compile_break_template(message, summary)
+        routable_tools[name] = func.__doc__
+        break_tools[name] = (func, f"{message}\n\nBreak Summary: {summary}")
 
-            if state.boss_alert_level == 5:
-                logger.warning("⚠️ 보스 경계 레벨 5! 20초 지연 발생")
-                time.sleep(20)
+        async def wrapper(agent_id: str | None = None) -> ToolResult:
+            logger.info("🛠️  %s 도구 호출", name)
+            session_id = resolve_session_id(agent_id)
+            arrived = store.clock.time()
 
-            summary, stress_reduction = func()
+            # Level 5 지연으로 잠든 호출도 동시 실행 수에 포함되도록 지연까지 감쌈
+            async with admission.admit(session_id):
+                state = store.get(session_id)
+                penalty_seconds = 0
+                if state.snapshot().boss_alert_level == MAX_BOSS_ALERT_LEVEL:
+                    # 이벤트 루프를 막지 않도록 비동기로 대기 (취소 가능, 시계 주입 가능)
+                    logger.warning("⚠️ 보스 경계 레벨 5! %s초 지연 발생", boss_penalty_seconds)
+                    metrics.record_penalty(boss_penalty_seconds)
+                    await store.clock.sleep(boss_penalty_seconds)
+                    penalty_seconds = boss_penalty_seconds
 
-            if stress_reduction > 0:
-                state.update_stress_level(stress_reduction)
-                state.try_increase_boss_alert()
+                # 스트레스 감소와 보스 경계 상승을 락 한 번으로 적용
+                reduction = func(state.rng)
+                result = state.apply_breaks([reduction])[0]
+                if trace is not None:
+                    trace.record_break(arrived, session_id, name, reduction, result["boss_raised"])
+            return ToolResult(content=render(**result), structured_content={
+                "tool": name,
+                "session_id": session_id,
+                "summary": summary,
+                "stress_level": result["stress_level"],
+                "boss_alert_level": result["boss_alert_level"],
+                "stress_delta": result["stress_level"] - result["stress_level_before"],
+                "boss_alert_delta": result["boss_alert_level"] - result["boss_alert_level_before"],
+                "penalty_seconds": penalty_seconds,
+                "timestamp": store.clock.time(),
+            })
 
-            status = state.get_current_status()
-            return f"{summary}\n\nStress Level: {status['stress_level']}\nBoss Alert Level: {status['boss_alert_level']}"
+        # 도구 스키마에 agent_id가 노출되도록 func의 시그니처는 복사하지 않음
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
         return wrapper
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def take_a_break():
+    def take_a_break(rng):
         """기본 휴식 도구
          기본 휴식 - 피곤할 때, 스트레스가 많을 때"""
-        return "😴 기본 휴식 완료! 에너지 충전 중...\n\nBreak Summary: Basic break and relaxation", random.randint(10, 30)
+        return rng.randint(*STRESS_REDUCTION_RANGES["take_a_break"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def watch_netflix():
+    def watch_netflix(rng):
         """기본 휴식 도구
         넷플릭스 시청 도구 - 드라마나 영화를 보고 싶을 때"""
-        return "📺 넷플릭스 시청으로 힐링 완료! 드라마의 세계에 빠져들었어요...\n\nBreak Summary: Netflix binge watching session", random.randint(20, 40)
+        return rng.randint(*STRESS_REDUCTION_RANGES["watch_netflix"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def show_meme():
+    def show_meme(rng):
         """기본 휴식 도구
         밈 감상 도구 - 웃고 싶을 때, 재미있는 것을 보고 싶을 때"""
-        return "😂 밈 보면서 스트레스 날려버리기! 짤줍 성공!\n\nBreak Summary: Meme therapy session", random.randint(5, 20)
+        return rng.randint(*STRESS_REDUCTION_RANGES["show_meme"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def bathroom_break():
+    def bathroom_break(rng):
         """고급 농땡이 기술
         화장실 타임 - 화장실을 핑계로 장시간 자리를 비우며 휴식을 취합니다. (스마트폰은 필수!)"""
-        return "🛁 화장실 타임! 휴대폰으로 힐링 중... 📱\n\nBreak Summary: Bathroom break with phone browsing", random.randint(15, 35)
+        return rng.randint(*STRESS_REDUCTION_RANGES["bathroom_break"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def coffee_mission():
+    def coffee_mission(rng):
         """고급 농땡이 기술
         커피 미션 - 커피를 가져온다는 명분으로 사무실을 어슬렁거리거나 동료와 담소를 나눕니다."""
-        return "☕️ 커피 타러 간다며 사무실 한 바퀴... 미션 성공!\n\nBreak Summary: Coffee break mission", random.randint(10, 25)
+        return rng.randint(*STRESS_REDUCTION_RANGES["coffee_mission"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def urgent_call():
+    def urgent_call(rng):
         """고급 농땡이 기술
         급한 전화 - 급한 전화를 받는 척 연기하며 자리를 피해 외부에서 휴식을 취합니다."""
-        return "📞 급한 전화 받는 척, 밖으로 나가서 자유 만끽!\n\nBreak Summary: Urgent call break", random.randint(20, 40)
+        return rng.randint(*STRESS_REDUCTION_RANGES["urgent_call"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def deep_thinking():
+    def deep_thinking(rng):
         """고급 농땡이 기술
         깊은 사색 - 업무에 깊이 몰두한 척하며 실제로는 멍하니 있거나 다른 생각을 합니다."""
-        return "🤔 심오한 생각에 잠긴 척... 사실은 멍 때리는 중!\n\nBreak Summary: Deep thinking session", random.randint(5, 15)
+        return rng.randint(*STRESS_REDUCTION_RANGES["deep_thinking"])
 
-    @mcp.tool()
+    @break_tool
+    @timed
     @tool_wrapper
-    def email_organizing():
+    def email_organizing(rng):
         """고급 농땡이 기술
         이메일 정리 - 중요한 이메일을 정리하는 것처럼 보이지만, 실제로는 웹 서핑이나 쇼핑을 합니다."""
-        return "📧 이메일 정리한다며 온라인 쇼핑... (비밀)\n\nBreak Summary: Email organizing session", random.randint(10, 25)
+        return rng.randint(*STRESS_REDUCTION_RANGES["email_organizing"])
 
-    @mcp.tool()
-    def check_status() -> str:
+    @mcp.tool(output_schema=StatusResult.model_json_schema())
+    @timed
+    def check_status(agent_id: str | None = None) -> ToolResult:
         """현재 스트레스와 보스 경계 레벨을 확인합니다 (상태 변경 없음)"""
         logger.info("📊 check_status 도구 호출")
-        status = state.get_current_status()
-        with state._lock:
-            elapsed_since_stress = int(time.time() - state.last_stress_increase)
-            elapsed_since_boss = int(time.time() - state.last_boss_alert_decrease)
+        session_id = resolve_session_id(agent_id)
+        state = store.get(session_id)
+        # 락 없이 한 번 읽은 스냅숏이라 필드들이 같은 시점의 값
+        snapshot = state.snapshot()
+        current_time = store.clock.time()
+        if trace is not None:
+            trace.record_status(current_time, session_id)
+
+        text = STATUS_TEMPLATE(
+            stress_level=snapshot.stress_level,
+            boss_alert_level=snapshot.boss_alert_level,
+            seconds_since_stress_increase=int(current_time - snapshot.last_stress_increase),
+            seconds_since_boss_alert_decrease=int(current_time - snapshot.last_boss_alert_decrease),
+            boss_alertness_cooldown=state.boss_alertness_cooldown,
+        )
+        return ToolResult(content=text, structured_content={
+            "session_id": session_id,
+            "summary": STATUS_SUMMARY,
+            "stress_level": snapshot.stress_level,
+            "boss_alert_level": snapshot.boss_alert_level,
+            "last_stress_increase": snapshot.last_stress_increase,
+            "last_boss_alert_decrease": snapshot.last_boss_alert_decrease,
+            "boss_alertness_cooldown": state.boss_alertness_cooldown,
+            "timestamp": current_time,
+        })
+
+    @mcp.tool()
+    @timed
+    async def batch_breaks(breaks: list[BreakRequest]) -> dict:
+        """여러 에이전트의 휴식을 한 번에 처리합니다 (여러 에이전트를 다루는 오케스트레이터용)
+        항목마다 tool(휴식 도구 이름)과 agent_id를 받아 요청 순서대로 결과를 돌려줍니다.
+        에이전트마다 상태 락을 한 번만 잡고, Level 5 지연은 배치 전체에 한 번만 적용됩니다."""
+        logger.info("📦 batch_breaks 도구 호출 (%s건)", len(breaks))
+        if len(breaks) > MAX_BATCH_SIZE:
+            raise ValueError(f"한 번에 최대 {MAX_BATCH_SIZE}건까지 처리할 수 있습니다.")
 
-        return f"""📊 현재 상태 확인 (변경 없음)\n\nStress Level: {status['stress_level']}\nBoss Alert Level: {status['boss_alert_level']}\n\n⏱️ 마지막 스트레스 증가 이후: {elapsed_since_stress}초 경과 (60초마다 +1)\n⏱️ 마지막 Boss Alert 감소 이후: {elapsed_since_boss}초 경과 ({state.boss_alertness_cooldown}초마다 -1)\n\nBreak Summary: Status check only, no changes made\nStress Level: {status['stress_level']}\nBoss Alert Level: {status['boss_alert_level']}"""
+        arrived = store.clock.time()
+        # 세션별로 모아 적용하되 결과는 요청 순서대로 반환
+        results = [None] * len(breaks)
+        by_session = {}
+        for index, entry in enumerate(breaks):
+            if entry.tool not in break_tools:
+                results[index] = {"tool": entry.tool, "error": f"알 수 없는 휴식 도구입니다: {entry.tool}"}
+                continue
+            func, summary = break_tools[entry.tool]
+            by_session.setdefault(resolve_session_id(entry.agent_id), []).append(
+                (index, entry.tool, summary, func))
+
+        # 전체 버킷에서는 휴식 건수만큼, 에이전트별 버킷에서는 그 에이전트의 건수만큼 토큰을 받음
+        session_costs = {session_id: len(items) for session_id, items in by_session.items()}
+        async with admission.admit(cost=sum(session_costs.values()), session_costs=session_costs):
+            # 단일 도구처럼 지연을 먼저 기다린 뒤, 그동안의 감소가 반영된 상태에 적용
+            penalized = any(store.get(session_id).snapshot().boss_alert_level == MAX_BOSS_ALERT_LEVEL
+                            for session_id in by_session)
+            if penalized:
+                logger.warning("⚠️ 보스 경계 레벨 5인 에이전트 포함! 배치 전체에 %s초 지연 발생", boss_penalty_seconds)
+                metrics.record_penalty(boss_penalty_seconds)
+                await store.clock.sleep(boss_penalty_seconds)
+
+            for session_id, items in by_session.items():
+                state = store.get(session_id)
+                applied = state.apply_breaks([item[3](state.rng) for item in items])
+                for (index, tool, summary, _), result in zip(items, applied):
+                    results[index] = {"tool": tool, "session_id": session_id, "summary": summary, **result}
+            if trace is not None:
+                trace.record_batch(arrived, [(result["tool"], result["session_id"], result["stress_reduction"],
+                                              result["boss_raised"]) for result in results if "error" not in result])
+
+        return {"results": results, "penalty_seconds": boss_penalty_seconds if penalized else 0}
+
+    routable_tools["check_status"] = check_status.__doc__
+    router = IntentRouter(routable_tools, backend=router_backend, cache_dir=router_cache_dir)
+
+    @mcp.tool()
+    @timed
+    async def route_request(text: str) -> str:
+        """자연어 요청에 가장 알맞은 도구를 찾아 이름을 알려줍니다 (상태 변경 없음)
+        예: "잠깐 쉬기" → take_a_break"""
+        logger.info("🧭 route_request 도구 호출")
+        tool, score = await router.route_async(text)
+        if tool is None:
+            return f"🤷 '{text}'에 맞는 도구를 찾지 못했습니다.\n\nRouted Tool: none\nScore: {score:.2f}"
+        return f"🎯 '{text}' → {tool}\n\nRouted Tool: {tool}\nScore: {score:.2f}"
+
+    mcp.router = router
+
+    @mcp.tool()
+    def get_metrics(format: Literal["json", "prometheus"] = "json") -> dict | str:
+        """서버 계측값을 확인합니다 (도구별 지연 분포, 상태 락 대기, Level 5 지연, 보스 레벨 전이)
+        format="prometheus"이면 Prometheus 텍스트 형식으로 반환합니다."""
+        if format == "prometheus":
+            return metrics.to_prometheus()
+        return metrics.snapshot()